@@ -0,0 +1,49 @@
+"""
+Microbenchmark for dealing the initial hands: the old list.pop(0) deal
+against DrawPile, for 2 to 10 players.
+
+Run from the repository root:
+    python -m benchmarks.draw_pile
+"""
+from core.game.DrawPile import DrawPile
+from core.game.GameEngineHelper import GameEngineHelper
+from timeit import repeat
+
+INITIAL_HAND_SIZE: int = 7
+REPEAT: int = 5
+NUMBER: int = 20000
+
+
+def deal_with_list_pop(deck, players_count: int):
+    deck = list(deck)
+    hands = []
+    for player in range(players_count):
+        hand = []
+        for n in range(INITIAL_HAND_SIZE):
+            hand.append(deck.pop(0))
+        hands.append(hand)
+    return hands
+
+
+def deal_with_draw_pile(deck, players_count: int):
+    draw_pile = DrawPile(deck)
+    return [draw_pile.draw(INITIAL_HAND_SIZE) for player in range(players_count)]
+
+
+def best_time_per_deal(deal, deck, players_count: int) -> float:
+    timings = repeat(lambda: deal(deck, players_count), repeat=REPEAT, number=NUMBER)
+    return min(timings) / NUMBER
+
+
+def main():
+    deck = GameEngineHelper.create_game_deck()
+    print('{:>8} {:>14} {:>14} {:>8}'.format('players', 'pop(0) us', 'DrawPile us', 'speedup'))
+    for players_count in range(2, 11):
+        list_time = best_time_per_deal(deal_with_list_pop, deck, players_count)
+        draw_pile_time = best_time_per_deal(deal_with_draw_pile, deck, players_count)
+        print('{:>8} {:>14.2f} {:>14.2f} {:>7.2f}x'.format(players_count, list_time * 1e6, draw_pile_time * 1e6,
+                                                          list_time / draw_pile_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Macro benchmarks: whole headless matches per second and turns per second
+for 2, 4 and 10 players of RandomPlayer or EasyPlayer.
+"""
+from core.game.GameEngine import GameEngine
+from players.EasyPlayer import Player as EasyPlayer
+from players.RandomPlayer import RandomPlayer
+import time
+
+PLAYER_COUNTS = (2, 4, 10)
+PLAYER_CLASSES = (('random', RandomPlayer), ('easy', EasyPlayer))
+ROUNDS_PER_MATCH: int = 3
+
+
+def play_matches(player_class, players_count: int, match_count: int):
+    turn_count = 0
+    start_time = time.perf_counter()
+    for seed in range(match_count):
+        game_engine = GameEngine([player_class() for n in range(players_count)], ROUNDS_PER_MATCH, seed=seed)
+        game_engine.start()
+        turn_count += game_engine.get_match_result().turn_count
+    return time.perf_counter() - start_time, turn_count
+
+
+def run(quick: bool = False):
+    results = {}
+    match_count = 20 if quick else 200
+    for player_name, player_class in PLAYER_CLASSES:
+        for players_count in PLAYER_COUNTS:
+            elapsed_time, turn_count = play_matches(player_class, players_count, match_count)
+            name = 'macro.{}.{}_players'.format(player_name, players_count)
+            results[name + '.matches_per_sec'] = match_count / elapsed_time
+            results[name + '.turns_per_sec'] = turn_count / elapsed_time
+    return results
@@ -0,0 +1,77 @@
+"""
+Micro benchmarks for the engine's hot paths: building a deck, dealing with
+__draw_cards, legal move generation, reversing the order of play and removing
+a card from a hand. Every result is in calls per second.
+"""
+from core.game.Card import KIND_IS_WILD
+from core.game.CardHand import CardHand
+from core.game.DrawPile import DrawPile
+from core.game.GameEngine import GameEngine
+from core.game.GameEngineHelper import GameEngineHelper
+from core.game.GamePlayer import GamePlayer
+from core.game.LegalityTable import LegalityTable
+from players.RandomPlayer import RandomPlayer
+from random import Random
+from timeit import Timer
+
+REPEAT: int = 5
+
+
+def measure(function, quick: bool = False) -> float:
+    timer = Timer(function)
+    number, elapsed_time = timer.autorange()
+    if not quick:
+        elapsed_time = min([elapsed_time] + timer.repeat(REPEAT - 1, number))
+    return number / elapsed_time
+
+
+def run(quick: bool = False):
+    random = Random(0)
+    results = {}
+
+    results['micro.create_game_deck'] = measure(lambda: GameEngineHelper.create_game_deck(random), quick)
+
+    game_engine = GameEngine([RandomPlayer(), RandomPlayer()], 1, seed=0)
+    deck = GameEngineHelper.create_game_deck(random)
+    draw_cards = game_engine._GameEngine__draw_cards
+
+    def deal_ten_hands():
+        game_engine._deck = DrawPile(deck)
+        for n in range(10):
+            draw_cards(7, True)
+    results['micro.draw_cards.deal_10_players'] = measure(deal_ten_hands, quick)
+
+    # A fixed deck, the one above depends on how often create_game_deck ran. The top card must not be a wild.
+    deck = GameEngineHelper.create_game_deck(Random(0))
+    deck.sort(key=lambda card: KIND_IS_WILD[card.kind])
+    top_card = deck[0]
+    for hand_size in (7, 40):
+        hand = deck[1:hand_size + 1]
+        card_hand = CardHand(hand)
+        results['micro.legal_cards.list_{}_cards'.format(hand_size)] = measure(
+            lambda: LegalityTable.get_legal_cards(hand, top_card, top_card.color_type), quick)
+        results['micro.legal_cards.card_hand_{}_cards'.format(hand_size)] = measure(
+            lambda: LegalityTable.get_legal_cards(card_hand, top_card, top_card.color_type), quick)
+
+        # Remove a card the way the engine does and put it back for the next call
+        card = hand[-1]
+
+        def remove_from_list():
+            hand.remove(card)
+            hand.append(card)
+
+        def remove_from_card_hand():
+            card_hand.remove(card)
+            card_hand.append(card)
+        results['micro.hand_remove.list_{}_cards'.format(hand_size)] = measure(remove_from_list, quick)
+        results['micro.hand_remove.card_hand_{}_cards'.format(hand_size)] = measure(remove_from_card_hand, quick)
+
+    game_engine._round_players = [GamePlayer(RandomPlayer(), [], player_id) for player_id in range(10)]
+    reverse_direction = game_engine._GameEngine__reverse_direction
+    get_next_turn_index = game_engine._GameEngine__get_next_turn_index
+
+    def reverse_and_skip():
+        reverse_direction()
+        return get_next_turn_index(4, 2)
+    results['micro.turn_ring.reverse_and_skip.10_players'] = measure(reverse_and_skip, quick)
+    return results
@@ -0,0 +1,84 @@
+"""
+Runs the macro, micro and search benchmarks and writes the results as JSON. Every
+result is a rate, so higher is better. With --compare, results are checked
+against a stored baseline and anything slower than the threshold is flagged
+as a regression (and the exit code is 1).
+
+Run from the repository root:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --compare benchmarks/baseline.json
+    python -m benchmarks.run --output benchmarks/baseline.json   (store a new baseline)
+"""
+from benchmarks import macro, micro, search
+import argparse
+import json
+import platform
+import sys
+
+DEFAULT_THRESHOLD: float = 0.10
+
+
+def run_benchmarks(quick: bool = False, only: str = None):
+    results = {}
+    if only in (None, 'macro'):
+        results.update(macro.run(quick))
+    if only in (None, 'micro'):
+        results.update(micro.run(quick))
+    if only in (None, 'search'):
+        results.update(search.run(quick))
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'results': results,
+    }
+
+
+def compare(results, baseline, threshold: float):
+    regressions = []
+    lines = ['{:<50} {:>14} {:>14} {:>8}'.format('benchmark', 'baseline', 'current', 'change')]
+    for name in sorted(results['results']):
+        current = results['results'][name]
+        if name not in baseline['results']:
+            lines.append('{:<50} {:>14} {:>14.1f} {:>8}'.format(name, '-', current, 'new'))
+            continue
+        previous = baseline['results'][name]
+        change = current / previous - 1
+        flag = ''
+        if change < -threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        lines.append('{:<50} {:>14.1f} {:>14.1f} {:>+7.1%}{}'.format(name, previous, current, change, flag))
+    return regressions, '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the engine benchmarks.')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to compare the results with')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='slowdown (0.10 = 10%%) above which a benchmark is flagged')
+    parser.add_argument('--only', choices=['macro', 'micro', 'search'], help='only run one kind of benchmark')
+    parser.add_argument('--quick', action='store_true', help='fewer matches and repeats, noisier')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.quick, args.only)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions, report = compare(results, baseline, args.threshold)
+        print(report)
+        if regressions:
+            print('{} regression(s) beyond {:.0%}'.format(len(regressions), args.threshold))
+            sys.exit(1)
+    else:
+        for name in sorted(results['results']):
+            print('{:<50} {:>14.1f}'.format(name, results['results'][name]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Search benchmarks: GameState clones and random steps per second, the
+HardPlayer's rollouts per second from a freshly dealt round of 2 and 4
+players, and the positions per second the EndgameSolver searches in a 2
+player endgame. Every result is a rate.
+
+Run directly to also play HardPlayer against RandomPlayer with a growing
+rollout budget and print its win rate with a 95% interval (slow):
+    python -m benchmarks.search --matches 200
+Every budget plays the same seeds. Rounds are luck heavy, the interval is
+about 7 points wide at 200 matches and 4 at 600, so it takes a few hundred
+matches to tell two budgets apart. --endgame-hand-size 0 leaves the
+EndgameSolver out and measures the rollouts alone.
+"""
+from core.game.ActionType import ActionType
+from core.game.Card import KIND_IS_ACTION
+from core.game.CardAction import CardAction
+from core.game.GameEngine import GameEngine, INITIAL_HAND_SIZE
+from core.game.GameEngineHelper import GameEngineHelper
+from core.game.GameState import GameState
+from core.search.EndgameSolver import EndgameSolver, ENDGAME_HAND_SIZE
+from players.HardPlayer import Player as HardPlayer, run_rollouts
+from players.RandomPlayer import RandomPlayer
+from random import Random
+from timeit import Timer
+import argparse
+import math
+import time
+
+PLAYER_COUNTS = (2, 4)
+ROLLOUT_BUDGETS = (10, 50, 200, 1000)
+ENDGAME_HAND_SIZES = (2, 3)
+REPEAT: int = 5
+
+
+def measure(function, quick: bool = False) -> float:
+    timer = Timer(function)
+    number, elapsed_time = timer.autorange()
+    if not quick:
+        elapsed_time = min([elapsed_time] + timer.repeat(REPEAT - 1, number))
+    return number / elapsed_time
+
+
+def create_dealt_state(players_count: int, random: Random) -> GameState:
+    deck = GameEngineHelper.create_game_deck(random)
+    # A number card starts the pile, so the first player has nothing to answer
+    first_index = next(index for index, card in enumerate(deck) if not KIND_IS_ACTION[card.kind])
+    first_card = deck.pop(first_index)
+    hands = [deck[seat * INITIAL_HAND_SIZE:(seat + 1) * INITIAL_HAND_SIZE] for seat in range(players_count)]
+    draw_pile = deck[players_count * INITIAL_HAND_SIZE:]
+    return GameState.create(draw_pile, [first_card], hands, range(players_count), 0, first_card.color_type)
+
+
+def create_endgame_state(hand_size: int, random: Random) -> GameState:
+    # 2 players with hand_size cards each, half of the rest already played
+    deck = GameEngineHelper.create_game_deck(random)
+    first_index = next(index for index, card in enumerate(deck) if not KIND_IS_ACTION[card.kind])
+    top_card = deck.pop(first_index)
+    hands = [deck[:hand_size], deck[hand_size:2 * hand_size]]
+    played_count = (len(deck) - 2 * hand_size) // 2
+    card_pile = deck[2 * hand_size:2 * hand_size + played_count] + [top_card]
+    draw_pile = deck[2 * hand_size + played_count:]
+    return GameState.create(draw_pile, card_pile, hands, range(2), 0, top_card.color_type)
+
+
+def run(quick: bool = False):
+    random = Random(0)
+    results = {}
+    state = create_dealt_state(4, random)
+    results['search.game_state.clone'] = measure(state.clone, quick)
+    skip_action = CardAction(ActionType.SKIP)
+    results['search.game_state.step_skip'] = measure(lambda: state.step(skip_action, random), quick)
+
+    rollout_count = 20 if quick else 200
+    for players_count in PLAYER_COUNTS:
+        view = create_dealt_state(players_count, random).get_player_view(0)
+        actions = [CardAction(ActionType.PLAY, card) for card in view.get_hand(0)[:4]]
+        start_time = time.perf_counter()
+        wins, rollouts = run_rollouts(view, actions, rollout_count, 0)
+        elapsed_time = time.perf_counter() - start_time
+        results['search.hard_player.{}_players.rollouts_per_sec'.format(players_count)] = sum(rollouts) / elapsed_time
+
+    time_budget = 0.1 if quick else 1.0
+    for hand_size in ENDGAME_HAND_SIZES:
+        # A fresh table every time, a full one would only measure table hits
+        solver = EndgameSolver()
+        solver.solve(create_endgame_state(hand_size, random).get_player_view(0), time_budget, random)
+        results['search.endgame_solver.{}_cards.nodes_per_sec'.format(hand_size)] = \
+            solver.get_stats().nodes_per_second
+    return results
+
+
+def play_win_rate(rollout_count: int, match_count: int, endgame_hand_size: int = ENDGAME_HAND_SIZE) -> float:
+    win_count = 0
+    for seed in range(match_count):
+        hard_player = HardPlayer(rollout_count, endgame_hand_size=endgame_hand_size)
+        # Take turns going first
+        players = [hard_player, RandomPlayer()] if seed % 2 == 0 else [RandomPlayer(), hard_player]
+        winner = GameEngine(players, 1, seed=seed).start()
+        if winner.player is hard_player:
+            win_count += 1
+    return win_count / match_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HardPlayer win rate against RandomPlayer by rollout budget.')
+    parser.add_argument('--matches', type=int, default=200, help='one round matches per budget')
+    parser.add_argument('--endgame-hand-size', type=int, default=ENDGAME_HAND_SIZE,
+                        help='hand size the EndgameSolver takes over from, 0 never uses it')
+    args = parser.parse_args()
+
+    for name, rate in sorted(run().items()):
+        print('{:<50} {:>14.1f}'.format(name, rate))
+    print()
+    print('{:>10} {:>10} {:>8} {:>12}'.format('rollouts', 'win rate', '95% +-', 'sec/match'))
+    for rollout_count in ROLLOUT_BUDGETS:
+        start_time = time.perf_counter()
+        win_rate = play_win_rate(rollout_count, args.matches, args.endgame_hand_size)
+        match_time = (time.perf_counter() - start_time) / args.matches
+        margin = 1.96 * math.sqrt(win_rate * (1 - win_rate) / args.matches)
+        print('{:>10} {:>9.1%} {:>7.1%} {:>12.3f}'.format(rollout_count, win_rate, margin, match_time))
+
+
+if __name__ == '__main__':
+    main()
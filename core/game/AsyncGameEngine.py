@@ -0,0 +1,70 @@
+"""
+AsyncGameEngine plays a match on an asyncio event loop, so many matches can
+share one loop and a player that waits on I/O only holds up its own match.
+The rules are exactly those of the GameEngine, only the turns are awaited:
+an IAsyncPlayer (or any player whose take_turn is a coroutine) is awaited
+directly, any other player through a SyncPlayerAdapter.
+
+With a TimeBudget, a take_turn still running when the player's time is up
+is cancelled and the turn becomes a SKIP, the same as a time out in the
+GameEngine. Cancelling start_async() itself abandons the match.
+"""
+from core.game.CardAction import CardAction
+from core.game.GameEngine import GameEngine
+from core.game.GamePlayer import GamePlayer
+from core.game.SyncPlayerAdapter import SyncPlayerAdapter
+from time import perf_counter
+import asyncio
+import inspect
+
+
+class AsyncGameEngine(GameEngine):
+    def __init__(self, players, rounds_per_match, event_sinks=None, sync_players_in_threads: bool = False,
+                 **engine_options):
+        # engine_options are those of the GameEngine, e.g. seed, time_budget or round_limits
+        super().__init__(players, rounds_per_match, event_sinks, **engine_options)
+        # The coroutine function giving every player's turn, by player id
+        self._take_turns = []
+        for player in players:
+            if inspect.iscoroutinefunction(player.take_turn):
+                self._take_turns.append(player.take_turn)
+            else:
+                self._take_turns.append(SyncPlayerAdapter(player, sync_players_in_threads).take_turn)
+
+    def start(self) -> GamePlayer:
+        # Runs the match on an event loop of its own, from code that is not async
+        return asyncio.run(self.start_async())
+
+    async def start_async(self) -> GamePlayer:
+        # Returns the winner of the match, None when every round was drawn
+        match = self._play_match()
+        is_turn_timed = self._is_turn_timed()
+        try:
+            active_player = next(match)
+            while True:
+                take_turn = self._take_turns[active_player.player_id]
+                if is_turn_timed:
+                    player_action = await self.__take_timed_turn(active_player, take_turn)
+                else:
+                    player_action = await take_turn()
+                active_player = match.send(player_action)
+        except StopIteration as match_over:
+            return match_over.value
+        finally:
+            match.close()
+
+    async def __take_timed_turn(self, game_player: GamePlayer, take_turn) -> CardAction:
+        time_remaining = self._get_turn_time_remaining(game_player)
+        if time_remaining is not None and time_remaining <= 0:
+            # The match budget is spent, the player is not even asked
+            return self._time_out_turn(game_player)
+
+        decision_start = perf_counter()
+        if time_remaining is None:
+            player_action = await take_turn()
+        else:
+            try:
+                player_action = await asyncio.wait_for(take_turn(), time_remaining)
+            except asyncio.TimeoutError:
+                player_action = None
+        return self._finish_timed_turn(game_player, player_action, perf_counter() - decision_start, time_remaining)
@@ -3,16 +3,50 @@ The Card represents a card object from the game. Every card contains a color
 along with a type. Refer to CardType and ColorType for full descriptions
 of each. This class is meant to be a read-only class, meaning once the object
 is created, it cannot be modified.
+
+There are only 54 different kinds of card in the game, so there is exactly
+one Card object per kind and Card(card_type, color_type) hands back that
+shared object. Because of this the color of a wild card is never changed on
+the card itself, the color picked for it travels in CardAction.color instead.
+Every kind also has a small int id (Card.kind) which indexes the KIND_* tables
+below, those are what the engine uses on its hot paths.
 """
 
 from core.game.CardType import CardType
 from core.game.ColorType import ColorType
 
+CARD_COLORS = (ColorType.RED, ColorType.GREEN, ColorType.BLUE, ColorType.YELLOW)
+COLORED_CARD_TYPES = (CardType.ZERO, CardType.ONE, CardType.TWO, CardType.THREE, CardType.FOUR, CardType.FIVE,
+                      CardType.SIX, CardType.SEVEN, CardType.EIGHT, CardType.NINE,
+                      CardType.DRAW_TWO, CardType.REVERSE, CardType.SKIP)
+WILD_CARD_TYPES = (CardType.WILD_DRAW_FOUR, CardType.WILD)
+ACTION_CARD_TYPES = (CardType.DRAW_TWO, CardType.REVERSE, CardType.SKIP, CardType.WILD, CardType.WILD_DRAW_FOUR)
+
+# Colored kinds come first, color by color, followed by the two black wild kinds
+CARD_KIND_COUNT: int = len(CARD_COLORS) * len(COLORED_CARD_TYPES) + len(WILD_CARD_TYPES)
+WILD_DRAW_FOUR_KIND: int = CARD_KIND_COUNT - 2
+WILD_KIND: int = CARD_KIND_COUNT - 1
+
 
 class Card:
-    def __init__(self, card_type: CardType, color_type: ColorType):
-        self._card_type: CardType = card_type
-        self._color_type: ColorType = color_type
+    __slots__ = ('_card_type', '_color_type', '_kind')
+
+    _cards_by_type_and_color = {}
+
+    def __new__(cls, card_type: CardType, color_type: ColorType):
+        card = cls._cards_by_type_and_color.get((card_type, color_type))
+        if card is None:
+            raise ValueError('There is no {} {} card in the game'.format(color_type, card_type))
+        return card
+
+    @classmethod
+    def _create_kind(cls, kind: int, card_type: CardType, color_type: ColorType):
+        card = object.__new__(cls)
+        card._card_type = card_type
+        card._color_type = color_type
+        card._kind = kind
+        cls._cards_by_type_and_color[(card_type, color_type)] = card
+        return card
 
     @property
     def card_type(self) -> CardType:
@@ -22,9 +56,39 @@ class Card:
     def color_type(self) -> ColorType:
         return self._color_type
 
-    @color_type.setter
-    def color_type(self, value: ColorType):
-        self._color_type = value
+    @property
+    def kind(self) -> int:
+        return self._kind
 
     def get_card_text(self) -> str:
-        return '{} {}'.format(self._color_type, self.card_type)
\ No newline at end of file
+        return '{} {}'.format(self._color_type, self.card_type)
+
+    # Copies and pickles (e.g. sending a card to another process) resolve to the same shared card
+    def __reduce__(self):
+        return Card, (self._card_type, self._color_type)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def _create_card_kinds():
+    cards = []
+    for color_type in CARD_COLORS:
+        for card_type in COLORED_CARD_TYPES:
+            cards.append(Card._create_kind(len(cards), card_type, color_type))
+    for card_type in WILD_CARD_TYPES:
+        cards.append(Card._create_kind(len(cards), card_type, ColorType.BLACK))
+    return tuple(cards)
+
+
+CARDS_BY_KIND = _create_card_kinds()
+KIND_CARD_TYPES = tuple(card.card_type for card in CARDS_BY_KIND)
+KIND_COLOR_TYPES = tuple(card.color_type for card in CARDS_BY_KIND)
+KIND_IS_WILD = tuple(card.card_type in WILD_CARD_TYPES for card in CARDS_BY_KIND)
+KIND_IS_ACTION = tuple(card.card_type in ACTION_CARD_TYPES for card in CARDS_BY_KIND)
+# Cards a DRAW_TWO or WILD_DRAW_FOUR adds to the pending draw, 0 for every other kind
+KIND_DRAW_COUNTS = tuple({CardType.DRAW_TWO: 2, CardType.WILD_DRAW_FOUR: 4}.get(card.card_type, 0)
+                         for card in CARDS_BY_KIND)
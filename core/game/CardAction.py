@@ -1,7 +1,8 @@
 """
 CardAction represents a response that an AI will make when the game engine
 asks the AI for an answer. Depending on the action taken, the card property
-does not always need to be given.
+does not always need to be given. When playing a wild card, give the color
+you pick for it as the color property.
 The class is meant to be a read only class and should be created by the AI
 when taking their turn.
 """
@@ -0,0 +1,104 @@
+"""
+CardHand is a hand of cards stored as a count for each of the 54 card kinds
+plus a bitmask of the kinds that are in the hand. Adding, removing and
+checking for a card are O(1) no matter how big the hand gets, and the
+bitmask can be ANDed directly with the LegalityTable masks.
+
+A CardHand can be used anywhere the list of cards returned by
+PlayerGameHelper.get_hand() is used: it can be iterated, indexed, measured
+with len() and compared to a list. Cards always come out ordered by kind,
+so the order does not depend on the order they were drawn in.
+"""
+from core.game.Card import Card, CARDS_BY_KIND, CARD_KIND_COUNT
+from typing import Iterable, List
+
+
+class CardHand:
+    __slots__ = ('_counts', '_mask', '_size', '_cards')
+
+    def __init__(self, cards: Iterable[Card] = None):
+        self._counts: List[int] = [0] * CARD_KIND_COUNT
+        self._mask: int = 0
+        self._size: int = 0
+        # List view of the hand, only built when indexed and dropped on every change
+        self._cards: List[Card] = None
+        if cards is not None:
+            self.extend(cards)
+
+    @property
+    def mask(self) -> int:
+        return self._mask
+
+    def append(self, card: Card):
+        kind = card.kind
+        self._counts[kind] += 1
+        self._mask |= 1 << kind
+        self._size += 1
+        self._cards = None
+
+    def extend(self, cards: Iterable[Card]):
+        counts = self._counts
+        mask = self._mask
+        size = self._size
+        for card in cards:
+            kind = card.kind
+            counts[kind] += 1
+            mask |= 1 << kind
+            size += 1
+        self._mask = mask
+        self._size = size
+        self._cards = None
+
+    def remove(self, card: Card):
+        if not self.has_card(card):
+            raise ValueError('CardHand.remove(card): card not in hand')
+        kind = card.kind
+        self._counts[kind] -= 1
+        if self._counts[kind] == 0:
+            self._mask &= ~(1 << kind)
+        self._size -= 1
+        self._cards = None
+
+    def has_card(self, card: Card) -> bool:
+        return isinstance(card, Card) and self._mask >> card.kind & 1 == 1
+
+    def count(self, card: Card) -> int:
+        return self._counts[card.kind] if isinstance(card, Card) else 0
+
+    def get_cards_in_mask(self, mask: int) -> List[Card]:
+        # Only walks the kinds that are both in the mask and in the hand
+        counts = self._counts
+        cards = []
+        mask &= self._mask
+        while mask:
+            lowest_bit = mask & -mask
+            kind = lowest_bit.bit_length() - 1
+            cards.extend([CARDS_BY_KIND[kind]] * counts[kind])
+            mask ^= lowest_bit
+        return cards
+
+    def __contains__(self, card) -> bool:
+        return self.has_card(card)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        if self._cards is not None:
+            return iter(self._cards)
+        return iter(self.get_cards_in_mask(self._mask))
+
+    def __getitem__(self, index):
+        if self._cards is None:
+            self._cards = self.get_cards_in_mask(self._mask)
+        return self._cards[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CardHand):
+            return self._counts == other._counts
+        if isinstance(other, list):
+            return self._size == len(other) and self._counts == CardHand(other)._counts
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return 'CardHand([{}])'.format(', '.join(card.get_card_text() for card in self))
@@ -0,0 +1,38 @@
+"""
+CardListView is a read only window onto cards the game engine owns, like
+the card pile or a player's hand. It always shows the current cards and
+can be iterated, indexed, sliced, measured with len() and compared to a
+list, but it has no methods to change them, so a bot cannot change the
+game by changing what PlayerGameHelper gives it.
+"""
+from core.game.Card import Card
+from collections.abc import Sequence
+from typing import Iterator
+
+
+class CardListView(Sequence):
+    __slots__ = ('_cards',)
+
+    def __init__(self, cards):
+        self._cards = cards
+
+    def __getitem__(self, index):
+        # A slice is a new list, changing it does not change the cards behind the view
+        return self._cards[index]
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._cards)
+
+    def __contains__(self, card) -> bool:
+        return card in self._cards
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CardListView):
+            other = other._cards
+        return self._cards == other
+
+    def __repr__(self) -> str:
+        return 'CardListView({!r})'.format(list(self._cards))
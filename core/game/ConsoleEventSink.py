@@ -0,0 +1,10 @@
+"""
+ConsoleEventSink prints a human-readable line for every event it receives.
+"""
+from core.game.IEventSink import IEventSink
+from core.game.GameEvent import GameEvent
+
+
+class ConsoleEventSink(IEventSink):
+    def handle_event(self, event: GameEvent):
+        print(event.get_event_text())
@@ -0,0 +1,30 @@
+"""
+Deal is the cards of a whole match fixed in advance: the order of the deck
+at the start of every round, and the seed of the GameEngine that plays it
+(which shuffles the pile back in and hands the players their generators). A
+GameEngine given a deal takes every round's deck from it instead of
+shuffling one, so a deal can be played again with the players in other
+seats on exactly the same cards. The decks are shared by every match of the
+deal and never changed. This class is meant to be a read-only class.
+"""
+from core.game.Card import Card
+from typing import List, Tuple
+
+
+class Deal:
+    def __init__(self, seed: int, round_decks: Tuple[List[Card], ...]):
+        self._seed = seed
+        # The first card of every list is the first card drawn
+        self._round_decks = round_decks
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    @property
+    def round_decks(self) -> Tuple[List[Card], ...]:
+        return self._round_decks
+
+    @property
+    def round_count(self) -> int:
+        return len(self._round_decks)
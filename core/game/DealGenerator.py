@@ -0,0 +1,57 @@
+"""
+DealGenerator makes the Deals of a duplicate tournament, where every deal is
+played once for every seating of the players. Deal number deal_index is
+derived from the generator's seed and that number alone, so it is the same
+in every process and for every matchup. A deal is only shuffled the first
+time it is asked for: the generator keeps the max_deals deals used most
+recently, and every seating of a deal gets the very same Deal.
+"""
+from collections import OrderedDict
+from core.game.Deal import Deal
+from core.game.GameEngineHelper import GameEngineHelper
+from random import Random
+
+DEFAULT_MAX_DEALS: int = 256
+
+
+class DealGenerator:
+    def __init__(self, seed: int, rounds_per_match: int, max_deals: int = DEFAULT_MAX_DEALS):
+        if max_deals < 1:
+            raise ValueError('A deal generator needs room for at least one deal, not {}'.format(max_deals))
+        self._seed = seed
+        self._rounds_per_match = rounds_per_match
+        self._max_deals = max_deals
+        self._deals = OrderedDict()
+        self._created_count = 0
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    @property
+    def rounds_per_match(self) -> int:
+        return self._rounds_per_match
+
+    @property
+    def created_count(self) -> int:
+        # Deals shuffled so far, a deal asked for again while it is kept is not counted twice
+        return self._created_count
+
+    def get_deal(self, deal_index: int) -> Deal:
+        deal = self._deals.get(deal_index)
+        if deal is not None:
+            self._deals.move_to_end(deal_index)
+            return deal
+        deal = self.__create_deal(deal_index)
+        if len(self._deals) >= self._max_deals:
+            self._deals.popitem(last=False)
+        self._deals[deal_index] = deal
+        return deal
+
+    def __create_deal(self, deal_index: int) -> Deal:
+        deal_seed = GameEngineHelper.derive_seed(self._seed, 'deal', deal_index)
+        # The engine playing the deal gets deal_seed, the decks a generator of their own
+        deck_random = Random(GameEngineHelper.derive_seed(deal_seed, 'decks'))
+        round_decks = tuple(GameEngineHelper.create_game_deck(deck_random) for n in range(self._rounds_per_match))
+        self._created_count += 1
+        return Deal(deal_seed, round_decks)
@@ -0,0 +1,48 @@
+"""
+DrawPile is the deck players draw their cards from. The top of the deck is
+kept at the end of an internal list, so drawing a card is a constant-time
+pop and drawing several cards is a single slice, no matter how big the deck
+is. Cards are handed out in the same order as the list the pile was built
+from: the first card of that list is the first card drawn.
+"""
+from core.game.Card import Card
+from random import Random
+from typing import List
+
+
+class DrawPile:
+    def __init__(self, cards: List[Card] = None):
+        # Index -1 is the top of the deck
+        self._cards: List[Card] = cards[::-1] if cards else []
+
+    def draw(self, draw_count: int) -> List[Card]:
+        if draw_count <= 0:
+            return []
+        if draw_count > len(self._cards):
+            raise IndexError('Cannot draw {} cards from a deck of {}'.format(draw_count, len(self._cards)))
+        drawn_cards = self._cards[-draw_count:]
+        del self._cards[-draw_count:]
+        # The slice is bottom to top, hand the cards out top first
+        drawn_cards.reverse()
+        return drawn_cards
+
+    def draw_one(self) -> Card:
+        return self._cards.pop()
+
+    def put_on_bottom(self, card: Card):
+        # Only used when the first card of a round has to go back, so the O(n) insert is fine
+        self._cards.insert(0, card)
+
+    def refill(self, cards: List[Card]):
+        # The new cards go under whatever is left, those are still drawn first
+        self._cards[0:0] = cards[::-1]
+
+    def shuffle(self, random: Random):
+        random.shuffle(self._cards)
+
+    def get_cards(self) -> List[Card]:
+        # A copy, top of the deck last
+        return list(self._cards)
+
+    def __len__(self) -> int:
+        return len(self._cards)
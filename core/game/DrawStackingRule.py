@@ -0,0 +1,21 @@
+"""
+DrawStackingRule is an enum of the ways a player can answer a DRAW_TWO or
+WILD_DRAW_FOUR. Stacking a draw card adds its cards to the pending draw and
+passes it on to the next player. The first player who cannot or does not
+stack draws the whole pending total at once and loses their turn.
+"""
+from enum import Enum
+
+
+class DrawStackingRule(Enum):
+    """
+    SAME_TYPE only stacks a draw card on the same type: a WILD_DRAW_FOUR on a
+    WILD_DRAW_FOUR, or a DRAW_TWO of the current color on a DRAW_TWO.
+    """
+    SAME_TYPE = 'same_type'
+
+    """
+    MIXED also stacks the types on each other: a WILD_DRAW_FOUR on anything
+    and a DRAW_TWO of the current color on a WILD_DRAW_FOUR.
+    """
+    MIXED = 'mixed'
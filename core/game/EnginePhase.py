@@ -0,0 +1,31 @@
+"""
+EnginePhase is an enum of the parts of a turn the EngineProfiler times.
+"""
+from enum import Enum
+
+
+class EnginePhase(Enum):
+    """
+    HELPER_UPDATE is updating the PlayerGameHelper and handing it to the player.
+    """
+    HELPER_UPDATE = 'helper_update'
+
+    """
+    DECISION is the player's own take_turn call, the only part that is not engine time.
+    """
+    DECISION = 'decision'
+
+    """
+    VALIDATION is checking the played card is legal and in the player's hand.
+    """
+    VALIDATION = 'validation'
+
+    """
+    DRAW is drawing cards into a player's hand, including reshuffling the card pile.
+    """
+    DRAW = 'draw'
+
+    """
+    PILE_UPDATE is putting a legal card on the pile and removing it from the hand.
+    """
+    PILE_UPDATE = 'pile_update'
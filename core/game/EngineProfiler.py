@@ -0,0 +1,93 @@
+"""
+EngineProfiler collects where the time of a match goes: a latency histogram
+of every player's take_turn calls and the total time of every EnginePhase.
+Give one to a GameEngine to profile that match; profilers of several matches
+(e.g. every match of a tournament) can be merged into one. The engine only
+reads the clock when it has a profiler, so leaving it out costs nothing.
+"""
+from core.game.EnginePhase import EnginePhase
+from core.game.LatencyHistogram import LatencyHistogram
+from typing import Dict, List
+
+PERCENTILES = (50, 95, 99)
+
+
+class EngineProfiler:
+    def __init__(self):
+        # Players are reported under these keys, the engine uses 'name #id' unless they are set
+        self._player_keys: List[str] = None
+        self._decision_histograms: Dict[str, LatencyHistogram] = {}
+        self._phase_totals: Dict[EnginePhase, float] = {phase: 0.0 for phase in EnginePhase}
+        self._match_count = 0
+        self._match_time = 0.0
+
+    def set_player_keys(self, player_keys: List[str]):
+        self._player_keys = player_keys
+
+    def has_player_keys(self) -> bool:
+        return self._player_keys is not None
+
+    def record_decision(self, player_id: int, seconds: float):
+        player_key = self._player_keys[player_id]
+        histogram = self._decision_histograms.get(player_key)
+        if histogram is None:
+            histogram = self._decision_histograms[player_key] = LatencyHistogram()
+        histogram.record(seconds)
+        self._phase_totals[EnginePhase.DECISION] += seconds
+
+    def record_phase(self, phase: EnginePhase, seconds: float):
+        self._phase_totals[phase] += seconds
+
+    def record_match(self, seconds: float):
+        self._match_count += 1
+        self._match_time += seconds
+
+    def merge(self, other: 'EngineProfiler'):
+        for player_key, other_histogram in other._decision_histograms.items():
+            histogram = self._decision_histograms.get(player_key)
+            if histogram is None:
+                histogram = self._decision_histograms[player_key] = LatencyHistogram()
+            histogram.merge(other_histogram)
+        for phase, seconds in other._phase_totals.items():
+            self._phase_totals[phase] += seconds
+        self._match_count += other._match_count
+        self._match_time += other._match_time
+
+    @property
+    def decision_histograms(self) -> Dict[str, LatencyHistogram]:
+        return self._decision_histograms
+
+    @property
+    def phase_totals(self) -> Dict[EnginePhase, float]:
+        return self._phase_totals
+
+    @property
+    def match_count(self) -> int:
+        return self._match_count
+
+    @property
+    def match_time(self) -> float:
+        return self._match_time
+
+    def get_bot_time(self) -> float:
+        return self._phase_totals[EnginePhase.DECISION]
+
+    def get_engine_time(self) -> float:
+        # Everything that is not a player deciding, including the untimed bookkeeping between phases
+        return self._match_time - self.get_bot_time()
+
+    def get_report_text(self) -> str:
+        lines = ['{:<45} {:>9} {:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+            'player take_turn (ms)', 'turns', 'mean', 'p50', 'p95', 'p99', 'max')]
+        for player_key in sorted(self._decision_histograms):
+            histogram = self._decision_histograms[player_key]
+            percentiles = [histogram.get_percentile(percentile) * 1e3 for percentile in PERCENTILES]
+            lines.append('{:<45} {:>9} {:>10.4f} {:>10.4f} {:>10.4f} {:>10.4f} {:>10.4f}'.format(
+                player_key, histogram.count, histogram.mean * 1e3, *percentiles, histogram.max * 1e3))
+        lines.append('{:<45} {:>10} {:>7}'.format('phase', 'total s', 'share'))
+        for phase in EnginePhase:
+            share = self._phase_totals[phase] / self._match_time if self._match_time else 0.0
+            lines.append('{:<45} {:>10.3f} {:>7.1%}'.format(phase.value, self._phase_totals[phase], share))
+        lines.append('{} match(es) in {:.3f}s: {:.3f}s engine, {:.3f}s bots'.format(
+            self._match_count, self._match_time, self.get_engine_time(), self.get_bot_time()))
+        return '\n'.join(lines)
@@ -0,0 +1,62 @@
+"""
+EventType is an enum describing every kind of event the GameEngine can
+send to its event sinks while a match is being played.
+"""
+from enum import Enum
+
+
+class EventType(Enum):
+    """
+    ROUND_STARTED is sent once at the beginning of every round.
+    """
+    ROUND_STARTED = 'round_started'
+
+    """
+    TURN_STARTED is sent before a player is asked to take their turn. It
+    carries the hand size of every player in the round.
+    """
+    TURN_STARTED = 'turn_started'
+
+    """
+    CARD_PLAYED is sent when a player legally plays a card onto the pile.
+    """
+    CARD_PLAYED = 'card_played'
+
+    """
+    CARDS_DRAWN is sent when a player draws one or more cards from the deck.
+    """
+    CARDS_DRAWN = 'cards_drawn'
+
+    """
+    ILLEGAL_PLAY is sent when a player tries to play a card that is not
+    legal or is not in their hand.
+    """
+    ILLEGAL_PLAY = 'illegal_play'
+
+    """
+    TURN_SKIPPED is sent when a player loses their turn to an action card.
+    """
+    TURN_SKIPPED = 'turn_skipped'
+
+    """
+    TURN_TIMED_OUT is sent when a player went over their TimeBudget, their
+    turn is played as a SKIP instead.
+    """
+    TURN_TIMED_OUT = 'turn_timed_out'
+
+    """
+    ROUND_WON is sent when a player has no cards left in their hand.
+    """
+    ROUND_WON = 'round_won'
+
+    """
+    ROUND_DRAWN is sent when a round reached one of the engine's RoundLimits
+    and ends without a winner. It carries the RoundDrawReason.
+    """
+    ROUND_DRAWN = 'round_drawn'
+
+    """
+    MATCH_WON is sent once every round has been played, unless every round
+    was drawn.
+    """
+    MATCH_WON = 'match_won'
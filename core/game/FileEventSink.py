@@ -0,0 +1,38 @@
+"""
+FileEventSink writes a line for every event it receives to a file. Lines are
+kept in memory and written out in batches, so call close() (or use the sink
+as a context manager) once the match is over.
+"""
+from core.game.IEventSink import IEventSink
+from core.game.GameEvent import GameEvent
+
+DEFAULT_BUFFERED_LINES: int = 4096
+
+
+class FileEventSink(IEventSink):
+    def __init__(self, path: str, buffered_lines: int = DEFAULT_BUFFERED_LINES):
+        self._file = open(path, 'w')
+        self._buffered_lines = buffered_lines
+        self._lines = []
+
+    def handle_event(self, event: GameEvent):
+        self._lines.append(event.get_event_text())
+        if len(self._lines) >= self._buffered_lines:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self._file.write('\n'.join(self._lines))
+            self._file.write('\n')
+            self._lines = []
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,13 +1,33 @@
-from core.game.Card import Card
+from core.game.Card import Card, CARD_COLORS, KIND_CARD_TYPES, KIND_DRAW_COUNTS, KIND_IS_ACTION, KIND_IS_WILD
+from core.game.DrawStackingRule import DrawStackingRule
 from core.game.IPlayer import IPlayer
 from core.game.GameEngineHelper import GameEngineHelper
+from core.game.GameState import GameState
+from core.game.DrawPile import DrawPile
+from core.game.Deal import Deal
+from core.game.LegalityTable import LegalityTable, SKIP_SERVED_FLAG, DRAW_PENDING_FLAG, MIXED_STACKING_FLAG
 from core.game.PlayerGameHelper import PlayerGameHelper
+from core.game.PlayerHandCount import PlayerHandCount
+from core.game.PositionHash import PositionHash
+from core.game.RoundDrawReason import RoundDrawReason
+from core.game.RoundLimits import RoundLimits
 from core.game.GamePlayer import GamePlayer
-from typing import List
+from core.game.MatchResult import MatchResult
+from core.game.EngineProfiler import EngineProfiler
+from core.game.EnginePhase import EnginePhase
+from core.game.TimeBudget import TimeBudget
+from core.game.CardAction import CardAction
+from core.replay.ReplayRecorder import ReplayRecorder
+from typing import Callable, Generator, Iterable, List
 from core.game.ActionType import ActionType
 from core.game.CardType import CardType
 from core.game.ColorType import ColorType
-from random import shuffle
+from core.game.EventType import EventType
+from core.game.GameEvent import GameEvent
+from core.game.IEventSink import IEventSink
+from core.game.NullEventSink import NullEventSink
+from random import Random
+from time import perf_counter
 from collections import Counter
 
 INITIAL_HAND_SIZE: int = 7
@@ -17,139 +37,243 @@ DECK_SIZE: int = 108
 
 
 class GameEngine:
-    def __init__(self, players, rounds_per_match):
+    def __init__(self, players, rounds_per_match, event_sinks: List[IEventSink] = None,
+                 hand_factory: Callable[[Iterable[Card]], List[Card]] = list, seed: int = None, random: Random = None,
+                 profiler: EngineProfiler = None, time_budget: TimeBudget = None,
+                 replay_recorder: ReplayRecorder = None,
+                 draw_stacking_rule: DrawStackingRule = DrawStackingRule.SAME_TYPE, round_limits: RoundLimits = None,
+                 deal: Deal = None):
         players_count = len(players)
         if players_count < MIN_REQUIRED_PLAYERS or players_count > MAX_REQUIRED_PLAYERS:
             raise ValueError('Amount of players (currently: {players_count}) must be at least 2 and cannot exceed 10')
         self._players = players
         self._roundsPerMatch = rounds_per_match
-        self._deck = GameEngineHelper.create_game_deck()
-        self._amount_of_cards_used_in_round = 0
+        # A replay is the seed plus every player's answers, so a recorded match always needs a seed
+        if replay_recorder is not None and seed is None:
+            if random is not None:
+                raise ValueError('A match can only be recorded when the GameEngine is given a seed, not a Random')
+            seed = Random().getrandbits(64)
+        # With a deal every round's deck comes from it, a replay only has the seed to shuffle them again
+        if deal is not None:
+            if replay_recorder is not None:
+                raise ValueError('A match played on a Deal cannot be recorded, a replay shuffles its own decks')
+            if deal.round_count < rounds_per_match:
+                raise ValueError('A deal of {} rounds cannot be played over {} rounds'
+                                 .format(deal.round_count, rounds_per_match))
+        self._deal: Deal = deal
+        self._seed = seed
+        # Every shuffle goes through this generator, the same seed always plays out the same match
+        self._random: Random = random if random is not None else Random(seed)
+        # Every player gets their own generator, derived before anything else is drawn from ours
+        for player in players:
+            player.set_random(Random(self._random.getrandbits(64)))
+        # Dealt at the start of every round
+        self._deck = DrawPile()
         self._top_card_in_pile = None
         # Card played in turn
         self._card_played = None
+        # Discard pile, the top card is the last one. It is only shuffled back into the deck once the deck runs out.
         self._card_pile = []
-        # To be used to catch possible stack overflow
+        # Color the next card has to match: the color of the top card, or the color declared for a wild
+        self._current_color: ColorType = None
+        # Every player of the current round in turn order
+        self._round_players: List[GamePlayer] = []
+        # Cards in every player's hand by player id, their total and a PlayerHandCount per player in turn order
+        self._hand_counts: List[int] = [0] * players_count
+        self._hand_card_total = 0
+        self._player_hand_counts: tuple = ()
+        self._player_hand_counts_by_direction = {1: (), -1: ()}
+        # One PlayerGameHelper per player id, created every round and updated before each turn
+        self._player_game_helpers: List[PlayerGameHelper] = []
+        # Index in _round_players of the player taking their turn, and 1 or -1 for the direction of play
+        self._turn_index = 0
+        self._direction = 1
+        # Builds each player's hand from the dealt cards, e.g. list or CardHand
+        self._hand_factory = hand_factory
+        # Rounds that go on for too long end as a draw, the positions are only hashed for a repetition limit
+        self._round_limits: RoundLimits = round_limits
+        self._position_hash: PositionHash = None
+        if round_limits is not None and round_limits.repetition_limit is not None:
+            self._position_hash = PositionHash(players_count)
+        # Times every position has come up this round, and the position of the current turn
+        self._position_counts = {}
         self._repetition_count = 0
-        # To be used to track stacked draws
-        self._are_draw_cards_stacked = False
         self._did_player_skip = False
+        # The draw card on top of the pile has not been answered by the next player yet
+        self._is_draw_pending = False
+        # Cards of every draw card stacked so far, drawn at once by the first player who does not stack
+        self._pending_draw_count = 0
+        self._draw_stacking_rule = draw_stacking_rule
+        self._stacking_flags = MIXED_STACKING_FLAG if draw_stacking_rule == DrawStackingRule.MIXED else 0
+        # Events are only created when at least one sink is subscribed
+        self._event_sinks: List[IEventSink] = []
+        self._current_round = 0
+        self._match_result: MatchResult = None
+        # Timing is only measured when a profiler is given
+        self._profiler: EngineProfiler = profiler
+        # Thinking time limits, with the time every player used and their timed out turns this match
+        self._time_budget: TimeBudget = time_budget
+        self._player_time_used: List[float] = [0.0] * players_count
+        self._player_timeout_counts: List[int] = [0] * players_count
+        self._replay_recorder: ReplayRecorder = replay_recorder
+        for event_sink in event_sinks or []:
+            self.subscribe(event_sink)
+
+    def subscribe(self, event_sink: IEventSink):
+        # A NullEventSink is the same as no sink at all, keep the match headless
+        if not isinstance(event_sink, NullEventSink):
+            self._event_sinks.append(event_sink)
+
+    def __emit(self, event_type: EventType, game_player: GamePlayer = None, card: Card = None,
+               cards: List[Card] = None, hand_counts: List[int] = None, draw_reason: RoundDrawReason = None):
+        player_id = None
+        player_name = None
+        if game_player is not None:
+            player_id = game_player.player_id
+            player_name = game_player.player.get_player_name()
+        event = GameEvent(event_type, self._current_round, player_id, player_name, card, cards, hand_counts,
+                          draw_reason)
+        for event_sink in self._event_sinks:
+            event_sink.handle_event(event)
 
     def __get_and_create_game_players(self, players):
         game_players = []
+        self._hand_counts = [0] * len(players)
+        if self._position_hash is not None:
+            self._position_hash.reset()
         for index, player in enumerate(players):
-            player_hand = self.__draw_cards(INITIAL_HAND_SIZE, True)
+            player_hand = self._hand_factory(self.__draw_cards(INITIAL_HAND_SIZE, True))
             game_player = GamePlayer(player, player_hand, index)
             game_players.append(game_player)
+            self._hand_counts[index] = len(player_hand)
+            if self._position_hash is not None:
+                self._position_hash.add_cards(index, player_hand)
+        self._hand_card_total = sum(self._hand_counts)
         return game_players
 
+    def __set_round_players(self, round_players: List[GamePlayer]):
+        self._round_players = round_players
+        player_hand_counts = tuple(
+            PlayerHandCount(game_player.player.get_player_name(), game_player.player_id, self._hand_counts)
+            for game_player in round_players)
+        self._player_hand_counts_by_direction = {1: player_hand_counts, -1: player_hand_counts[::-1]}
+        self._player_hand_counts = self._player_hand_counts_by_direction[self._direction]
+
+    def __get_first_turn_index(self, first_card: Card) -> int:
+        # Every round starts with the first player going forward and nothing on the pile to answer
+        self._direction = 1
+        self._player_hand_counts = self._player_hand_counts_by_direction[1]
+        self._did_player_skip = False
+        self._is_draw_pending = False
+        self._pending_draw_count = 0
+        first_card_type = KIND_CARD_TYPES[first_card.kind]
+        if first_card_type == CardType.REVERSE and len(self._round_players) > 2:
+            self.__reverse_direction()
+        elif first_card_type == CardType.SKIP or first_card_type == CardType.REVERSE:
+            # The first player is skipped
+            self._did_player_skip = True
+            return 1
+        return 0
+
+    def __get_next_turn_index(self, turn_index: int, turn_steps: int = 1) -> int:
+        return (turn_index + turn_steps * self._direction) % len(self._round_players)
+
+    def __reverse_direction(self):
+        self._direction = -self._direction
+        self._player_hand_counts = self._player_hand_counts_by_direction[self._direction]
+
     def __shuffle_cards(self):
+        self.__check_card_conservation()
         # We want to shuffle the entire card pile except the top one
         shuffled_card_pile = self._card_pile[:-1]
-        card_pile_after_shuffle = self._card_pile[-1]
-        shuffle(shuffled_card_pile)
-        # We want to set the variables again now that the deck is shuffled
-        self._deck = shuffled_card_pile
-        self._card_pile = [card_pile_after_shuffle]
-        self._amount_of_cards_used_in_round = len(self._card_pile)
+        self._random.shuffle(shuffled_card_pile)
+        if self._position_hash is not None:
+            self._position_hash.remove_from_pile(shuffled_card_pile)
+        # The deck is only refilled once it runs out, the shuffled card pile goes under what is left
+        self._deck.refill(shuffled_card_pile)
+        # Emptied in place, the players' card pile views keep pointing at it
+        del self._card_pile[:-1]
 
     def __is_deck_out_of_cards(self, amount_to_be_drawn: int = 0) -> bool:
+        return len(self._deck) == 0 or amount_to_be_drawn > len(self._deck)
 
-        player_hand_count = self.__get_players_hand_counts(self._players)
-
-        # this is coupled to the players defined in the constructor, which may not be the players of the round
-        cards_used_from_deck_count = self._amount_of_cards_used_in_round + player_hand_count
-
-        if cards_used_from_deck_count == DECK_SIZE:
-            return True
-        elif cards_used_from_deck_count + amount_to_be_drawn > DECK_SIZE:
-            return True
-        elif cards_used_from_deck_count > DECK_SIZE:
-            print('Morty, *BURP* this isn\'t good, we somehow drew more cards than this universe allows!!??')
-            return True
-        else:
-            return False
+    def __check_card_conservation(self):
+        cards_in_round_count = len(self._deck) + len(self._card_pile) + self._hand_card_total
+        if cards_in_round_count != DECK_SIZE:
+            raise RuntimeError('Morty, *BURP* this isn\'t good, there are {} cards in this round '
+                               'but this universe only allows {}!!??'.format(cards_in_round_count, DECK_SIZE))
 
     def __draw_cards(self, draw_count: int, initial_hand_draw: bool = False):
         # We don't need to worry about checking deck size at the beginning of the game
-        # if not initial_hand_draw:
-        # if self.__is_deck_out_of_cards(draw_count):
-        #     self.__shuffle_cards()
+        if initial_hand_draw or not self.__is_deck_out_of_cards(draw_count):
+            return self._deck.draw(draw_count)
 
-        drawn_cards = []
-        for n in range(draw_count):
-            drawn_cards.append(self._deck.pop(0))
-        self._amount_of_cards_used_in_round += len(drawn_cards)
-        return drawn_cards
+        self.__shuffle_cards()
+        # If every other card is in a hand, the player only gets what is left
+        return self._deck.draw(min(draw_count, len(self._deck)))
 
     def __first_card_draw(self) -> [Card]:
         # No matter what the player (easy,hard,etc. we will play the first card from the deck
         # We need to check that the first card if is an action card isn't a wild or wild draw four.
         card_drawn = self.__draw_cards(1, True)[0]
-        while card_drawn.card_type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
+        while KIND_IS_WILD[card_drawn.kind]:
             # Put back in deck at end
-            self._deck.append(card_drawn)
-            # Update deck size tracker
-            self._amount_of_cards_used_in_round -= 1
+            self._deck.put_on_bottom(card_drawn)
             # Try again
             card_drawn = self.__draw_cards(1, True)[0]
         # This is the first card in the card pile
         self._card_pile.append(card_drawn)
+        self._current_color = card_drawn.color_type
+        if self._position_hash is not None:
+            self._position_hash.add_to_pile(card_drawn)
         return card_drawn
 
-    def __create_player_game_helper(self, active_player: GamePlayer):
-        hand = active_player.hand
-        last_card_played = self._card_pile[-1]
-        card_pile = self._card_pile
-        deck_count = len(self._deck)
-        opp_hand_count = []
-        return PlayerGameHelper(hand, last_card_played, card_pile, deck_count, opp_hand_count)
-
-    def __get_legal_response_cards(self, player_game_helper: PlayerGameHelper):
-        last_card_played = self._card_pile[-1]
-        legal_card_responses = []
-        for current_card in player_game_helper.get_hand():
-            if not self.__is_action(last_card_played):
-                # It has to match either color or number
-                if current_card.color_type == last_card_played.color_type \
-                        or current_card.card_type == last_card_played.card_type:
-                    legal_card_responses.append(current_card)
-                if current_card.card_type in [CardType.WILD_DRAW_FOUR, CardType.WILD]:
-                    # If it is not an action, we can always play any Wild card
-                    legal_card_responses.append(current_card)
-            else:
-                if last_card_played.card_type == CardType.WILD_DRAW_FOUR:
-                    # If a wild card +4 was played, you can only play that card
-                    if current_card.card_type == last_card_played.card_type:
-                        legal_card_responses.append(current_card)
-                elif last_card_played.color_type == ColorType.BLACK \
-                        and last_card_played.card_type == CardType.WILD:
-                    # If a wild card was played, but no color was chosen
-                    # This should be handled before we get here: choose a color at random
-                    print('Wild card was played, but no color type was declared!')
-                    return legal_card_responses
-                elif last_card_played.color_type != ColorType.BLACK \
-                        and last_card_played.card_type == CardType.WILD:
-                    # If a wild card was played, you can only play cards of the color declared
-                    # or more wild
-                    if current_card.color_type == last_card_played.color_type \
-                            or current_card.card_type in [CardType.WILD_DRAW_FOUR, CardType.WILD]:
-                        legal_card_responses.append(current_card)
-                elif last_card_played.card_type == CardType.DRAW_TWO:
-                    # Draws can be stacked
-                    if current_card.card_type == last_card_played.card_type \
-                            and current_card.color_type == last_card_played.color_type:
-                        legal_card_responses.append(current_card)
-                elif last_card_played.card_type == CardType.REVERSE:
-                    if current_card.color_type == last_card_played.color_type \
-                            or current_card.card_type in [CardType.WILD_DRAW_FOUR, CardType.WILD]:
-                        legal_card_responses.append(current_card)
-                elif last_card_played.card_type == CardType.SKIP:
-                    if self._did_player_skip:
-                        if current_card.color_type == last_card_played.color_type \
-                                or current_card.card_type in [CardType.WILD_DRAW_FOUR, CardType.WILD]:
-                            legal_card_responses.append(current_card)
-        return legal_card_responses
+    def __create_player_game_helpers(self, game_players: List[GamePlayer]):
+        self._player_game_helpers = [None] * len(game_players)
+        for game_player in game_players:
+            player_id = game_player.player_id
+            self._player_game_helpers[player_id] = PlayerGameHelper(
+                game_player.hand, self._card_pile[-1], self._card_pile, len(self._deck), self._player_hand_counts,
+                self._current_color, self.__get_legality_flags(), None, self.__create_game_state_provider(player_id),
+                player_id)
+
+    def __create_game_state_provider(self, player_id: int) -> Callable[[], GameState]:
+        return lambda: self.__create_game_state().get_player_view(player_id)
+
+    def __update_player_game_helper(self, active_player: GamePlayer) -> PlayerGameHelper:
+        time_remaining = None
+        if self._time_budget is not None:
+            time_remaining = self._time_budget.get_time_remaining(self._player_time_used[active_player.player_id])
+        player_game_helper = self._player_game_helpers[active_player.player_id]
+        player_game_helper.update_turn(self._card_pile[-1], len(self._deck), self._player_hand_counts,
+                                       self._current_color, self.__get_legality_flags(), time_remaining,
+                                       self._pending_draw_count)
+        return player_game_helper
+
+    def __create_game_state(self) -> GameState:
+        # Only built when a player asks for it, the snapshot starts with the player taking their turn
+        hands = [None] * len(self._round_players)
+        for game_player in self._round_players:
+            hands[game_player.player_id] = game_player.hand
+        return GameState.create(self._deck.get_cards(), self._card_pile, hands,
+                                [game_player.player_id for game_player in self._round_players], self._turn_index,
+                                self._current_color, self.__get_legality_flags(), self._direction,
+                                self._pending_draw_count)
+
+    def __get_legality_flags(self) -> int:
+        flags = self._stacking_flags
+        if self._did_player_skip:
+            flags |= SKIP_SERVED_FLAG
+        if self._is_draw_pending:
+            flags |= DRAW_PENDING_FLAG
+        return flags
+
+    def __is_legal_response(self, hand: List[Card], card: Card) -> bool:
+        if not isinstance(card, Card):
+            return False
+        legal_mask = LegalityTable.get_legal_mask(self._card_pile[-1], self._current_color,
+                                                  self.__get_legality_flags())
+        return legal_mask >> card.kind & 1 == 1 and card in hand
 
     def __is_color_change(self) -> bool:
         if self._top_card_in_pile.color_type == self._card_played.color_type:
@@ -158,209 +282,302 @@ class GameEngine:
             return True
 
     def __is_action(self, card: Card) -> bool:
-
-        if card.card_type in [CardType.DRAW_TWO, CardType.REVERSE, CardType.SKIP,
-                              CardType.WILD, CardType.WILD_DRAW_FOUR]:
-            return True
-        else:
-            return False
+        return KIND_IS_ACTION[card.kind]
 
     def __draw_card_to_hand(self, game_player: GamePlayer, amount_to_draw: int):
+        if self._profiler is not None:
+            phase_start = perf_counter()
         cards_drawn = self.__draw_cards(amount_to_draw, False)
 
         # This should work now that I added a setter property on GamePlayer.hand
         game_player.hand.extend(cards_drawn)
-
-    def __get_players_hand_counts(self, players) -> int:
-        hand_count = 0
-        for player in players:
-            if hasattr(player.get_game_helper(), 'get_hand'):
-                hand_count += len(player.get_game_helper().get_hand())
-            else:
-                print('Uhhh this player has no hand.... ')
-        return hand_count
+        self._hand_counts[game_player.player_id] += len(cards_drawn)
+        self._hand_card_total += len(cards_drawn)
+        self._player_game_helpers[game_player.player_id].set_hand_changed()
+        if self._position_hash is not None:
+            self._position_hash.add_cards(game_player.player_id, cards_drawn)
+        if self._profiler is not None:
+            self._profiler.record_phase(EnginePhase.DRAW, perf_counter() - phase_start)
+        if self._event_sinks:
+            self.__emit(EventType.CARDS_DRAWN, game_player, cards=cards_drawn)
+
+    def __get_round_draw_reason(self, turn_count: int) -> RoundDrawReason:
+        # None while the round can go on
+        max_turns = self._round_limits.max_turns
+        if max_turns is not None and turn_count > max_turns:
+            return RoundDrawReason.TURN_LIMIT
+        if self._position_hash is None:
+            return None
+        position_key = self._position_hash.get_position_key(
+            self._card_pile[-1], LegalityTable.get_color_index(self._current_color), self.__get_legality_flags(),
+            self._pending_draw_count, self._turn_index, self._direction)
+        self._repetition_count = self._position_counts.get(position_key, 0) + 1
+        self._position_counts[position_key] = self._repetition_count
+        if self._repetition_count >= self._round_limits.repetition_limit:
+            return RoundDrawReason.REPETITION
+        return None
 
     def __determine_winner(self, winning_player_ids) -> GamePlayer:
+        # Drawn rounds have no winner, a match without a single round won has none either
+        winning_player_ids = [player_id for player_id in winning_player_ids if player_id is not None]
+        if not winning_player_ids:
+            return None
         dict_of_occurrences = Counter(winning_player_ids)
         max_occurrence_count = max(dict_of_occurrences.values())
         for value, occurrence_count in dict_of_occurrences.items():
             if occurrence_count == max_occurrence_count:
-                print('Player with id {} won the match!!'.format(value))
-                for game_player in self.__get_and_create_game_players(self._players):
+                # Player ids never change between rounds, so the last round's players can be reused
+                for game_player in self._round_players:
                     if game_player.player_id == value:
+                        if self._event_sinks:
+                            self.__emit(EventType.MATCH_WON, game_player)
                         return game_player
         print('Oddly enough, we cannot figure out the player that won?!?!? \nReturning the first player...')
-        return self.__get_and_create_game_players(self._players)[0]
+        return self._round_players[0]
+
+    def __take_timed_turn(self, game_player: GamePlayer) -> CardAction:
+        time_remaining = self._get_turn_time_remaining(game_player)
+        if time_remaining is not None and time_remaining <= 0:
+            # The match budget is spent, the player is not even asked
+            return self._time_out_turn(game_player)
+
+        decision_start = perf_counter()
+        if time_remaining is not None and self._time_budget.can_interrupt():
+            player_action = self._time_budget.call_with_deadline(game_player.player.take_turn, time_remaining)
+        else:
+            player_action = game_player.player.take_turn()
+        return self._finish_timed_turn(game_player, player_action, perf_counter() - decision_start, time_remaining)
+
+    def _is_turn_timed(self) -> bool:
+        return self._profiler is not None or self._time_budget is not None
+
+    def _get_turn_time_remaining(self, game_player: GamePlayer) -> float:
+        # None when there is no limit, 0 or less once the player's match budget is spent
+        if self._time_budget is None:
+            return None
+        return self._time_budget.get_time_remaining(self._player_time_used[game_player.player_id])
+
+    def _finish_timed_turn(self, game_player: GamePlayer, player_action: CardAction, decision_time: float,
+                           time_remaining: float) -> CardAction:
+        # Counts the thinking time, an answer that is missing or came too late becomes a SKIP
+        player_id = game_player.player_id
+        if self._profiler is not None:
+            self._profiler.record_decision(player_id, decision_time)
+        if self._time_budget is not None:
+            self._player_time_used[player_id] += decision_time
+            if player_action is None or (time_remaining is not None and decision_time > time_remaining):
+                return self._time_out_turn(game_player)
+        return player_action
+
+    def _time_out_turn(self, game_player: GamePlayer) -> CardAction:
+        self._player_timeout_counts[game_player.player_id] += 1
+        if self._event_sinks:
+            self.__emit(EventType.TURN_TIMED_OUT, game_player)
+        return CardAction(ActionType.SKIP)
 
     def __handle_stacked_draws(self, game_player: GamePlayer):
-        print('hello')
-        # Needs to handle stacked draws
-        # if self._are_draw_cards_stacked:
-        #     self._are_draw_cards_stacked = False
-        #     cards_to_draw = 0
-        #     draw_card_type_stacked = self._card_pile[-2]
-        #     for card in reversed(self._card_pile):
-        #         if card.card_type in [CardType.WILD_DRAW_FOUR]:
-        #             cards_to_draw += 4
-        #         if card.card_type in [CardType.DRAW_TWO]:
-        #             cards_to_draw += 2
-        #         if draw_card_type_stacked.card_type != card.card_type:
-        #             break
-        #     self.__draw_card_to_hand(game_player, cards_to_draw)
-
-    def __order_of_players_reversed(self, players_in_round, index: int):
-        new_end_of_list = players_in_round[index]
-        first_half_reversed_list = list(reversed(players_in_round[:index]))
-        second_half_reversed_list = list(reversed(players_in_round[index + 1:]))
-        first_half_reversed_list.extend(second_half_reversed_list)
-        first_half_reversed_list.append(new_end_of_list)
-        return first_half_reversed_list
+        # The player did not stack, they draw every stacked card at once and lose their turn
+        self.__draw_card_to_hand(game_player, self._pending_draw_count)
+        self._pending_draw_count = 0
+        self._is_draw_pending = False
 
     def start(self) -> GamePlayer:
+        # Returns the winner of the match, None when every round was drawn
+        match = self._play_match()
+        is_turn_timed = self._is_turn_timed()
+        try:
+            active_player = next(match)
+            while True:
+                if is_turn_timed:
+                    player_action = self.__take_timed_turn(active_player)
+                else:
+                    player_action = active_player.player.take_turn()
+                active_player = match.send(player_action)
+        except StopIteration as match_over:
+            return match_over.value
+
+    def _play_match(self) -> Generator[GamePlayer, CardAction, GamePlayer]:
+        # The whole match, stopping at every turn: yields the player to move, is sent their action and returns
+        # the winner. start() and AsyncGameEngine only differ in how they get the action.
         current_round = 0
         round_winners_player_ids = []
-        while current_round <= self._roundsPerMatch:
-            # At the beginning of every round, get a fresh list of players and reset round variables.
-            round_players = self.__get_and_create_game_players(self._players)
-            self._deck = GameEngineHelper.create_game_deck()
-            self._amount_of_cards_used_in_round = 0
+        round_turn_counts = []
+        profiler = self._profiler
+        self._player_time_used = [0.0] * len(self._players)
+        self._player_timeout_counts = [0] * len(self._players)
+        if profiler is not None:
+            match_start = perf_counter()
+            if not profiler.has_player_keys():
+                profiler.set_player_keys(['{} #{}'.format(player.get_player_name(), player_id)
+                                          for player_id, player in enumerate(self._players)])
+        if self._replay_recorder is not None:
+            self._replay_recorder.start_game(self._seed, self._roundsPerMatch,
+                                             [player.get_player_name() for player in self._players],
+                                             self._draw_stacking_rule, self._round_limits)
+        while current_round < self._roundsPerMatch:
+            # At the beginning of every round, get a fresh deck and list of players and reset round variables.
+            if self._deal is not None:
+                # The same cards in the same order for every seating of the deal, nothing is shuffled
+                self._deck = DrawPile(self._deal.round_decks[current_round])
+            else:
+                self._deck = DrawPile(GameEngineHelper.create_game_deck(self._random))
             self._card_pile = []
+            round_players = self.__get_and_create_game_players(self._players)
+            self.__set_round_players(round_players)
             current_round += 1
+            self._current_round = current_round
             round_won = False
-            print('- Round {0}'.format(current_round))
+            turn_count = 0
+            self._position_counts = {}
+            self._repetition_count = 0
+            if self._event_sinks:
+                self.__emit(EventType.ROUND_STARTED)
 
             # Keep playing the same round until a winner is chosen.
             while not round_won:
-                print('koloss')
                 active_player = None
 
-                self.__first_card_draw()
+                first_card = self.__first_card_draw()
+                if self._replay_recorder is not None:
+                    self._replay_recorder.record_round_started(first_card)
+                self.__create_player_game_helpers(round_players)
 
-                # Use while loop since we are messing with the order of round_players while iterating over it
-                # Examples: Reverses in > 2 players
+                # The seats of the round form a fixed ring, turns go around it in the current direction.
+                # Skips and reverses only move the turn index or flip the direction, round_players never changes.
                 # Main game loop starts here, loop through each player until a player has 0 cards.
-                i = 0
-                while i < len(round_players):
-
-                    active_player = round_players[i]
-
-                    for player in round_players:
-                        print(len(player.hand))
-
-                    # Adjust iterator for while loop
-                    if i == len(round_players) - 1:
-                        i = 0
-                    else:
-                        i += 1
-
-                    # create PlayerGameHelper
-                    active_player_game_helper = self.__create_player_game_helper(active_player)
-                    # PlayerGameHelper is only for this turn for this player
+                self._turn_index = self.__get_first_turn_index(first_card)
+                while not round_won:
+
+                    active_player = round_players[self._turn_index]
+                    turn_count += 1
+                    if self._round_limits is not None:
+                        draw_reason = self.__get_round_draw_reason(turn_count)
+                        if draw_reason is not None:
+                            # The round is over without a winner, this turn is never taken
+                            round_won = True
+                            if self._event_sinks:
+                                self.__emit(EventType.ROUND_DRAWN, draw_reason=draw_reason)
+                            round_winners_player_ids.append(None)
+                            if self._replay_recorder is not None:
+                                self._replay_recorder.record_round_drawn()
+                            round_turn_counts.append(turn_count - 1)
+                            break
+                    # The next player plays after this turn, a skip moves one seat further
+                    turn_steps = 1
+
+                    if self._event_sinks:
+                        self.__emit(EventType.TURN_STARTED, active_player,
+                                    hand_counts=[self._hand_counts[player.player_id] for player in round_players])
+
+                    # update the player's PlayerGameHelper
+                    if profiler is not None:
+                        phase_start = perf_counter()
+                    active_player_game_helper = self.__update_player_game_helper(active_player)
                     active_player.player.set_game_helper(active_player_game_helper)
-                    current_game_helper = active_player.player.get_game_helper()
-
-                    last_card_played = self._card_pile[-1]
-                    player_action = active_player.player.take_turn()
+                    if profiler is not None:
+                        profiler.record_phase(EnginePhase.HELPER_UPDATE, perf_counter() - phase_start)
+                    player_action = yield active_player
+                    if self._replay_recorder is not None:
+                        self._replay_recorder.record_action(player_action)
                     self._card_played = player_action.card
 
                     # check what was played is legal and from their hand AND they aren't skipping
                     if player_action.action == ActionType.PLAY:
-                        # legal_responses = self.__get_legal_response_cards(current_game_helper)
-                        legal_responses = current_game_helper.get_valid_hand()
-                        if self._card_played not in legal_responses:
-                            # Logic here to draw, reverse/skip, skip in case they don't respond with a matching card
-                            if last_card_played.card_type in [CardType.DRAW_TWO, CardType.REVERSE,
-                                                              CardType.SKIP, CardType.WILD_DRAW_FOUR]:
-                                print('You don''t have this card in your hand: {}, the last card played was: {}'
-                                      .format(self._card_played.get_card_text(), last_card_played.get_card_text()))
-
-                                if last_card_played.card_type == CardType.SKIP:
-                                    self._did_player_skip = True
-                                    print('You have to skip your turn')
-                                elif last_card_played.card_type == CardType.REVERSE:
-                                    if len(round_players) > 2:
-                                        # We only reverse if more than 2 players
-                                        round_players = self.__order_of_players_reversed(round_players, i)
-                                elif last_card_played.card_type in [CardType.DRAW_TWO, CardType.WILD_DRAW_FOUR]:
-                                    print('You have to draw and skip your turn')
-                                    # Draw logic if stack Draws
-                                    print('hey')
-                                    self.__handle_stacked_draws(active_player)
-
-                                continue
+                        if profiler is not None:
+                            phase_start = perf_counter()
+                            is_legal_response = self.__is_legal_response(active_player.hand, self._card_played)
+                            profiler.record_phase(EnginePhase.VALIDATION, perf_counter() - phase_start)
+                        else:
+                            is_legal_response = self.__is_legal_response(active_player.hand, self._card_played)
+                        if not is_legal_response:
+                            # Logic here to draw in case they don't respond with a matching card
+                            if self._event_sinks:
+                                self.__emit(EventType.ILLEGAL_PLAY, active_player, card=self._card_played)
+                            if self._is_draw_pending:
+                                # Draw logic if stack Draws
+                                self.__handle_stacked_draws(active_player)
                             else:
-                                if self._card_played is None:
-                                    print('ERROR')
-                                if self._card_played.card_type is not None:
-                                    print('ILLEGAL play or this card is not in your hand, tsk tsk!\n'
-                                          'Type: {}  \n Drawing a card and skipping your turn instead'
-                                          .format(self._card_played.card_type.value))
+                                # Drawing a card and skipping their turn instead
                                 self.__draw_card_to_hand(active_player, 1)
-                                self.__handle_stacked_draws(active_player)
-                                continue
                         else:
                             # IT IS LEGAL remove card from hand
                             # This card can be rightfully added to the pile
-                            for c in self._card_pile:
-                                self._deck.append(c)
-
-                            self._card_pile = [self._card_played]
-                            shuffle(self._deck)
+                            if self._event_sinks:
+                                self.__emit(EventType.CARD_PLAYED, active_player, card=self._card_played)
+                            if profiler is not None:
+                                phase_start = perf_counter()
+                            self._card_pile.append(self._card_played)
+                            card_type = KIND_CARD_TYPES[self._card_played.kind]
+                            if KIND_IS_WILD[self._card_played.kind]:
+                                # The color picked for a wild travels with the action, pick one if it was forgotten
+                                if player_action.color in CARD_COLORS:
+                                    self._current_color = player_action.color
+                                else:
+                                    self._current_color = self._random.choice(CARD_COLORS)
+                            else:
+                                self._current_color = self._card_played.color_type
 
-                            # Skip is no longer on top of the card pile
+                            # Skip is no longer on top of the card pile, a draw card has to be answered by the next player
                             self._did_player_skip = False
-
-                            # We can stack Draw +4(Wild)/+2 cards, and we can reply using Reverse
-                            # if last_card_played.card_type in [CardType.DRAW_TWO, CardType.WILD_DRAW_FOUR]:
-                            #     if last_card_played.card_type == self._card_played.card_type:
-                            #         self._are_draw_cards_stacked = True
-                            # else:
-                            #     self.__handle_stacked_draws(active_player)
-
-                            if len(round_players) > 2 \
-                                    and last_card_played.card_type == CardType.REVERSE \
-                                    and self._card_played.card_type == CardType.REVERSE:
-                                # We only reverse if more than 2 players
-                                round_players = self.__order_of_players_reversed(round_players, i)
-
-                            # Remove the card from the player's hand
-                            for index, card in enumerate(active_player.hand):
-                                if card.card_type == self._card_played.card_type \
-                                        and card.color_type == self._card_played.color_type:
-                                    del active_player.hand[index]
-                                    break
+                            self._is_draw_pending = card_type in [CardType.DRAW_TWO, CardType.WILD_DRAW_FOUR]
+                            self._pending_draw_count += KIND_DRAW_COUNTS[self._card_played.kind]
+
+                            if card_type == CardType.REVERSE and len(round_players) > 2:
+                                self.__reverse_direction()
+                            elif card_type == CardType.SKIP or card_type == CardType.REVERSE:
+                                # The next player is skipped, between 2 players a reverse acts like a skip
+                                turn_steps = 2
+                                self._did_player_skip = True
+                                if self._event_sinks:
+                                    self.__emit(EventType.TURN_SKIPPED,
+                                                round_players[self.__get_next_turn_index(self._turn_index)])
+
+                            # Remove the card from the player's hand, cards are shared so any copy is the same object
+                            active_player.hand.remove(self._card_played)
+                            self._hand_counts[active_player.player_id] -= 1
+                            self._hand_card_total -= 1
+                            active_player_game_helper.set_hand_changed()
+                            if self._position_hash is not None:
+                                self._position_hash.play_card(active_player.player_id, self._card_played)
+                            if profiler is not None:
+                                profiler.record_phase(EnginePhase.PILE_UPDATE, perf_counter() - phase_start)
+
+                            # After the card has been played, if that player has no more cards, they win the round.
+                            if self._hand_counts[active_player.player_id] <= 0:
+                                round_won = True
+                                if self._event_sinks:
+                                    self.__emit(EventType.ROUND_WON, active_player)
+                                round_winners_player_ids.append(active_player.player_id)
+                                if self._replay_recorder is not None:
+                                    self._replay_recorder.record_round_won(active_player.player_id)
+                                round_turn_counts.append(turn_count)
+                                break
 
                     else:
-                        if last_card_played == CardType.SKIP:
-                            self._did_player_skip = True
-                            print("A skip card was played and the player did skip their turn")
-                        elif last_card_played == CardType.REVERSE:
-                            # Reverse logic here for > 2 ppl game
-                            if len(round_players) > 2 \
-                                    and last_card_played.card_type == CardType.REVERSE:
-                                # encapsulate in handle reverse
-                                round_players = self.__order_of_players_reversed(round_players, i)
-                            print("A reverse card was played and the player did skip their turn")
+                        if self._is_draw_pending:
+                            self.__handle_stacked_draws(active_player)
+                            if self._event_sinks:
+                                self.__emit(EventType.TURN_SKIPPED, active_player)
                         else:
                             # skip and draw logic here
                             self.__draw_card_to_hand(active_player, 1)
-                            # print(
-                            #     '{} drew a card and skipped their turn'.format(active_player.player.get_player_name()))
                             self._did_player_skip = True
-                            # if last_card_played in [CardType.DRAW_TWO, CardType.WILD_DRAW_FOUR]:
-                            #     self.__handle_stacked_draws(active_player)
-
-                        continue
 
-                    # print('{} uses action {}'.format(active_player.player.get_player_name(), player_action.action))
-                    # print('{}'.format(self._card_played.get_card_text()))
-
-                    # After the card has been played, if that player has no more cards, they win the round.
-                    if len(active_player.hand) <= 0:
-                        round_won = True
-                        print('{} won the round!'.format(active_player.player.get_player_name()))
-                        round_winners_player_ids.append(active_player.player_id)
+                    self._turn_index = self.__get_next_turn_index(self._turn_index, turn_steps)
 
         # After all rounds have been played, handle any Match over logic here
-        print('Match is over!')
-        return self.__determine_winner(round_winners_player_ids)
+        winner = self.__determine_winner(round_winners_player_ids)
+        winner_id = winner.player_id if winner is not None else None
+        if self._time_budget is not None:
+            self._match_result = MatchResult(winner_id, round_winners_player_ids, round_turn_counts,
+                                             self._player_time_used, self._player_timeout_counts)
+        else:
+            self._match_result = MatchResult(winner_id, round_winners_player_ids, round_turn_counts)
+        if self._replay_recorder is not None:
+            self._replay_recorder.finish_game()
+        if profiler is not None:
+            profiler.record_match(perf_counter() - match_start)
+        return winner
+
+    def get_match_result(self) -> MatchResult:
+        return self._match_result
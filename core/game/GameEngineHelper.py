@@ -1,7 +1,7 @@
 from core.game.Card import Card
 from core.game.ColorType import ColorType
 from core.game.CardType import CardType
-from random import shuffle
+from random import Random, shuffle
 
 WILD_CARD_COUNT = 4
 ACTION_CARD_COUNT = 3
@@ -9,8 +9,27 @@ COLOR_CARD_COUNT = 2
 
 
 class GameEngineHelper:
+    # Cards are shared between decks, so the full deck only has to be put together once
+    _game_deck = None
+
+    @staticmethod
+    def create_game_deck(random: Random = None):
+        if GameEngineHelper._game_deck is None:
+            GameEngineHelper._game_deck = tuple(GameEngineHelper.__build_game_deck())
+        deck = list(GameEngineHelper._game_deck)
+        if random is not None:
+            random.shuffle(deck)
+        else:
+            shuffle(deck)
+        return deck
+
+    @staticmethod
+    def derive_seed(seed, *keys) -> int:
+        # Independent 64 bit seed for e.g. one match of a tournament, the same on every machine and process
+        return Random(':'.join(str(key) for key in (seed,) + keys)).getrandbits(64)
+
     @staticmethod
-    def create_game_deck():
+    def __build_game_deck():
         deck = []
         for color_type in ColorType:
             if color_type == ColorType.BLACK:
@@ -24,7 +43,6 @@ class GameEngineHelper:
                     else:
                         for n in range(COLOR_CARD_COUNT):
                             deck.append(Card(card_type, color_type))
-        shuffle(deck)
         return deck
 
     @staticmethod
@@ -0,0 +1,86 @@
+"""
+GameEvent represents something that happened during a match. The GameEngine
+only creates events when at least one event sink is subscribed, so a match
+without sinks never pays for them. Depending on the event type, not every
+property is given. This class is meant to be a read-only class.
+"""
+from core.game.Card import Card
+from core.game.EventType import EventType
+from core.game.RoundDrawReason import RoundDrawReason
+from typing import List
+
+
+class GameEvent:
+    __slots__ = ('_event_type', '_round_number', '_player_id', '_player_name', '_card', '_cards', '_hand_counts',
+                 '_draw_reason')
+
+    def __init__(self, event_type: EventType, round_number: int, player_id: int = None, player_name: str = None,
+                 card: Card = None, cards: List[Card] = None, hand_counts: List[int] = None,
+                 draw_reason: RoundDrawReason = None):
+        self._event_type = event_type
+        self._round_number = round_number
+        self._player_id = player_id
+        self._player_name = player_name
+        self._card = card
+        self._cards = cards
+        self._hand_counts = hand_counts
+        self._draw_reason = draw_reason
+
+    @property
+    def event_type(self) -> EventType:
+        return self._event_type
+
+    @property
+    def round_number(self) -> int:
+        return self._round_number
+
+    @property
+    def player_id(self) -> int:
+        return self._player_id
+
+    @property
+    def player_name(self) -> str:
+        return self._player_name
+
+    @property
+    def card(self) -> Card:
+        return self._card
+
+    @property
+    def cards(self) -> List[Card]:
+        return self._cards
+
+    @property
+    def hand_counts(self) -> List[int]:
+        return self._hand_counts
+
+    @property
+    def draw_reason(self) -> RoundDrawReason:
+        return self._draw_reason
+
+    def get_event_text(self) -> str:
+        if self._event_type == EventType.ROUND_STARTED:
+            return '- Round {0}'.format(self._round_number)
+        elif self._event_type == EventType.TURN_STARTED:
+            return '{} to play, hand sizes: {}'.format(self._player_name, self._hand_counts)
+        elif self._event_type == EventType.CARD_PLAYED:
+            return '{} played {}'.format(self._player_name, self._card.get_card_text())
+        elif self._event_type == EventType.CARDS_DRAWN:
+            return '{} drew {} card(s)'.format(self._player_name, len(self._cards))
+        elif self._event_type == EventType.ILLEGAL_PLAY:
+            card_text = self._card.get_card_text() if self._card is not None else 'no card'
+            return 'ILLEGAL play or this card is not in your hand, tsk tsk! {} tried to play {}' \
+                .format(self._player_name, card_text)
+        elif self._event_type == EventType.TURN_SKIPPED:
+            return '{} has to skip their turn'.format(self._player_name)
+        elif self._event_type == EventType.TURN_TIMED_OUT:
+            return '{} ran out of time and has to skip their turn'.format(self._player_name)
+        elif self._event_type == EventType.ROUND_WON:
+            return '{} won the round!'.format(self._player_name)
+        elif self._event_type == EventType.ROUND_DRAWN:
+            if self._draw_reason == RoundDrawReason.REPETITION:
+                return 'The round is a draw, the same position keeps coming back'
+            return 'The round is a draw, it went on for too many turns'
+        elif self._event_type == EventType.MATCH_WON:
+            return 'Match is over! Player with id {} won the match!!'.format(self._player_id)
+        return self._event_type.value
@@ -0,0 +1,321 @@
+"""
+GameState is a compact copy of everything needed to play a round forward:
+the order of the deck, the card pile, every hand, the ring of seats with
+the seat to play and the direction of play, and the effect of the card on
+top of the pile with the cards every stacked draw card adds up to. Cards are stored by kind (see Card):
+the deck and the card pile are lists of kinds with the top card last and
+every hand is a bytearray of 54 counts, so clone() is a handful of array
+copies and a lookahead bot can afford thousands of them per move.
+
+step(action) plays one turn by the same rules as the GameEngine and returns
+the new state, leaving the old one untouched. apply(action) does the same in
+place, which is what rollouts should use on their own clone.
+
+get_player_view(seat) leaves out what that seat cannot know: the other hands
+(only their sizes are kept) and the order of the deck. A view cannot be
+stepped, get_sampled_state(random) first fills in the hidden cards with one
+guess that agrees with everything the viewer has seen.
+"""
+from core.game.ActionType import ActionType
+from core.game.Card import Card, CARD_COLORS, CARD_KIND_COUNT, CARDS_BY_KIND, KIND_CARD_TYPES, KIND_DRAW_COUNTS, \
+    KIND_IS_WILD
+from core.game.CardAction import CardAction
+from core.game.CardType import CardType
+from core.game.ColorType import ColorType
+from core.game.GameEngineHelper import GameEngineHelper
+from core.game.LegalityTable import LegalityTable, SKIP_SERVED_FLAG, DRAW_PENDING_FLAG, MIXED_STACKING_FLAG
+from random import Random
+from typing import Iterable, List, Tuple
+
+KIND_IS_SKIP = tuple(card_type == CardType.SKIP for card_type in KIND_CARD_TYPES)
+KIND_IS_REVERSE = tuple(card_type == CardType.REVERSE for card_type in KIND_CARD_TYPES)
+KIND_IS_DRAW = tuple(card_type in (CardType.DRAW_TWO, CardType.WILD_DRAW_FOUR) for card_type in KIND_CARD_TYPES)
+
+
+def _count_kinds(cards: Iterable[Card]) -> bytearray:
+    counts = bytearray(CARD_KIND_COUNT)
+    for card in cards:
+        counts[card.kind] += 1
+    return counts
+
+
+def _get_mask(counts) -> int:
+    mask = 0
+    for kind in range(CARD_KIND_COUNT):
+        if counts[kind]:
+            mask |= 1 << kind
+    return mask
+
+
+FULL_DECK_COUNTS = bytes(_count_kinds(GameEngineHelper.create_game_deck(Random(0))))
+
+
+class GameState:
+    __slots__ = ('_draw_pile', '_card_pile', '_hands', '_hand_masks', '_hand_sizes', '_turn_order', '_turn_index',
+                 '_direction', '_color_index', '_flags', '_pending_draw_count', '_winner', '_viewer', '_deck_count')
+
+    def __init__(self, draw_pile: List[int], card_pile: List[int], hands: List[bytearray], hand_masks: List[int],
+                 hand_sizes: List[int], turn_order: Tuple[int, ...], turn_index: int, direction: int,
+                 color_index: int, flags: int, pending_draw_count: int = 0, winner: int = None, viewer: int = None,
+                 deck_count: int = None):
+        self._draw_pile = draw_pile
+        self._card_pile = card_pile
+        # Indexed by seat (player id), a view only knows the viewer's hand
+        self._hands = hands
+        self._hand_masks = hand_masks
+        self._hand_sizes = hand_sizes
+        # Ring of seats, turns go around it in direction (1 or -1) starting with the seat at turn_index
+        self._turn_order = turn_order
+        self._turn_index = turn_index
+        self._direction = direction
+        self._color_index = color_index
+        self._flags = flags
+        # Cards drawn by the first seat that does not stack onto the pending draw card
+        self._pending_draw_count = pending_draw_count
+        self._winner = winner
+        self._viewer = viewer
+        self._deck_count = deck_count if draw_pile is None else None
+
+    @staticmethod
+    def create(draw_pile: Iterable[Card], card_pile: Iterable[Card], hands: List[Iterable[Card]],
+               turn_order: Iterable[int], turn_index: int, current_color: ColorType, flags: int = 0,
+               direction: int = 1, pending_draw_count: int = 0) -> 'GameState':
+        # draw_pile and card_pile have their top card last, hands are indexed by seat
+        hand_counts = [_count_kinds(hand) for hand in hands]
+        return GameState([card.kind for card in draw_pile], [card.kind for card in card_pile], hand_counts,
+                         [_get_mask(counts) for counts in hand_counts], [sum(counts) for counts in hand_counts],
+                         tuple(turn_order), turn_index, direction, LegalityTable.get_color_index(current_color), flags,
+                         pending_draw_count)
+
+    def clone(self) -> 'GameState':
+        return GameState(None if self._draw_pile is None else self._draw_pile[:], self._card_pile[:],
+                         [None if counts is None else counts[:] for counts in self._hands], self._hand_masks[:],
+                         self._hand_sizes[:], self._turn_order, self._turn_index, self._direction, self._color_index,
+                         self._flags, self._pending_draw_count, self._winner, self._viewer, self._deck_count)
+
+    @property
+    def active_seat(self) -> int:
+        return self._turn_order[self._turn_index]
+
+    @property
+    def turn_order(self) -> Tuple[int, ...]:
+        return self._turn_order
+
+    @property
+    def turn_index(self) -> int:
+        return self._turn_index
+
+    @property
+    def direction(self) -> int:
+        return self._direction
+
+    @property
+    def player_count(self) -> int:
+        return len(self._turn_order)
+
+    @property
+    def top_card(self) -> Card:
+        return CARDS_BY_KIND[self._card_pile[-1]]
+
+    @property
+    def current_color(self) -> ColorType:
+        return CARD_COLORS[self._color_index]
+
+    @property
+    def flags(self) -> int:
+        return self._flags
+
+    @property
+    def pending_draw_count(self) -> int:
+        return self._pending_draw_count
+
+    @property
+    def winner(self) -> int:
+        return self._winner
+
+    @property
+    def is_over(self) -> bool:
+        return self._winner is not None
+
+    @property
+    def viewer(self) -> int:
+        # The seat this is a view for, None when nothing is hidden
+        return self._viewer
+
+    @property
+    def is_hidden(self) -> bool:
+        return self._draw_pile is None
+
+    @property
+    def deck_count(self) -> int:
+        return len(self._draw_pile) if self._draw_pile is not None else self._deck_count
+
+    @property
+    def hand_sizes(self) -> List[int]:
+        return self._hand_sizes[:]
+
+    @property
+    def card_pile_kinds(self) -> List[int]:
+        return self._card_pile[:]
+
+    @property
+    def draw_pile_kinds(self) -> List[int]:
+        return None if self._draw_pile is None else self._draw_pile[:]
+
+    def get_hand_counts(self, seat: int) -> bytes:
+        counts = self._hands[seat]
+        return None if counts is None else bytes(counts)
+
+    def get_hand(self, seat: int) -> List[Card]:
+        counts = self._hands[seat]
+        if counts is None:
+            raise ValueError('The hand of seat {} is hidden from this view'.format(seat))
+        return [CARDS_BY_KIND[kind] for kind in range(CARD_KIND_COUNT) for n in range(counts[kind])]
+
+    def get_unseen_counts(self) -> bytearray:
+        # Cards the viewer has not seen: the deck plus every other hand
+        unseen_counts = bytearray(FULL_DECK_COUNTS)
+        for kind in self._card_pile:
+            unseen_counts[kind] -= 1
+        own_counts = self._hands[self._viewer] if self._viewer is not None else None
+        if own_counts is not None:
+            for kind in range(CARD_KIND_COUNT):
+                unseen_counts[kind] -= own_counts[kind]
+        return unseen_counts
+
+    def get_legal_mask(self) -> int:
+        # Legal kinds held by the seat that plays next
+        legal_mask = LegalityTable.get_legal_mask_by_kind(self._card_pile[-1], self._color_index, self._flags)
+        return legal_mask & self._hand_masks[self.active_seat]
+
+    def get_legal_actions(self) -> List[CardAction]:
+        # Every legal play of the seat that plays next, one per color for a wild, and SKIP last
+        actions = []
+        legal_mask = self.get_legal_mask()
+        while legal_mask:
+            lowest_bit = legal_mask & -legal_mask
+            kind = lowest_bit.bit_length() - 1
+            if KIND_IS_WILD[kind]:
+                for color_type in CARD_COLORS:
+                    actions.append(CardAction(ActionType.PLAY, CARDS_BY_KIND[kind], color_type))
+            else:
+                actions.append(CardAction(ActionType.PLAY, CARDS_BY_KIND[kind]))
+            legal_mask ^= lowest_bit
+        actions.append(CardAction(ActionType.SKIP))
+        return actions
+
+    def get_player_view(self, seat: int) -> 'GameState':
+        hands = [counts[:] if index == seat else None for index, counts in enumerate(self._hands)]
+        hand_masks = [mask if index == seat else 0 for index, mask in enumerate(self._hand_masks)]
+        return GameState(None, self._card_pile[:], hands, hand_masks, self._hand_sizes[:], self._turn_order,
+                         self._turn_index, self._direction, self._color_index, self._flags, self._pending_draw_count,
+                         self._winner, seat, self.deck_count)
+
+    def get_sampled_state(self, random: Random) -> 'GameState':
+        # One full state the view could be in: the unseen cards dealt at random to the other hands and the deck
+        if self._draw_pile is not None:
+            return self.clone()
+        unseen_counts = self.get_unseen_counts()
+        unseen_kinds = [kind for kind in range(CARD_KIND_COUNT) for n in range(unseen_counts[kind])]
+        random.shuffle(unseen_kinds)
+        hands = []
+        hand_masks = []
+        for seat, counts in enumerate(self._hands):
+            if counts is None:
+                counts = bytearray(CARD_KIND_COUNT)
+                for n in range(self._hand_sizes[seat]):
+                    counts[unseen_kinds.pop()] += 1
+                hand_masks.append(_get_mask(counts))
+            else:
+                counts = counts[:]
+                hand_masks.append(self._hand_masks[seat])
+            hands.append(counts)
+        return GameState(unseen_kinds, self._card_pile[:], hands, hand_masks, self._hand_sizes[:], self._turn_order,
+                         self._turn_index, self._direction, self._color_index, self._flags, self._pending_draw_count,
+                         self._winner)
+
+    def step(self, action: CardAction, random: Random = None) -> 'GameState':
+        next_state = self.clone()
+        next_state.apply(action, random)
+        return next_state
+
+    def apply(self, action: CardAction, random: Random = None):
+        # random is only used to reshuffle the card pile into the deck and to color a wild played without one
+        if self._winner is not None:
+            raise ValueError('The round is already over')
+        if self._draw_pile is None:
+            raise ValueError('A player view hides the deck and the other hands, fill them in before stepping')
+        if random is None:
+            random = Random()
+        seat = self._turn_order[self._turn_index]
+        player_count = len(self._turn_order)
+        # The next seat plays after this turn, a skip moves one seat further
+        turn_steps = 1
+        top_kind = self._card_pile[-1]
+        flags = self._flags
+        # The stacking rule is kept for the whole round
+        rule_flags = flags & MIXED_STACKING_FLAG
+        card = action.card
+        is_legal = False
+        if action.action == ActionType.PLAY and isinstance(card, Card):
+            legal_mask = LegalityTable.get_legal_mask_by_kind(top_kind, self._color_index, flags)
+            is_legal = legal_mask >> card.kind & 1 == 1 and self._hands[seat][card.kind] > 0
+
+        if is_legal:
+            kind = card.kind
+            self._card_pile.append(kind)
+            if KIND_IS_WILD[kind]:
+                if action.color in CARD_COLORS:
+                    self._color_index = LegalityTable.get_color_index(action.color)
+                else:
+                    self._color_index = LegalityTable.get_color_index(random.choice(CARD_COLORS))
+            else:
+                self._color_index = LegalityTable.get_color_index(card.color_type)
+            self._flags = rule_flags | DRAW_PENDING_FLAG if KIND_IS_DRAW[kind] else rule_flags
+            self._pending_draw_count += KIND_DRAW_COUNTS[kind]
+            if KIND_IS_REVERSE[kind] and player_count > 2:
+                self._direction = -self._direction
+            elif KIND_IS_SKIP[kind] or KIND_IS_REVERSE[kind]:
+                # Between 2 players a reverse acts like a skip
+                turn_steps = 2
+                self._flags = rule_flags | SKIP_SERVED_FLAG
+            counts = self._hands[seat]
+            counts[kind] -= 1
+            if counts[kind] == 0:
+                self._hand_masks[seat] &= ~(1 << kind)
+            self._hand_sizes[seat] -= 1
+            if self._hand_sizes[seat] == 0:
+                self._winner = seat
+                return
+        elif flags & DRAW_PENDING_FLAG:
+            # Every stacked card is drawn at once and the turn is lost
+            self.__draw(seat, self._pending_draw_count, random)
+            self._pending_draw_count = 0
+            self._flags = flags & ~DRAW_PENDING_FLAG
+        else:
+            self.__draw(seat, 1, random)
+            if action.action != ActionType.PLAY:
+                self._flags = flags | SKIP_SERVED_FLAG
+        self._turn_index = (self._turn_index + turn_steps * self._direction) % player_count
+
+    def __draw(self, seat: int, draw_count: int, random: Random):
+        draw_pile = self._draw_pile
+        if not draw_pile or draw_count > len(draw_pile):
+            # Same as the engine: shuffle everything but the top card under what is left of the deck
+            reshuffled_kinds = self._card_pile[:-1]
+            random.shuffle(reshuffled_kinds)
+            draw_pile[0:0] = reshuffled_kinds[::-1]
+            self._card_pile = self._card_pile[-1:]
+            draw_count = min(draw_count, len(draw_pile))
+        counts = self._hands[seat]
+        hand_mask = self._hand_masks[seat]
+        for n in range(draw_count):
+            kind = draw_pile.pop()
+            counts[kind] += 1
+            hand_mask |= 1 << kind
+        self._hand_masks[seat] = hand_mask
+        self._hand_sizes[seat] += draw_count
+
+
+def step(state: GameState, action: CardAction, random: Random = None) -> GameState:
+    return state.step(action, random)
@@ -0,0 +1,23 @@
+from core.game.CardAction import CardAction
+from core.game.IPlayer import IPlayer
+
+
+class IAsyncPlayer(IPlayer):
+    """
+    IAsyncPlayer is an IPlayer whose take_turn is a coroutine, for AIs that
+    wait on something while deciding, e.g. a model server or a subprocess.
+    The AsyncGameEngine awaits it, so other matches on the same event loop
+    keep playing in the meantime. Everything else works as with IPlayer.
+
+    When extending from IAsyncPlayer, implement the follow methods:
+      get_player_name()
+      async take_turn()
+    """
+
+    """
+    The extending class is expected to implement take_turn as an async def.
+    It is awaited by the AsyncGameEngine and cancelled when the turn runs
+    out of time.
+    """
+    async def take_turn(self) -> CardAction:
+        pass
@@ -0,0 +1,24 @@
+class IEventSink:
+    """
+    IEventSink is the base abstract for anything that wants to follow a match
+    as it is played. The GameEngine calls handle_event once per GameEvent
+    for every sink it was given.
+
+    When extending from IEventSink, implement the follow methods:
+      handle_event()
+      close()
+    """
+
+    """
+    handle_event is called by the game engine every time something happens
+    during the match. It should return quickly, as it runs inside the turn loop.
+    """
+    def handle_event(self, event):
+        pass
+
+    """
+    close is called by whoever created the sink once they are done with it.
+    Sinks that buffer output should flush it here.
+    """
+    def close(self):
+        pass
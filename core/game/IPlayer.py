@@ -1,5 +1,6 @@
 from core.game.CardAction import CardAction
 from core.game.PlayerGameHelper import PlayerGameHelper
+from random import Random
 
 
 class IPlayer:
@@ -15,6 +16,7 @@ class IPlayer:
     """
     def __init__(self):
         self._game_helper: PlayerGameHelper = None
+        self._random: Random = Random()
 
     """
     The extending class is expected to implement def get_player_name.
@@ -48,3 +50,19 @@ class IPlayer:
     """
     def get_game_helper(self) -> PlayerGameHelper:
         return self._game_helper
+
+    """
+    set_random is already implemented and should not be modified.
+    The game engine gives every player their own random number generator,
+    derived from the engine's seed, before the match starts.
+    """
+    def set_random(self, random: Random):
+        self._random = random
+
+    """
+    get_random is already implemented and should not be modified.
+    Use it instead of the random module for every random decision, so that
+    a match played with the same seed always plays out the same way.
+    """
+    def get_random(self) -> Random:
+        return self._random
@@ -0,0 +1,73 @@
+"""
+LatencyHistogram counts durations in logarithmic buckets, so it can take
+millions of samples in a fixed amount of memory and still give percentiles
+within a few percent. Histograms from different matches or processes can be
+merged.
+"""
+from math import log2
+from typing import List
+
+# Anything faster than this ends up in the first bucket
+MIN_LATENCY: float = 1e-7
+# 16 buckets for every doubling is a resolution of about 4.4%
+BUCKETS_PER_DOUBLING: int = 16
+
+
+class LatencyHistogram:
+    __slots__ = ('_counts', '_count', '_total', '_max')
+
+    def __init__(self):
+        self._counts: List[int] = []
+        self._count: int = 0
+        self._total: float = 0.0
+        self._max: float = 0.0
+
+    def record(self, seconds: float):
+        if seconds <= MIN_LATENCY:
+            index = 0
+        else:
+            index = int(log2(seconds / MIN_LATENCY) * BUCKETS_PER_DOUBLING) + 1
+        if index >= len(self._counts):
+            self._counts.extend([0] * (index + 1 - len(self._counts)))
+        self._counts[index] += 1
+        self._count += 1
+        self._total += seconds
+        if seconds > self._max:
+            self._max = seconds
+
+    def merge(self, other: 'LatencyHistogram'):
+        if len(other._counts) > len(self._counts):
+            self._counts.extend([0] * (len(other._counts) - len(self._counts)))
+        for index, count in enumerate(other._counts):
+            self._counts[index] += count
+        self._count += other._count
+        self._total += other._total
+        self._max = max(self._max, other._max)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def total(self) -> float:
+        return self._total
+
+    @property
+    def max(self) -> float:
+        return self._max
+
+    @property
+    def mean(self) -> float:
+        return self._total / self._count if self._count else 0.0
+
+    def get_percentile(self, percentile: float) -> float:
+        # Upper bound of the bucket holding the percentile, never more than the slowest sample
+        if not self._count:
+            return 0.0
+        rank = percentile / 100.0 * self._count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank and count:
+                return min(MIN_LATENCY * 2 ** (index / BUCKETS_PER_DOUBLING), self._max)
+        return self._max
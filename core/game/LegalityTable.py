@@ -0,0 +1,96 @@
+"""
+LegalityTable holds the rules for which cards can be played on top of the
+card pile. The rules are worked out once, when the module is imported, into
+a bitmask over the 54 card kinds (bit n is set when a card of kind n can be
+played) for every top card kind, current color and combination of the state
+flags below. Both the GameEngine and PlayerGameHelper answer "what can be
+played?" from this table, so the engine and the players always agree.
+"""
+from core.game.Card import Card, CARD_COLORS, CARD_KIND_COUNT, KIND_CARD_TYPES, KIND_COLOR_TYPES, KIND_IS_WILD
+from core.game.CardHand import CardHand
+from core.game.CardType import CardType
+from core.game.ColorType import ColorType
+from typing import Iterable, List
+
+# The SKIP on top of the pile has already made a player lose their turn
+SKIP_SERVED_FLAG: int = 1
+# The DRAW_TWO or WILD_DRAW_FOUR on top of the pile has not been answered yet
+DRAW_PENDING_FLAG: int = 2
+# The game stacks draw cards by DrawStackingRule.MIXED rather than SAME_TYPE
+MIXED_STACKING_FLAG: int = 4
+FLAG_COMBINATIONS: int = 8
+
+_COLOR_INDEXES = {color_type: index for index, color_type in enumerate(CARD_COLORS)}
+
+
+def _is_legal(top_kind: int, current_color: ColorType, flags: int, kind: int) -> bool:
+    top_card_type = KIND_CARD_TYPES[top_kind]
+    card_type = KIND_CARD_TYPES[kind]
+    if flags & DRAW_PENDING_FLAG and flags & MIXED_STACKING_FLAG:
+        # Any draw card can be stacked on any other, a DRAW_TWO still has to match the current color
+        return card_type == CardType.WILD_DRAW_FOUR or \
+            (card_type == CardType.DRAW_TWO and KIND_COLOR_TYPES[kind] == current_color)
+    if flags & DRAW_PENDING_FLAG:
+        if top_card_type == CardType.WILD_DRAW_FOUR:
+            # If a wild card +4 was played, you can only stack another one
+            return card_type == CardType.WILD_DRAW_FOUR
+        if top_card_type == CardType.DRAW_TWO:
+            # Draws can be stacked
+            return card_type == CardType.DRAW_TWO and KIND_COLOR_TYPES[kind] == current_color
+    if top_card_type == CardType.SKIP and not flags & SKIP_SERVED_FLAG:
+        # The player is being skipped, nothing can be played
+        return False
+    if KIND_IS_WILD[kind]:
+        return True
+    # It has to match either the current color or the type
+    return KIND_COLOR_TYPES[kind] == current_color or card_type == top_card_type
+
+
+def _build_legal_masks() -> List[int]:
+    legal_masks = []
+    for top_kind in range(CARD_KIND_COUNT):
+        for current_color in CARD_COLORS:
+            for flags in range(FLAG_COMBINATIONS):
+                legal_mask = 0
+                for kind in range(CARD_KIND_COUNT):
+                    if _is_legal(top_kind, current_color, flags, kind):
+                        legal_mask |= 1 << kind
+                legal_masks.append(legal_mask)
+    return legal_masks
+
+
+_LEGAL_MASKS = _build_legal_masks()
+
+
+class LegalityTable:
+    @staticmethod
+    def get_legal_mask(top_card: Card, current_color: ColorType, flags: int = 0) -> int:
+        index = (top_card.kind * len(CARD_COLORS) + _COLOR_INDEXES[current_color]) * FLAG_COMBINATIONS + flags
+        return _LEGAL_MASKS[index]
+
+    @staticmethod
+    def get_legal_mask_by_kind(top_kind: int, color_index: int, flags: int = 0) -> int:
+        # Same as get_legal_mask, with the color as its index in CARD_COLORS
+        return _LEGAL_MASKS[(top_kind * len(CARD_COLORS) + color_index) * FLAG_COMBINATIONS + flags]
+
+    @staticmethod
+    def get_color_index(color_type: ColorType) -> int:
+        return _COLOR_INDEXES[color_type]
+
+    @staticmethod
+    def get_hand_mask(hand: Iterable[Card]) -> int:
+        if isinstance(hand, CardHand):
+            return hand.mask
+        hand_mask = 0
+        for card in hand:
+            hand_mask |= 1 << card.kind
+        return hand_mask
+
+    @staticmethod
+    def get_legal_cards(hand: Iterable[Card], top_card: Card, current_color: ColorType, flags: int = 0) -> List[Card]:
+        valid_mask = LegalityTable.get_legal_mask(top_card, current_color, flags) & LegalityTable.get_hand_mask(hand)
+        if not valid_mask:
+            return []
+        if isinstance(hand, CardHand):
+            return hand.get_cards_in_mask(valid_mask)
+        return [card for card in hand if valid_mask >> card.kind & 1]
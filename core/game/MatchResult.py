@@ -0,0 +1,48 @@
+"""
+MatchResult is a small summary of a finished match: who won it, who won each
+round and how many turns every round took. A round that ended as a draw on
+the engine's RoundLimits has None as its winner, and so does a match whose
+rounds were all drawn. When the match had a TimeBudget, it also has the
+time every player used and how many of their turns ran out of time, indexed
+by player id. It is cheap to send between processes. This class is meant to
+be a read-only class.
+"""
+from typing import List
+
+
+class MatchResult:
+    def __init__(self, winner_id: int, round_winner_ids: List[int], round_turn_counts: List[int],
+                 player_time_used: List[float] = None, player_timeout_counts: List[int] = None):
+        self._winner_id = winner_id
+        self._round_winner_ids = round_winner_ids
+        self._round_turn_counts = round_turn_counts
+        self._player_time_used = player_time_used
+        self._player_timeout_counts = player_timeout_counts
+
+    @property
+    def winner_id(self) -> int:
+        return self._winner_id
+
+    @property
+    def round_winner_ids(self) -> List[int]:
+        return self._round_winner_ids
+
+    @property
+    def round_turn_counts(self) -> List[int]:
+        return self._round_turn_counts
+
+    @property
+    def player_time_used(self) -> List[float]:
+        return self._player_time_used
+
+    @property
+    def player_timeout_counts(self) -> List[int]:
+        return self._player_timeout_counts
+
+    @property
+    def drawn_round_count(self) -> int:
+        return sum(1 for round_winner_id in self._round_winner_ids if round_winner_id is None)
+
+    @property
+    def turn_count(self) -> int:
+        return sum(self._round_turn_counts)
@@ -0,0 +1,10 @@
+"""
+NullEventSink ignores every event. The GameEngine does not subscribe it at
+all, so passing one is the same as running the match headless.
+"""
+from core.game.IEventSink import IEventSink
+
+
+class NullEventSink(IEventSink):
+    def handle_event(self, event):
+        pass
@@ -1,30 +1,128 @@
 from core.game.Card import Card
+from core.game.CardListView import CardListView
+from core.game.ColorType import ColorType
+from core.game.GameState import GameState
+from core.game.LegalityTable import LegalityTable
 from core.game.PlayerHandCount import PlayerHandCount
+from typing import Sequence, Tuple
 
 
 class PlayerGameHelper:
-    def __init__(self, hand, last_card_played, card_pile, deck_count, opp_hand_count):
-        self._hand = hand
+    """
+    PlayerGameHelper is a player's read only view of the game. The engine
+    creates one per player at the start of a round and updates it before
+    each of their turns, so a bot can keep the reference it was given.
+    The hand and the card pile are CardListViews onto the engine's cards.
+    """
+    def __init__(self, hand, last_card_played, card_pile, deck_count, player_hand_counts, current_color=None,
+                 legality_flags=0, time_remaining=None, game_state_provider=None, seat=None, pending_draw_count=0):
+        self._hand_cards = hand
+        self._hand = CardListView(hand)
         self._last_card_played = last_card_played
-        self._card_pile = card_pile
+        self._card_pile = CardListView(card_pile)
         self._deck_count = deck_count
-        self._opp_hand_count = opp_hand_count
+        # PlayerHandCount of every player in turn order, and this player's seat
+        self._player_hand_counts: Tuple[PlayerHandCount, ...] = player_hand_counts
+        self._seat = seat
+        # The other players starting with the next one, only worked out again after the turn order changed
+        self._opponents_hand_count: Tuple[PlayerHandCount, ...] = None
+        # The color declared for a wild card, otherwise the color of the last card played
+        self._current_color = current_color if current_color is not None else last_card_played.color_type
+        # Skip served / draw pending state of the engine, see LegalityTable
+        self._legality_flags = legality_flags
+        # Cards drawn if this player does not stack onto the draw card on top of the pile
+        self._pending_draw_count = pending_draw_count
+        self._time_remaining = time_remaining
+        # Builds this player's GameState view, only called when the player asks for it
+        self._game_state_provider = game_state_provider
+        # Legal cards of the hand, only worked out again after the top card or the hand changed
+        self._valid_hand = None
 
-    def get_hand(self):
+    """
+    update_turn is only called by the game engine, before the player's turn.
+    """
+    def update_turn(self, last_card_played, deck_count, player_hand_counts, current_color, legality_flags,
+                    time_remaining=None, pending_draw_count=0):
+        if last_card_played is not self._last_card_played or current_color != self._current_color \
+                or legality_flags != self._legality_flags:
+            self._valid_hand = None
+        self._last_card_played = last_card_played
+        self._deck_count = deck_count
+        if player_hand_counts is not self._player_hand_counts:
+            self._player_hand_counts = player_hand_counts
+            self._opponents_hand_count = None
+        self._current_color = current_color
+        self._legality_flags = legality_flags
+        self._pending_draw_count = pending_draw_count
+        self._time_remaining = time_remaining
+
+    """
+    set_hand_changed is only called by the game engine, whenever a card is
+    added to or removed from the player's hand.
+    """
+    def set_hand_changed(self):
+        self._valid_hand = None
+
+    def get_hand(self) -> Sequence[Card]:
         return self._hand
 
     def get_last_card_played(self) -> Card:
         return self._last_card_played
 
-    def get_card_pile(self):
+    def get_card_pile(self) -> Sequence[Card]:
         return self._card_pile
 
     def get_deck_count(self) -> int:
         return self._deck_count
 
-    def get_valid_hand(self):
-        return [c for c in self._hand if
-                c.color_type == self._last_card_played.color_type or c.card_type == self._last_card_played.card_type]
+    def get_current_color(self) -> ColorType:
+        return self._current_color
+
+    """
+    get_pending_draw_count is the number of cards this player draws if they
+    do not answer the draw card on top of the pile with another one, 0 when
+    there is nothing to answer.
+    """
+    def get_pending_draw_count(self) -> int:
+        return self._pending_draw_count
+
+    """
+    get_time_remaining is the number of seconds this turn can still take
+    before it is forced into a SKIP, or None when the game has no time limit.
+    Bots that search can use it to decide how much effort to spend.
+    """
+    def get_time_remaining(self) -> float:
+        return self._time_remaining
+
+    """
+    get_game_state is a snapshot of the round as this player sees it: their
+    own hand, the card pile and the size of every other hand, but not the
+    other hands themselves or the order of the deck. Lookahead bots fill in
+    the hidden cards and step the snapshot without touching the real game.
+    """
+    def get_game_state(self) -> GameState:
+        if self._game_state_provider is None:
+            return None
+        return self._game_state_provider()
+
+    def get_valid_hand(self) -> Sequence[Card]:
+        if self._valid_hand is None:
+            self._valid_hand = tuple(LegalityTable.get_legal_cards(self._hand_cards, self._last_card_played,
+                                                                   self._current_color, self._legality_flags))
+        return self._valid_hand
 
-    def getOpponentsHandCount(self):
-        return self._opp_hand_count
\ No newline at end of file
+    """
+    getOpponentsHandCount is a PlayerHandCount (player_name, seat,
+    hand_count) for every other player, in the order they play after this
+    player. The counts are always current, so the result can be kept.
+    """
+    def getOpponentsHandCount(self) -> Tuple[PlayerHandCount, ...]:
+        if self._opponents_hand_count is None:
+            player_hand_counts = self._player_hand_counts
+            seats = [player_hand_count.seat for player_hand_count in player_hand_counts]
+            if self._seat in seats:
+                index = seats.index(self._seat)
+                self._opponents_hand_count = player_hand_counts[index + 1:] + player_hand_counts[:index]
+            else:
+                self._opponents_hand_count = tuple(player_hand_counts)
+        return self._opponents_hand_count
@@ -1,12 +1,31 @@
+"""
+PlayerHandCount is a read only view of how many cards one player holds.
+The count is read from the counters the game engine keeps up to date on
+every draw and play, so it is always current and costs nothing to keep.
+"""
+from typing import List
+
+
 class PlayerHandCount:
-    def __init__(self, player_name: str, hand_count: int):
-        self.player_name = player_name
-        self.hand_count = hand_count
+    __slots__ = ('_player_name', '_seat', '_hand_counts')
+
+    def __init__(self, player_name: str, seat: int, hand_counts: List[int]):
+        self._player_name = player_name
+        self._seat = seat
+        # The engine's hand counts, indexed by seat
+        self._hand_counts = hand_counts
 
     @property
     def player_name(self) -> str:
-        return self.__player_name
+        return self._player_name
+
+    @property
+    def seat(self) -> int:
+        return self._seat
 
     @property
     def hand_count(self) -> int:
-        return self.___hand_count
+        return self._hand_counts[self._seat]
+
+    def __repr__(self) -> str:
+        return 'PlayerHandCount({!r}, {}, {})'.format(self._player_name, self._seat, self.hand_count)
@@ -0,0 +1,68 @@
+"""
+PositionHash keeps a 64 bit hash of where every card of a round is, updated
+as cards move, so the GameEngine can tell when a position comes up again
+without comparing hands.
+
+Every card kind has a random 64 bit key for each player's hand and one for
+the pile. The hash of the cards is the sum of the keys of every card, so a
+card drawn or played only adds or subtracts one or two keys, and two copies
+of a card never cancel out like they would with XOR. The deck is not hashed,
+it holds whatever is in neither. get_position_key() adds in what else decides
+the position: the top card, the color, the legality flags, the pending draw
+and who is to play in which direction.
+"""
+from core.game.Card import Card, CARD_COLORS, CARD_KIND_COUNT
+from core.game.LegalityTable import FLAG_COMBINATIONS
+from random import Random
+from typing import Iterable, List
+
+HASH_MASK: int = (1 << 64) - 1
+# Fixed, so the same position always has the same hash
+POSITION_KEY_SEED: int = 0x0E1EF7
+
+
+def _create_keys(random: Random, size: int) -> List[int]:
+    return [random.getrandbits(64) for n in range(size)]
+
+
+class PositionHash:
+    def __init__(self, player_count: int):
+        random = Random(POSITION_KEY_SEED)
+        self._hand_keys = [_create_keys(random, CARD_KIND_COUNT) for player_id in range(player_count)]
+        self._pile_keys = _create_keys(random, CARD_KIND_COUNT)
+        self._top_kind_keys = _create_keys(random, CARD_KIND_COUNT)
+        self._color_keys = _create_keys(random, len(CARD_COLORS))
+        self._flags_keys = _create_keys(random, FLAG_COMBINATIONS)
+        self._turn_index_keys = _create_keys(random, player_count)
+        self._reversed_key = random.getrandbits(64)
+        # Odd, so every pending draw count gets its own key
+        self._pending_draw_key = random.getrandbits(64) | 1
+        self._cards_hash = 0
+
+    def reset(self):
+        self._cards_hash = 0
+
+    def add_cards(self, player_id: int, cards: Iterable[Card]):
+        hand_keys = self._hand_keys[player_id]
+        self._cards_hash = (self._cards_hash + sum(hand_keys[card.kind] for card in cards)) & HASH_MASK
+
+    def play_card(self, player_id: int, card: Card):
+        # From the player's hand onto the pile
+        self._cards_hash = (self._cards_hash - self._hand_keys[player_id][card.kind] +
+                            self._pile_keys[card.kind]) & HASH_MASK
+
+    def add_to_pile(self, card: Card):
+        self._cards_hash = (self._cards_hash + self._pile_keys[card.kind]) & HASH_MASK
+
+    def remove_from_pile(self, cards: Iterable[Card]):
+        # Shuffled back into the deck
+        self._cards_hash = (self._cards_hash - sum(self._pile_keys[card.kind] for card in cards)) & HASH_MASK
+
+    def get_position_key(self, top_card: Card, color_index: int, flags: int, pending_draw_count: int,
+                         turn_index: int, direction: int) -> int:
+        key = self._cards_hash ^ self._top_kind_keys[top_card.kind] ^ self._color_keys[color_index] ^ \
+            self._flags_keys[flags] ^ self._turn_index_keys[turn_index] ^ \
+            (pending_draw_count * self._pending_draw_key & HASH_MASK)
+        if direction < 0:
+            key ^= self._reversed_key
+        return key
@@ -0,0 +1,17 @@
+"""
+RoundDrawReason is an enum of the RoundLimits that can end a round as a draw.
+"""
+from enum import Enum
+
+
+class RoundDrawReason(Enum):
+    """
+    TURN_LIMIT is a round that reached RoundLimits.max_turns turns.
+    """
+    TURN_LIMIT = 'turn_limit'
+
+    """
+    REPETITION is a round where the same position came up
+    RoundLimits.repetition_limit times.
+    """
+    REPETITION = 'repetition'
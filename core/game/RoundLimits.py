@@ -0,0 +1,32 @@
+"""
+RoundLimits stops a round that would go on for far too long, e.g. between
+bots that always SKIP once the deck and the pile have run out. A round ends
+as a draw when it reaches max_turns turns, or when the same position comes
+up for the repetition_limit-th time. A position is every player's cards,
+the cards in the pile and the deck, the top card, the color, what is left
+to answer on the pile and who is to play; see PositionHash. None is no
+limit. This class is meant to be a read-only class.
+"""
+
+# Used by the tournament, far beyond any round that is still going somewhere
+DEFAULT_MAX_TURNS: int = 2000
+DEFAULT_REPETITION_LIMIT: int = 3
+
+
+class RoundLimits:
+    def __init__(self, max_turns: int = None, repetition_limit: int = None):
+        if max_turns is not None and max_turns < 1:
+            raise ValueError('A round needs at least one turn, not {}'.format(max_turns))
+        if repetition_limit is not None and repetition_limit < 2:
+            raise ValueError('A position can only repeat from the second time it comes up, not {}'
+                             .format(repetition_limit))
+        self._max_turns = max_turns
+        self._repetition_limit = repetition_limit
+
+    @property
+    def max_turns(self) -> int:
+        return self._max_turns
+
+    @property
+    def repetition_limit(self) -> int:
+        return self._repetition_limit
@@ -0,0 +1,42 @@
+"""
+SyncPlayerAdapter lets the AsyncGameEngine await a player whose take_turn
+is a plain function. By default take_turn is simply called: bots that only
+compute are quick and cheaper to run on the event loop itself. With
+use_thread, it runs in the loop's default thread pool instead, so a bot that
+blocks on I/O does not hold up the other matches. A thread can't be
+cancelled, a timed out take_turn still runs to the end; its answer is
+thrown away. The player is not asked again before that thread is done, so
+two of its take_turns never share its game helper, and the wait counts
+against its next turn.
+"""
+from core.game.CardAction import CardAction
+from core.game.IPlayer import IPlayer
+import asyncio
+
+
+class SyncPlayerAdapter:
+    def __init__(self, player: IPlayer, use_thread: bool = False):
+        self._player = player
+        self._use_thread = use_thread
+        # The thread of the last take_turn, still running when that turn was cancelled
+        self._turn_future: asyncio.Future = None
+
+    @property
+    def player(self) -> IPlayer:
+        return self._player
+
+    async def take_turn(self) -> CardAction:
+        if not self._use_thread:
+            return self._player.take_turn()
+        if self._turn_future is not None and not self._turn_future.done():
+            await asyncio.wait((self._turn_future,))
+        self._turn_future = asyncio.get_running_loop().run_in_executor(None, self._player.take_turn)
+        self._turn_future.add_done_callback(self.__discard_late_answer)
+        # Shielded, a cancelled turn leaves the future running so the next turn can wait for it
+        return await asyncio.shield(self._turn_future)
+
+    @staticmethod
+    def __discard_late_answer(turn_future: asyncio.Future):
+        # Looks at the exception of a turn nobody awaits anymore, so asyncio does not report it as lost
+        if not turn_future.cancelled():
+            turn_future.exception()
@@ -0,0 +1,71 @@
+"""
+TimeBudget limits how long players can think: per turn, per match or both.
+A player that goes over has their turn replaced by a SKIP, which means
+drawing a card like any other skip.
+
+Deadlines are checked after take_turn returns, which only costs reading the
+clock. With hard_deadline, a SIGALRM timer also interrupts a take_turn that
+is still running when the deadline passes, so a looping bot cannot stall the
+match. That needs the engine to run on the main thread of a POSIX process,
+e.g. inside a tournament worker; anywhere else the soft check is used.
+
+The interrupt is raised in the bot's own Python code, so it is not a kill: a
+bot stuck in C code that never returns to the interpreter (or one that
+catches BaseException) still holds the match up. A bot that has to be
+killed for sure can be hosted in another process by a PlayerHost, which
+kills a worker that stops answering.
+"""
+from core.game.TurnTimeoutError import TurnTimeoutError
+import signal
+import threading
+
+
+def _raise_turn_timeout(signum, frame):
+    raise TurnTimeoutError('The turn ran out of time')
+
+
+class TimeBudget:
+    def __init__(self, turn_seconds: float = None, match_seconds: float = None, hard_deadline: bool = False):
+        self._turn_seconds = turn_seconds
+        self._match_seconds = match_seconds
+        self._hard_deadline = hard_deadline
+
+    @property
+    def turn_seconds(self) -> float:
+        return self._turn_seconds
+
+    @property
+    def match_seconds(self) -> float:
+        return self._match_seconds
+
+    @property
+    def hard_deadline(self) -> bool:
+        return self._hard_deadline
+
+    def get_time_remaining(self, match_time_used: float) -> float:
+        # Time the player has for this turn, None when there is no limit at all
+        if self._match_seconds is None:
+            return self._turn_seconds
+        match_time_remaining = max(0.0, self._match_seconds - match_time_used)
+        if self._turn_seconds is None:
+            return match_time_remaining
+        return min(self._turn_seconds, match_time_remaining)
+
+    def can_interrupt(self) -> bool:
+        return self._hard_deadline and hasattr(signal, 'setitimer') \
+            and threading.current_thread() is threading.main_thread()
+
+    def call_with_deadline(self, take_turn, seconds: float):
+        # Returns what take_turn returned, or None when it had to be interrupted
+        previous_handler = signal.signal(signal.SIGALRM, _raise_turn_timeout)
+        try:
+            signal.setitimer(signal.ITIMER_REAL, max(seconds, 1e-6))
+            try:
+                return take_turn()
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except TurnTimeoutError:
+            # Also catches the timer going off right as take_turn returned
+            return None
+        finally:
+            signal.signal(signal.SIGALRM, previous_handler)
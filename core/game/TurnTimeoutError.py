@@ -0,0 +1,8 @@
+class TurnTimeoutError(BaseException):
+    """
+    TurnTimeoutError is raised inside a player's take_turn when a hard
+    deadline of the TimeBudget runs out. The engine catches it and forces
+    the player to skip their turn. Like KeyboardInterrupt it is not an
+    Exception, so a bot catching every Exception does not swallow it.
+    """
+    pass
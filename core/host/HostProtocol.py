@@ -0,0 +1,69 @@
+"""
+HostProtocol is what a PlayerHost and its worker processes send each other
+over their pipe. The host sends a batch of records, any number of them one
+after the other, each one being:
+
+    uint8   record type: CREATE_PLAYER, TURN, REMOVE_PLAYER or STOP
+    uint32  slot, the number the host gave the hosted player
+    uint16  payload length, then the payload
+
+CREATE_PLAYER carries the player spec (module:Class), the state of the
+player's Random and the names of the seats, a TURN an Observation. The
+worker answers every batch with one action code (see ReplayFormat) per
+TURN, in the order of the batch. Nothing is pickled.
+"""
+from typing import Iterator, List, Tuple
+import math
+import struct
+
+CREATE_PLAYER: int = 0
+TURN: int = 1
+REMOVE_PLAYER: int = 2
+STOP: int = 3
+
+RECORD_HEADER = struct.Struct('<BIH')
+RANDOM_STATE_VERSION: int = 3
+# The 625 words of a Random's state, its next gauss (NaN for None) and the number of seats
+PLAYER_STATE = struct.Struct('<625IdB')
+
+
+def encode_record(record_type: int, slot: int, payload: bytes = b'') -> bytes:
+    return RECORD_HEADER.pack(record_type, slot, len(payload)) + payload
+
+
+def decode_batch(batch: bytes) -> Iterator[Tuple[int, int, bytes]]:
+    # (record type, slot, payload) of every record of the batch
+    offset = 0
+    while offset < len(batch):
+        record_type, slot, payload_length = RECORD_HEADER.unpack_from(batch, offset)
+        offset += RECORD_HEADER.size
+        yield record_type, slot, batch[offset:offset + payload_length]
+        offset += payload_length
+
+
+def encode_player_creation(player_spec: str, random_state: tuple, player_names: List[str]) -> bytes:
+    # random_state is what Random.getstate() returns
+    version, internal_state, gauss_next = random_state
+    payload = bytearray(PLAYER_STATE.pack(*internal_state, math.nan if gauss_next is None else gauss_next,
+                                          len(player_names)))
+    for player_name in player_names:
+        encoded_name = player_name.encode('utf-8')[:255]
+        payload.append(len(encoded_name))
+        payload.extend(encoded_name)
+    payload.extend(player_spec.encode('utf-8'))
+    return bytes(payload)
+
+
+def decode_player_creation(payload: bytes) -> Tuple[str, tuple, List[str]]:
+    # The player spec, a state to give Random.setstate() and the names of the seats
+    values = PLAYER_STATE.unpack_from(payload, 0)
+    internal_state = values[:-2]
+    gauss_next, name_count = values[-2:]
+    offset = PLAYER_STATE.size
+    player_names = []
+    for n in range(name_count):
+        name_length = payload[offset]
+        player_names.append(bytes(payload[offset + 1:offset + 1 + name_length]).decode('utf-8'))
+        offset += 1 + name_length
+    random_state = (RANDOM_STATE_VERSION, internal_state, None if math.isnan(gauss_next) else gauss_next)
+    return bytes(payload[offset:]).decode('utf-8'), random_state, player_names
@@ -0,0 +1,71 @@
+"""
+Observation is what a hosted player is sent every turn instead of its
+PlayerGameHelper: the player's GameState view packed into bytes. Cards are
+card kinds (see Card). The own hand is sent card by card in the order the
+engine holds it, since bots may pick e.g. the first legal card, and every
+other hand only as its size. A turn is about 20 bytes plus one byte per
+card in the hand and on the pile:
+
+    uint8   viewer seat, seat to play as an index into the turn order,
+            color index, legality flags
+    int8    direction
+    uint16  pending draw count, deck count
+    float64 seconds left for the turn, NaN for no limit
+    uint8   number of seats, then the turn order and every seat's hand size
+    bytes   the viewer's hand in the engine's order, as many as its size
+    uint16  number of cards on the pile, then their kinds, the top card last
+"""
+from core.game.Card import Card, CARD_KIND_COUNT
+from core.game.GameState import GameState
+from core.game.LegalityTable import LegalityTable
+from typing import Iterable, List, Tuple
+import math
+import struct
+
+OBSERVATION_HEADER = struct.Struct('<BBBBbHHdB')
+PILE_LENGTH = struct.Struct('<H')
+
+
+def encode_observation(view: GameState, hand: Iterable[Card], time_remaining: float = None) -> bytes:
+    # hand is the viewer's hand as the engine holds it, e.g. PlayerGameHelper.get_hand()
+    seat = view.viewer
+    turn_order = view.turn_order
+    observation = bytearray(OBSERVATION_HEADER.pack(
+        seat, view.turn_index, LegalityTable.get_color_index(view.current_color), view.flags, view.direction,
+        view.pending_draw_count, view.deck_count, math.nan if time_remaining is None else time_remaining,
+        len(turn_order)))
+    observation.extend(turn_order)
+    observation.extend(view.hand_sizes)
+    observation.extend(card.kind for card in hand)
+    card_pile_kinds = view.card_pile_kinds
+    observation.extend(PILE_LENGTH.pack(len(card_pile_kinds)))
+    observation.extend(card_pile_kinds)
+    return bytes(observation)
+
+
+def decode_observation(observation) -> Tuple[GameState, List[int], float]:
+    # The viewer's GameState view, the kinds of their hand in the engine's order and the seconds left for the
+    # turn (None for no limit)
+    seat, turn_index, color_index, flags, direction, pending_draw_count, deck_count, time_remaining, seat_count = \
+        OBSERVATION_HEADER.unpack_from(observation, 0)
+    offset = OBSERVATION_HEADER.size
+    turn_order = tuple(observation[offset:offset + seat_count])
+    offset += seat_count
+    hand_sizes = list(observation[offset:offset + seat_count])
+    offset += seat_count
+    hand_kinds = list(observation[offset:offset + hand_sizes[seat]])
+    offset += hand_sizes[seat]
+    pile_length = PILE_LENGTH.unpack_from(observation, offset)[0]
+    offset += PILE_LENGTH.size
+    card_pile = list(observation[offset:offset + pile_length])
+
+    own_counts = bytearray(CARD_KIND_COUNT)
+    own_mask = 0
+    for kind in hand_kinds:
+        own_counts[kind] += 1
+        own_mask |= 1 << kind
+    hands = [own_counts if index == seat else None for index in range(seat_count)]
+    hand_masks = [own_mask if index == seat else 0 for index in range(seat_count)]
+    view = GameState(None, card_pile, hands, hand_masks, hand_sizes, turn_order, turn_index, direction, color_index,
+                     flags, pending_draw_count, None, seat, deck_count)
+    return view, hand_kinds, None if math.isnan(time_remaining) else time_remaining
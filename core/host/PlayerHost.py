@@ -0,0 +1,266 @@
+"""
+PlayerHost runs bots in a pool of worker processes that stay up for as
+long as the host does, so an untrusted or crash-prone bot cannot take the
+engine down with it. create_player() gives a RemotePlayer to seat in an
+AsyncGameEngine; the bot itself lives in one of the workers (see
+PlayerWorker), which the players are spread over.
+
+Every turn is an Observation of a few dozen bytes sent down the worker's
+pipe, and the answer is a single action code. The turns the matches on the
+event loop ask for while a worker is busy are queued, and go to it as one
+batch once it answers, so many games share every round trip.
+
+A worker that dies, or takes longer than batch_timeout seconds to answer a
+batch, is killed and started again. Every player the worker hosted is
+created again from its spec and Random, losing what it had learned during
+the match. The worker's progress (see PlayerWorker) tells what became of
+the batch: the turns it had answered keep their answers, and the turn it
+was busy with is played as a SKIP. The turns it had not got to yet are sent
+again to the new process, so other matches' players on that worker are
+not punished for it. A player that brings the worker down while it is
+being created is not created again, and its turns are skipped.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from core.host.HostProtocol import CREATE_PLAYER, RECORD_HEADER, REMOVE_PLAYER, STOP, TURN, encode_record
+from core.host.PlayerWorker import run_worker
+from core.host.RemotePlayer import RemotePlayer
+from core.game.CardAction import CardAction
+from core.replay.ReplayFormat import SKIP_CODE, decode_action
+from core.tournament.Tournament import load_player_class
+from typing import Dict, List, Tuple
+import asyncio
+import multiprocessing
+import os
+
+DEFAULT_WORKER_COUNT: int = os.cpu_count() or 1
+DEFAULT_BATCH_TIMEOUT: float = 60.0
+# Turns sent to a worker at once at most, the size of the answers it shares with the host
+MAX_BATCH_TURNS: int = 4096
+# Seconds a worker gets to stop on its own when the host is closed
+STOP_TIMEOUT: float = 1.0
+
+
+class _WorkerProcess:
+    def __init__(self, context):
+        self.context = context
+        self.process = None
+        self.connection = None
+        # Records waiting for the next batch, and the answer of every TURN among them
+        self.records: List[bytes] = []
+        self.futures: List[asyncio.Future] = []
+        # CREATE_PLAYER record of every player the worker hosts, by slot
+        self.creation_records: Dict[int, bytes] = {}
+        # Players given this worker and not removed yet, created in it or still waiting for their first turn
+        self.slot_count = 0
+        self.is_busy = False
+        self.is_batch_scheduled = False
+        # Written by the worker: the index in the batch of the record it is working on, and every answer so far
+        self.progress = context.RawValue('i', -1)
+        self.answers = context.RawArray('B', MAX_BATCH_TURNS)
+        self.start()
+
+    def start(self):
+        self.connection, worker_connection = self.context.Pipe()
+        self.process = self.context.Process(target=run_worker,
+                                            args=(worker_connection, self.progress, self.answers), daemon=True)
+        self.process.start()
+        worker_connection.close()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class PlayerHost:
+    def __init__(self, worker_count: int = DEFAULT_WORKER_COUNT, batch_timeout: float = DEFAULT_BATCH_TIMEOUT,
+                 start_method: str = None):
+        if worker_count < 1:
+            raise ValueError('A player host needs at least one worker, not {}'.format(worker_count))
+        # None waits for an answer however long it takes
+        self._batch_timeout = batch_timeout
+        context = multiprocessing.get_context(start_method)
+        self._workers = [_WorkerProcess(context) for n in range(worker_count)]
+        # Threads waiting for the answers of the workers, one per worker, kept apart from the loop's own executor
+        # so a slow batch never holds up asyncio.to_thread
+        self._receive_executor = ThreadPoolExecutor(max_workers=worker_count)
+        self._slot_workers: Dict[int, _WorkerProcess] = {}
+        self._next_slot = 0
+        # Batches in flight, kept so they are not garbage collected before they finish
+        self._batch_tasks = set()
+        self._batch_count = 0
+        self._turn_count = 0
+        self._crash_count = 0
+
+    @property
+    def worker_count(self) -> int:
+        return len(self._workers)
+
+    @property
+    def batch_count(self) -> int:
+        return self._batch_count
+
+    @property
+    def turn_count(self) -> int:
+        return self._turn_count
+
+    @property
+    def crash_count(self) -> int:
+        # Workers that died or stopped answering and had to be started again
+        return self._crash_count
+
+    def get_average_batch_size(self) -> float:
+        return self._turn_count / self._batch_count if self._batch_count else 0.0
+
+    """
+    create_player returns a RemotePlayer playing the bot of player_spec
+    (module:Class, as for a Tournament) in one of the workers. Close the
+    player once its match is over so the worker can let go of the bot.
+    """
+    def create_player(self, player_spec: str, player_name: str = None) -> RemotePlayer:
+        # Loaded here as well, so a wrong spec fails now rather than in a worker
+        load_player_class(player_spec)
+        slot = self._next_slot
+        self._next_slot += 1
+        # The worker with the fewest players gets the player
+        worker = min(self._workers, key=lambda worker: worker.slot_count)
+        worker.slot_count += 1
+        self._slot_workers[slot] = worker
+        return RemotePlayer(self, slot, player_spec, player_name)
+
+    """
+    register_player, take_turn and remove_player are only called by the
+    RemotePlayer of the slot.
+    """
+    def register_player(self, slot: int, creation_payload: bytes):
+        worker = self._slot_workers[slot]
+        record = encode_record(CREATE_PLAYER, slot, creation_payload)
+        worker.creation_records[slot] = record
+        worker.records.append(record)
+
+    async def take_turn(self, slot: int, observation: bytes) -> CardAction:
+        worker = self._slot_workers[slot]
+        future = asyncio.get_running_loop().create_future()
+        worker.records.append(encode_record(TURN, slot, observation))
+        worker.futures.append(future)
+        if not worker.is_busy and not worker.is_batch_scheduled:
+            # Every turn asked for until the loop comes around again joins the batch
+            worker.is_batch_scheduled = True
+            asyncio.get_running_loop().call_soon(self.__start_batch, worker)
+        return await future
+
+    def remove_player(self, slot: int):
+        worker = self._slot_workers.pop(slot, None)
+        if worker is None:
+            return
+        worker.slot_count -= 1
+        if worker.creation_records.pop(slot, None) is not None:
+            # Goes along with the next batch, there is no answer to wait for
+            worker.records.append(encode_record(REMOVE_PLAYER, slot))
+
+    def close(self):
+        for worker in self._workers:
+            try:
+                worker.connection.send_bytes(encode_record(STOP, 0))
+            except OSError:
+                pass
+            worker.process.join(STOP_TIMEOUT)
+            worker.kill()
+        self._receive_executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __start_batch(self, worker: _WorkerProcess):
+        worker.is_batch_scheduled = False
+        # Busy from now on, not only once the task runs, so no turn schedules a second batch in between
+        worker.is_busy = True
+        batch_task = asyncio.get_running_loop().create_task(self.__play_batch(worker))
+        self._batch_tasks.add(batch_task)
+        batch_task.add_done_callback(self._batch_tasks.discard)
+
+    async def __play_batch(self, worker: _WorkerProcess):
+        loop = asyncio.get_running_loop()
+        records, futures = self.__take_batch(worker)
+        worker.progress.value = -1
+        action_codes = None
+        try:
+            worker.connection.send_bytes(b''.join(records))
+            action_codes = await loop.run_in_executor(self._receive_executor, self.__receive, worker)
+        except OSError:
+            pass
+        if action_codes is None or len(action_codes) != len(futures):
+            futures, action_codes = self.__recover(worker, records, futures)
+        self._batch_count += 1
+        self._turn_count += len(futures)
+        for future, action_code in zip(futures, action_codes):
+            # A turn that timed out in the engine was cancelled and wants no answer
+            if not future.done():
+                future.set_result(decode_action(action_code))
+        worker.is_busy = False
+        if worker.futures:
+            self.__start_batch(worker)
+
+    def __take_batch(self, worker: _WorkerProcess) -> Tuple[List[bytes], List[asyncio.Future]]:
+        # The waiting records up to MAX_BATCH_TURNS turns, the rest waits for the next batch
+        split_index = len(worker.records)
+        turn_count = 0
+        for record_index, record in enumerate(worker.records):
+            if record[0] == TURN:
+                if turn_count == MAX_BATCH_TURNS:
+                    split_index = record_index
+                    break
+                turn_count += 1
+        records = worker.records[:split_index]
+        futures = worker.futures[:turn_count]
+        worker.records = worker.records[split_index:]
+        worker.futures = worker.futures[turn_count:]
+        return records, futures
+
+    def __receive(self, worker: _WorkerProcess) -> bytes:
+        # In a thread of the host's receive executor, None when the worker is gone or too slow
+        try:
+            if not worker.connection.poll(self._batch_timeout):
+                return None
+            return worker.connection.recv_bytes()
+        except (EOFError, OSError):
+            return None
+
+    def __recover(self, worker: _WorkerProcess, records: List[bytes],
+                  futures: List[asyncio.Future]) -> Tuple[List[asyncio.Future], bytes]:
+        # Restarts the worker, returns the turns of the batch that are settled now with their answers
+        self._crash_count += 1
+        worker.kill()
+        # The worker is gone, its progress holds still: every record before this one was done
+        fault_index = worker.progress.value
+        settled_futures = []
+        action_codes = bytearray()
+        resent_records = []
+        resent_futures = []
+        turn_index = 0
+        for record_index, record in enumerate(records):
+            record_type, slot, payload_length = RECORD_HEADER.unpack_from(record, 0)
+            if record_type == TURN:
+                future = futures[turn_index]
+                if record_index < fault_index:
+                    settled_futures.append(future)
+                    action_codes.append(worker.answers[turn_index])
+                elif record_index == fault_index:
+                    settled_futures.append(future)
+                    action_codes.append(SKIP_CODE)
+                else:
+                    resent_records.append(record)
+                    resent_futures.append(future)
+                turn_index += 1
+            elif record_type == CREATE_PLAYER and record_index == fault_index:
+                # Creating the player brought the worker down, it would only do so again
+                worker.creation_records.pop(slot, None)
+        worker.start()
+        # The new process knows nothing yet, its players are created again before anything else
+        worker.records = list(worker.creation_records.values()) + resent_records + worker.records
+        worker.futures = resent_futures + worker.futures
+        return settled_futures, bytes(action_codes)
@@ -0,0 +1,90 @@
+"""
+PlayerWorker is the loop a PlayerHost runs in each of its worker processes.
+It keeps the players it was asked to create, by slot, for as long as the
+process lives, and answers every batch of turns with one action code each.
+For every turn the player is given a PlayerGameHelper built from the
+Observation, the same view of the game it would have had in the engine's
+process, down to the order of the cards in its hand. A player that raises
+or answers with something that is not a CardAction skips its turn; the
+worker carries on.
+
+A player that takes the whole process down, or never answers, cannot be
+caught here. So the worker also keeps its progress in memory shared with
+the host: the index of the record it is working on, and the answer of
+every turn before it. After a crash or a hang the host knows which turn
+was at fault and which turns were already answered.
+"""
+from core.game.ActionType import ActionType
+from core.game.CardAction import CardAction
+from core.game.Card import CARDS_BY_KIND
+from core.game.IPlayer import IPlayer
+from core.game.PlayerGameHelper import PlayerGameHelper
+from core.game.PlayerHandCount import PlayerHandCount
+from core.host.HostProtocol import CREATE_PLAYER, REMOVE_PLAYER, STOP, TURN, decode_batch, decode_player_creation
+from core.host.Observation import decode_observation
+from core.replay.ReplayFormat import SKIP_CODE, encode_action
+from core.tournament.Tournament import load_player_class
+from random import Random
+from typing import Dict, List
+
+SKIP_ACTION = CardAction(ActionType.SKIP)
+
+
+class _HostedPlayer:
+    def __init__(self, player: IPlayer, player_names: List[str]):
+        self._player = player
+        self._player_names = player_names
+
+    def take_turn(self, observation) -> int:
+        view, hand_kinds, time_remaining = decode_observation(observation)
+        seat = view.viewer
+        hand_sizes = view.hand_sizes
+        turn_order = view.turn_order if view.direction == 1 else view.turn_order[::-1]
+        player_hand_counts = tuple(PlayerHandCount(self._player_names[player_seat], player_seat, hand_sizes)
+                                   for player_seat in turn_order)
+        card_pile = [CARDS_BY_KIND[kind] for kind in view.card_pile_kinds]
+        hand = [CARDS_BY_KIND[kind] for kind in hand_kinds]
+        game_helper = PlayerGameHelper(hand, card_pile[-1], card_pile, view.deck_count,
+                                       player_hand_counts, view.current_color, view.flags, time_remaining,
+                                       view.clone, seat, view.pending_draw_count)
+        self._player.set_game_helper(game_helper)
+        action = self._player.take_turn()
+        if not isinstance(action, CardAction):
+            action = SKIP_ACTION
+        return encode_action(action)
+
+
+def run_worker(connection, progress, answers):
+    # progress is a shared int and answers a shared byte array of at least MAX_BATCH_TURNS, see PlayerHost
+    hosted_players: Dict[int, _HostedPlayer] = {}
+    while True:
+        try:
+            batch = connection.recv_bytes()
+        except EOFError:
+            return
+        action_codes = bytearray()
+        for record_index, (record_type, slot, payload) in enumerate(decode_batch(batch)):
+            progress.value = record_index
+            if record_type == TURN:
+                try:
+                    action_code = hosted_players[slot].take_turn(payload)
+                except Exception:
+                    action_code = SKIP_CODE
+                answers[len(action_codes)] = action_code
+                action_codes.append(action_code)
+            elif record_type == CREATE_PLAYER:
+                player_spec, random_state, player_names = decode_player_creation(payload)
+                try:
+                    player = load_player_class(player_spec)()
+                    random = Random()
+                    random.setstate(random_state)
+                    player.set_random(random)
+                    hosted_players[slot] = _HostedPlayer(player, player_names)
+                except Exception:
+                    # Its turns are skipped, like those of a player that raises
+                    hosted_players.pop(slot, None)
+            elif record_type == REMOVE_PLAYER:
+                hosted_players.pop(slot, None)
+            elif record_type == STOP:
+                return
+        connection.send_bytes(bytes(action_codes))
@@ -0,0 +1,52 @@
+"""
+RemotePlayer sits in an AsyncGameEngine for a bot hosted by a PlayerHost.
+Its take_turn packs the player's view of the game into an Observation and
+awaits the bot's answer from the worker process. The bot is created in the
+worker on the first turn, with a Random in the very state this player's
+Random is in, so a match with the same engine seed plays out exactly as it
+would with the bot in the engine's process.
+"""
+from core.game.CardAction import CardAction
+from core.game.IAsyncPlayer import IAsyncPlayer
+from core.host.HostProtocol import encode_player_creation
+from core.host.Observation import encode_observation
+from random import Random
+
+
+class RemotePlayer(IAsyncPlayer):
+    def __init__(self, host, slot: int, player_spec: str, player_name: str = None):
+        super().__init__()
+        # host is the PlayerHost, which created this player for the slot
+        self._host = host
+        self._slot = slot
+        self._player_spec = player_spec
+        self._player_name = player_name if player_name is not None else player_spec
+        self._is_registered = False
+
+    def get_player_name(self) -> str:
+        return self._player_name
+
+    @property
+    def player_spec(self) -> str:
+        return self._player_spec
+
+    def set_random(self, random: Random):
+        super().set_random(random)
+        # A new match, the bot is created again with the new generator
+        self._is_registered = False
+
+    async def take_turn(self) -> CardAction:
+        game_helper = self.get_game_helper()
+        view = game_helper.get_game_state()
+        if not self._is_registered:
+            player_names = [self._player_name] * view.player_count
+            for player_hand_count in game_helper.getOpponentsHandCount():
+                player_names[player_hand_count.seat] = player_hand_count.player_name
+            self._host.register_player(self._slot, encode_player_creation(
+                self._player_spec, self.get_random().getstate(), player_names))
+            self._is_registered = True
+        return await self._host.take_turn(self._slot, encode_observation(view, game_helper.get_hand(),
+                                                                         game_helper.get_time_remaining()))
+
+    def close(self):
+        self._host.remove_player(self._slot)
@@ -0,0 +1,214 @@
+"""
+ReplayAnalytics works out statistics over replay files without playing the
+games again: win rates by seat and number of players, the first player's
+win rate by the first card on the pile, how many turns rounds take, which
+cards end them and how many rounds end as a draw. Needs NumPy.
+
+Games are read in chunks. Only the few header bytes of a game are read in
+Python; the action codes of a whole chunk are joined into one NumPy array
+and every statistic is a vectorized count over it. Memory use is bounded by
+the chunk size no matter how big the archive is. Replay files are shards
+that worker processes analyze separately, and their ReplayStats are merged.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from core.game.Card import CARD_COLORS, CARD_KIND_COUNT, KIND_CARD_TYPES, WILD_DRAW_FOUR_KIND
+from core.game.CardType import CardType
+from core.game.GameEngine import MAX_REQUIRED_PLAYERS
+from core.replay.ReplayFormat import DRAWN_ROUND_SEAT, ROUND_STARTED_CODE, ROUND_WON_CODE, WILD_COLOR_CODE_START
+from core.replay.ReplayReader import ReplayReader
+from typing import List
+import numpy as np
+
+DEFAULT_CHUNK_SIZE: int = 100000
+# Rounds of this many turns or more share the last bin of the turn count histogram
+MAX_TURN_COUNT_BIN: int = 1000
+SEAT_COUNT: int = MAX_REQUIRED_PLAYERS
+
+
+def _create_code_kinds() -> np.ndarray:
+    # Card kind played by every action code, -1 for anything that is not a card
+    code_kinds = np.full(256, -1, dtype=np.int64)
+    code_kinds[:CARD_KIND_COUNT] = np.arange(CARD_KIND_COUNT)
+    for code in range(WILD_COLOR_CODE_START, WILD_COLOR_CODE_START + 2 * len(CARD_COLORS)):
+        code_kinds[code] = WILD_DRAW_FOUR_KIND + (code - WILD_COLOR_CODE_START) // len(CARD_COLORS)
+    return code_kinds
+
+
+CODE_KINDS = _create_code_kinds()
+KIND_SKIPS_FIRST_SEAT = np.array([card_type == CardType.SKIP for card_type in KIND_CARD_TYPES])
+KIND_IS_REVERSE = np.array([card_type == CardType.REVERSE for card_type in KIND_CARD_TYPES])
+
+
+class ReplayStats:
+    def __init__(self):
+        # Indexed by number of players, then by seat
+        self._game_counts = np.zeros(SEAT_COUNT + 1, dtype=np.int64)
+        self._game_wins = np.zeros((SEAT_COUNT + 1, SEAT_COUNT), dtype=np.int64)
+        self._round_counts = np.zeros(SEAT_COUNT + 1, dtype=np.int64)
+        self._round_wins = np.zeros((SEAT_COUNT + 1, SEAT_COUNT), dtype=np.int64)
+        self._drawn_round_counts = np.zeros(SEAT_COUNT + 1, dtype=np.int64)
+        # Indexed by the kind of the first card on the pile, for the first player to play
+        self._first_card_rounds = np.zeros(CARD_KIND_COUNT, dtype=np.int64)
+        self._first_card_first_seat_wins = np.zeros(CARD_KIND_COUNT, dtype=np.int64)
+        self._turn_count_histogram = np.zeros(MAX_TURN_COUNT_BIN + 1, dtype=np.int64)
+        # Indexed by the kind of the card that won the round
+        self._winning_card_counts = np.zeros(CARD_KIND_COUNT, dtype=np.int64)
+
+    @property
+    def game_count(self) -> int:
+        return int(self._game_counts.sum())
+
+    @property
+    def round_count(self) -> int:
+        return int(self._round_counts.sum())
+
+    @property
+    def drawn_round_count(self) -> int:
+        return int(self._drawn_round_counts.sum())
+
+    def add_chunk(self, action_codes: np.ndarray, action_lengths: np.ndarray, player_counts: np.ndarray):
+        # action_codes holds the action codes of the chunk's games one after the other
+        game_count = len(action_lengths)
+        game_indexes = np.repeat(np.arange(game_count), action_lengths)
+        # Marker codes never follow a marker, so every one found is a real marker
+        started_positions = np.flatnonzero(action_codes == ROUND_STARTED_CODE)
+        won_positions = np.flatnonzero(action_codes == ROUND_WON_CODE)
+        round_games = game_indexes[won_positions]
+        round_player_counts = player_counts[round_games]
+        winners = action_codes[won_positions + 1].astype(np.int64)
+        first_kinds = action_codes[started_positions + 1].astype(np.int64)
+        turn_counts = won_positions - started_positions - 2
+        # A drawn round has no winner and was not ended by a card, only the rounds won count below
+        is_won = winners != DRAWN_ROUND_SEAT
+        won_positions = won_positions[is_won]
+        won_round_games = round_games[is_won]
+        won_player_counts = round_player_counts[is_won]
+        winners = winners[is_won]
+        winning_kinds = CODE_KINDS[action_codes[won_positions - 1]]
+
+        self._round_counts += np.bincount(round_player_counts, minlength=SEAT_COUNT + 1)
+        self._drawn_round_counts += np.bincount(round_player_counts[~is_won], minlength=SEAT_COUNT + 1)
+        self._round_wins += np.bincount(won_player_counts * SEAT_COUNT + winners,
+                                        minlength=(SEAT_COUNT + 1) * SEAT_COUNT).reshape(SEAT_COUNT + 1, SEAT_COUNT)
+        self._first_card_rounds += np.bincount(first_kinds, minlength=CARD_KIND_COUNT)
+        # Seat 0 plays first unless the first card skips it
+        first_seats = np.where(KIND_SKIPS_FIRST_SEAT[first_kinds] | (KIND_IS_REVERSE[first_kinds] &
+                                                                      (round_player_counts == 2)), 1, 0)
+        won_first_kinds = first_kinds[is_won]
+        self._first_card_first_seat_wins += np.bincount(won_first_kinds[winners == first_seats[is_won]],
+                                                        minlength=CARD_KIND_COUNT)
+        self._turn_count_histogram += np.bincount(np.minimum(turn_counts, MAX_TURN_COUNT_BIN),
+                                                  minlength=MAX_TURN_COUNT_BIN + 1)
+        self._winning_card_counts += np.bincount(winning_kinds[winning_kinds >= 0], minlength=CARD_KIND_COUNT)
+
+        # Like the engine, the match goes to the most round wins and a tie to whoever won a round first
+        game_seats = won_round_games * SEAT_COUNT + winners
+        round_wins = np.bincount(game_seats, minlength=game_count * SEAT_COUNT).reshape(game_count, SEAT_COUNT)
+        first_wins = np.full(game_count * SEAT_COUNT, len(won_positions), dtype=np.int64)
+        np.minimum.at(first_wins, game_seats, np.arange(len(won_positions)))
+        most_round_wins = round_wins.max(axis=1)
+        tie_keys = np.where(round_wins == most_round_wins[:, np.newaxis], first_wins.reshape(game_count, SEAT_COUNT),
+                            len(won_positions))
+        match_winners = tie_keys.argmin(axis=1)
+        is_played = most_round_wins > 0
+        self._game_counts += np.bincount(player_counts[is_played], minlength=SEAT_COUNT + 1)
+        self._game_wins += np.bincount(player_counts[is_played] * SEAT_COUNT + match_winners[is_played],
+                                       minlength=(SEAT_COUNT + 1) * SEAT_COUNT).reshape(SEAT_COUNT + 1, SEAT_COUNT)
+
+    def merge(self, other: 'ReplayStats'):
+        self._game_counts += other._game_counts
+        self._game_wins += other._game_wins
+        self._round_counts += other._round_counts
+        self._round_wins += other._round_wins
+        self._drawn_round_counts += other._drawn_round_counts
+        self._first_card_rounds += other._first_card_rounds
+        self._first_card_first_seat_wins += other._first_card_first_seat_wins
+        self._turn_count_histogram += other._turn_count_histogram
+        self._winning_card_counts += other._winning_card_counts
+
+    def get_seat_win_rates(self, player_count: int) -> np.ndarray:
+        # Share of the matches won by every seat, with player_count players
+        return self._game_wins[player_count, :player_count] / max(1, self._game_counts[player_count])
+
+    def get_seat_round_win_rates(self, player_count: int) -> np.ndarray:
+        return self._round_wins[player_count, :player_count] / max(1, self._round_counts[player_count])
+
+    def get_first_card_win_rates(self) -> np.ndarray:
+        # First player's round win rate by the kind of the first card, NaN for kinds never seen first
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._first_card_first_seat_wins / self._first_card_rounds
+
+    def get_turn_count_percentile(self, percentile: float) -> int:
+        cumulative_counts = np.cumsum(self._turn_count_histogram)
+        if cumulative_counts[-1] == 0:
+            return 0
+        return int(np.searchsorted(cumulative_counts, cumulative_counts[-1] * percentile / 100.0))
+
+    def get_average_turn_count(self) -> float:
+        round_count = self._turn_count_histogram.sum()
+        if round_count == 0:
+            return 0.0
+        return float(np.dot(np.arange(MAX_TURN_COUNT_BIN + 1), self._turn_count_histogram) / round_count)
+
+    def get_winning_card_share(self, card_types: List[CardType]) -> float:
+        # Share of the rounds won by playing a card of one of these types
+        is_card_type = np.array([card_type in card_types for card_type in KIND_CARD_TYPES])
+        return float(self._winning_card_counts[is_card_type].sum() / max(1, self._winning_card_counts.sum()))
+
+    def get_summary_text(self) -> str:
+        lines = ['{} games, {} rounds, {} drawn'.format(self.game_count, self.round_count, self.drawn_round_count)]
+        lines.append('{:<8} {:>10} {:>10}  {}'.format('players', 'games', 'rounds', 'match win % by seat'))
+        for player_count in range(2, SEAT_COUNT + 1):
+            if self._round_counts[player_count]:
+                lines.append('{:<8} {:>10} {:>10}  {}'.format(
+                    player_count, self._game_counts[player_count], self._round_counts[player_count],
+                    ' '.join('{:5.1f}'.format(100 * rate) for rate in self.get_seat_win_rates(player_count))))
+        lines.append('{:<20} {:>10} {:>18}'.format('first card', 'rounds', 'first player win %'))
+        for card_type in CardType:
+            kinds = [kind for kind in range(CARD_KIND_COUNT) if KIND_CARD_TYPES[kind] == card_type]
+            rounds = self._first_card_rounds[kinds].sum()
+            if rounds:
+                lines.append('{:<20} {:>10} {:>17.1f}%'.format(
+                    card_type.name, rounds, 100 * self._first_card_first_seat_wins[kinds].sum() / rounds))
+        lines.append('turns per round: mean {:.1f}, p50 {}, p90 {}, p99 {}'.format(
+            self.get_average_turn_count(), self.get_turn_count_percentile(50), self.get_turn_count_percentile(90),
+            self.get_turn_count_percentile(99)))
+        wild_share = self.get_winning_card_share([CardType.WILD, CardType.WILD_DRAW_FOUR])
+        draw_share = self.get_winning_card_share([CardType.DRAW_TWO, CardType.WILD_DRAW_FOUR])
+        lines.append('rounds won with a wild: {:.1%}, with a draw card: {:.1%}'.format(wild_share, draw_share))
+        return '\n'.join(lines)
+
+
+def analyze_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> ReplayStats:
+    stats = ReplayStats()
+    with ReplayReader(path) as replay_reader:
+        chunk_codes = []
+        player_counts = []
+        for record in replay_reader:
+            chunk_codes.append(record.get_action_bytes())
+            player_counts.append(record.player_count)
+            if len(player_counts) >= chunk_size:
+                _add_chunk(stats, chunk_codes, player_counts)
+                chunk_codes = []
+                player_counts = []
+        if player_counts:
+            _add_chunk(stats, chunk_codes, player_counts)
+    return stats
+
+
+def _add_chunk(stats: ReplayStats, chunk_codes: List[bytes], player_counts: List[int]):
+    action_codes = np.frombuffer(b''.join(chunk_codes), dtype=np.uint8)
+    action_lengths = np.fromiter((len(codes) for codes in chunk_codes), dtype=np.int64, count=len(chunk_codes))
+    stats.add_chunk(action_codes, action_lengths, np.array(player_counts, dtype=np.int64))
+
+
+def analyze_files(paths: List[str], workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> ReplayStats:
+    stats = ReplayStats()
+    if workers <= 1:
+        for path in paths:
+            stats.merge(analyze_file(path, chunk_size))
+        return stats
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for file_stats in executor.map(analyze_file, paths, [chunk_size] * len(paths)):
+            stats.merge(file_stats)
+    return stats
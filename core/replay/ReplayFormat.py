@@ -0,0 +1,118 @@
+"""
+ReplayFormat is the layout of a replay file. A file starts with a short
+header and is followed by any number of games, each one written as:
+
+    uint32  length of the rest of the game in bytes
+    uint64  seed the GameEngine was created with
+    uint16  rounds per match
+    uint8   rules the game was played with, the index of its DrawStackingRule
+            in DRAW_STACKING_RULES
+    uint32  RoundLimits.max_turns, 0 for no limit
+    uint8   RoundLimits.repetition_limit, 0 for no limit
+    uint8   number of players, then for each seat:
+              uint8 name length, the name as UTF-8 (e.g. a player spec)
+    bytes   ROUND_STARTED_CODE followed by the kind of the first card on the
+            pile, one action code per turn in the order the turns were
+            taken, and ROUND_WON_CODE followed by the winner's seat (or
+            DRAWN_ROUND_SEAT for a round that ended as a draw), for every
+            round
+
+The seed decides every shuffle and every card drawn, so the only thing a
+replay has to keep is what each player answered: one byte per turn. All
+numbers are little endian.
+"""
+from core.game.ActionType import ActionType
+from core.game.Card import Card, CARD_COLORS, CARDS_BY_KIND, CARD_KIND_COUNT, WILD_DRAW_FOUR_KIND, KIND_IS_WILD
+from core.game.CardAction import CardAction
+from core.game.DrawStackingRule import DrawStackingRule
+from core.game.RoundLimits import RoundLimits
+import struct
+
+REPLAY_MAGIC: bytes = b'OLRP'
+# Bumped whenever the rules or the use of the seed change, an older replay would not play out the same anymore
+REPLAY_VERSION: int = 6
+FILE_HEADER = struct.Struct('<4sB')
+GAME_LENGTH = struct.Struct('<I')
+# The number of players has to stay last, the names are found from it
+GAME_HEADER = struct.Struct('<QHBIBB')
+# Only ever added to, the index of a rule is what a replay stores
+DRAW_STACKING_RULES = (DrawStackingRule.SAME_TYPE, DrawStackingRule.MIXED)
+
+# Action codes: 0-53 play the card of that kind (a wild without a color),
+# then a wild with a color for each wild kind and color, then the rest
+WILD_COLOR_CODE_START: int = CARD_KIND_COUNT
+PLAY_WITHOUT_CARD_CODE: int = 0xFC
+SKIP_CODE: int = 0xFD
+# Round markers, both are followed by one more byte
+ROUND_STARTED_CODE: int = 0xFE
+ROUND_WON_CODE: int = 0xFF
+# Winner's seat of a round that ended as a draw, not a marker code so markers still never follow a marker
+DRAWN_ROUND_SEAT: int = 0xFB
+
+SKIP_ACTION = CardAction(ActionType.SKIP)
+PLAY_WITHOUT_CARD_ACTION = CardAction(ActionType.PLAY)
+
+
+def _create_code_actions():
+    code_actions = [None] * 256
+    for kind, card in enumerate(CARDS_BY_KIND):
+        code_actions[kind] = CardAction(ActionType.PLAY, card)
+        if KIND_IS_WILD[kind]:
+            for color_index, color_type in enumerate(CARD_COLORS):
+                code = WILD_COLOR_CODE_START + (kind - WILD_DRAW_FOUR_KIND) * len(CARD_COLORS) + color_index
+                code_actions[code] = CardAction(ActionType.PLAY, card, color_type)
+    code_actions[PLAY_WITHOUT_CARD_CODE] = PLAY_WITHOUT_CARD_ACTION
+    code_actions[SKIP_CODE] = SKIP_ACTION
+    return code_actions
+
+
+# Decoded actions are read only, so every code shares one
+CODE_ACTIONS = _create_code_actions()
+
+
+def encode_action(action: CardAction) -> int:
+    if action.action != ActionType.PLAY:
+        return SKIP_CODE
+    card = action.card
+    if not isinstance(card, Card):
+        # The engine treats any card that is not a Card the same way
+        return PLAY_WITHOUT_CARD_CODE
+    kind = card.kind
+    if KIND_IS_WILD[kind] and action.color in CARD_COLORS:
+        return WILD_COLOR_CODE_START + (kind - WILD_DRAW_FOUR_KIND) * len(CARD_COLORS) + \
+               CARD_COLORS.index(action.color)
+    return kind
+
+
+def decode_action(code: int) -> CardAction:
+    action = CODE_ACTIONS[code]
+    if action is None:
+        raise ValueError('{} is not an action code'.format(code))
+    return action
+
+
+def encode_game_header(seed: int, rounds_per_match: int, player_names,
+                       draw_stacking_rule: DrawStackingRule = DrawStackingRule.SAME_TYPE,
+                       round_limits: RoundLimits = None) -> bytearray:
+    if not 0 <= seed < 1 << 64:
+        raise ValueError('A replay needs a seed between 0 and 2**64 - 1, not {}'.format(seed))
+    max_turns = 0
+    repetition_limit = 0
+    if round_limits is not None:
+        max_turns = round_limits.max_turns or 0
+        repetition_limit = round_limits.repetition_limit or 0
+    if max_turns >= 1 << 32 or repetition_limit > 0xFF:
+        raise ValueError('A replay can only keep up to 2**32 - 1 turns and 255 repetitions')
+    header = bytearray(GAME_HEADER.pack(seed, rounds_per_match, DRAW_STACKING_RULES.index(draw_stacking_rule),
+                                        max_turns, repetition_limit, len(player_names)))
+    for player_name in player_names:
+        encoded_name = player_name.encode('utf-8')[:255]
+        header.append(len(encoded_name))
+        header.extend(encoded_name)
+    return header
+
+
+def decode_round_limits(max_turns: int, repetition_limit: int) -> RoundLimits:
+    if max_turns == 0 and repetition_limit == 0:
+        return None
+    return RoundLimits(max_turns or None, repetition_limit or None)
@@ -0,0 +1,39 @@
+"""
+ReplayPlayer plays back the turns of a ReplayRecord. Every seat of the
+replayed game gets a ReplayPlayer, all sharing the record's actions, and
+whoever's turn it is answers with the next one. Since the GameEngine is
+created with the recorded seed and rules, replay_game plays out exactly the game that
+was recorded, events and all.
+"""
+from core.game.CardAction import CardAction
+from core.game.GameEngine import GameEngine
+from core.game.IEventSink import IEventSink
+from core.game.IPlayer import IPlayer
+from core.replay.ReplayRecord import ReplayRecord
+from typing import Iterator, List
+
+
+class ReplayPlayer(IPlayer):
+    def __init__(self, player_name: str, actions: Iterator[CardAction]):
+        super().__init__()
+        self._player_name = player_name
+        self._actions = actions
+
+    def get_player_name(self) -> str:
+        return self._player_name
+
+    def take_turn(self) -> CardAction:
+        action = next(self._actions, None)
+        if action is None:
+            raise ValueError('The replay ran out of turns before the match was over')
+        return action
+
+
+def replay_game(record: ReplayRecord, event_sinks: List[IEventSink] = None) -> GameEngine:
+    # Plays the recorded game again and returns the engine, e.g. for get_match_result()
+    actions = record.get_actions()
+    players = [ReplayPlayer(player_name, actions) for player_name in record.get_player_names()]
+    game_engine = GameEngine(players, record.rounds_per_match, event_sinks, seed=record.seed,
+                             draw_stacking_rule=record.draw_stacking_rule, round_limits=record.round_limits)
+    game_engine.start()
+    return game_engine
@@ -0,0 +1,47 @@
+"""
+ReplayReader goes over the games of a replay file. The file is memory
+mapped rather than read, and every game is a ReplayRecord that only reads
+what is asked of it, so skimming a large file only touches the game
+lengths. Close the reader (or use it as a context manager) once done, no
+memoryview of its records may be kept after that.
+"""
+from core.replay.ReplayFormat import FILE_HEADER, GAME_LENGTH, REPLAY_MAGIC, REPLAY_VERSION
+from core.replay.ReplayRecord import ReplayRecord
+from typing import Iterator
+import mmap
+
+
+class ReplayReader:
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < FILE_HEADER.size:
+            self.close()
+            raise ValueError('{} is not a replay file'.format(path))
+        magic, version = FILE_HEADER.unpack_from(self._buffer, 0)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            self.close()
+            raise ValueError('{} is not a version {} replay file'.format(path, REPLAY_VERSION))
+
+    def __iter__(self) -> Iterator[ReplayRecord]:
+        buffer = self._buffer
+        offset = FILE_HEADER.size
+        # A game cut short, e.g. by a crash while writing, is left out
+        while offset + GAME_LENGTH.size <= len(buffer):
+            game_length = GAME_LENGTH.unpack_from(buffer, offset)[0]
+            start = offset + GAME_LENGTH.size
+            if start + game_length > len(buffer):
+                break
+            yield ReplayRecord(buffer, start, start + game_length)
+            offset = start + game_length
+
+    def close(self):
+        if not self._buffer.closed:
+            self._buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,113 @@
+"""
+ReplayRecord is one game of a replay file, as given by a ReplayReader. It
+only keeps where the game is in the file: the seed, the players and the
+actions are read from the file when they are asked for. get_action_codes()
+is a memoryview of the raw action codes, so going over many games does not
+create an object per turn. This class is meant to be a read-only class.
+"""
+from core.game.CardAction import CardAction
+from core.game.DrawStackingRule import DrawStackingRule
+from core.game.RoundLimits import RoundLimits
+from core.replay.ReplayFormat import DRAW_STACKING_RULES, DRAWN_ROUND_SEAT, GAME_HEADER, ROUND_STARTED_CODE, \
+    ROUND_WON_CODE, decode_action, decode_round_limits
+from typing import Iterator, List, Tuple
+
+
+class ReplayRecord:
+    __slots__ = ('_buffer', '_start', '_end', '_actions_start')
+
+    def __init__(self, buffer, start: int, end: int):
+        # start is the game header, right after the game's length
+        self._buffer = buffer
+        self._start = start
+        self._end = end
+        self._actions_start = None
+
+    @property
+    def seed(self) -> int:
+        return GAME_HEADER.unpack_from(self._buffer, self._start)[0]
+
+    @property
+    def rounds_per_match(self) -> int:
+        return GAME_HEADER.unpack_from(self._buffer, self._start)[1]
+
+    @property
+    def draw_stacking_rule(self) -> DrawStackingRule:
+        return DRAW_STACKING_RULES[GAME_HEADER.unpack_from(self._buffer, self._start)[2]]
+
+    @property
+    def round_limits(self) -> RoundLimits:
+        header = GAME_HEADER.unpack_from(self._buffer, self._start)
+        return decode_round_limits(header[3], header[4])
+
+    @property
+    def player_count(self) -> int:
+        return GAME_HEADER.unpack_from(self._buffer, self._start)[5]
+
+    def get_player_names(self) -> List[str]:
+        player_names = []
+        offset = self._start + GAME_HEADER.size
+        for seat in range(self.player_count):
+            name_length = self._buffer[offset]
+            player_names.append(bytes(self._buffer[offset + 1:offset + 1 + name_length]).decode('utf-8'))
+            offset += 1 + name_length
+        self._actions_start = offset
+        return player_names
+
+    def get_action_range(self) -> Tuple[int, int]:
+        # Where the action codes are in the file, found from the name lengths without decoding the names
+        if self._actions_start is None:
+            buffer = self._buffer
+            offset = self._start + GAME_HEADER.size
+            for seat in range(buffer[self._start + GAME_HEADER.size - 1]):
+                offset += 1 + buffer[offset]
+            self._actions_start = offset
+        return self._actions_start, self._end
+
+    def get_action_codes(self) -> memoryview:
+        # Action codes and round markers exactly as stored, see ReplayFormat
+        start, end = self.get_action_range()
+        return memoryview(self._buffer)[start:end]
+
+    def get_action_bytes(self) -> bytes:
+        # A copy of get_action_codes(), which can still be used after the reader is closed
+        start, end = self.get_action_range()
+        return self._buffer[start:end]
+
+    def get_actions(self) -> Iterator[CardAction]:
+        # The action of every turn in the order they were taken, without the round markers
+        action_codes = self.get_action_bytes()
+        index = 0
+        while index < len(action_codes):
+            code = action_codes[index]
+            if code == ROUND_STARTED_CODE or code == ROUND_WON_CODE:
+                index += 2
+                continue
+            yield decode_action(code)
+            index += 1
+
+    def get_round_winner_ids(self) -> List[int]:
+        # None for a drawn round, like MatchResult.round_winner_ids
+        return [None if seat == DRAWN_ROUND_SEAT else seat for seat in self.__get_marked_bytes(ROUND_WON_CODE)]
+
+    def get_first_card_kinds(self) -> List[int]:
+        # Kind of the first card on the pile of every round
+        return self.__get_marked_bytes(ROUND_STARTED_CODE)
+
+    def get_turn_count(self) -> int:
+        start, end = self.get_action_range()
+        return end - start - 4 * len(self.get_round_winner_ids())
+
+    def __get_marked_bytes(self, marker_code: int) -> List[int]:
+        action_codes = self.get_action_bytes()
+        marked_bytes = []
+        index = 0
+        while index < len(action_codes):
+            code = action_codes[index]
+            if code == ROUND_STARTED_CODE or code == ROUND_WON_CODE:
+                if code == marker_code:
+                    marked_bytes.append(action_codes[index + 1])
+                index += 2
+            else:
+                index += 1
+        return marked_bytes
@@ -0,0 +1,60 @@
+"""
+ReplayRecorder is given to a GameEngine to record its matches. The engine
+tells it the seed, the players and the rules when a match starts, then the first card
+of every round, the action of every turn (after a time out, the SKIP the
+engine replaced it with) and the winner of every round, or that it was
+drawn. Once the match is over the recording is
+written to the ReplayWriter, if one was given, and kept as get_game_bytes().
+
+One recorder can record any number of matches, one after the other.
+"""
+from core.game.CardAction import CardAction
+from core.game.Card import Card
+from core.game.DrawStackingRule import DrawStackingRule
+from core.game.RoundLimits import RoundLimits
+from core.replay.ReplayFormat import DRAWN_ROUND_SEAT, GAME_LENGTH, ROUND_STARTED_CODE, ROUND_WON_CODE, \
+    encode_action, encode_game_header
+from core.replay.ReplayWriter import ReplayWriter
+from typing import List
+
+
+class ReplayRecorder:
+    def __init__(self, writer: ReplayWriter = None, player_names: List[str] = None):
+        self._writer = writer
+        # Names to record for the seats instead of get_player_name(), e.g. the tournament's player specs
+        self._player_names = player_names
+        self._game_bytes = bytearray()
+
+    def start_game(self, seed: int, rounds_per_match: int, player_names: List[str],
+                   draw_stacking_rule: DrawStackingRule = DrawStackingRule.SAME_TYPE, round_limits: RoundLimits = None):
+        if self._player_names is not None:
+            player_names = self._player_names
+        self._game_bytes = bytearray(GAME_LENGTH.size)
+        self._game_bytes.extend(encode_game_header(seed, rounds_per_match, player_names, draw_stacking_rule,
+                                                   round_limits))
+
+    def record_round_started(self, first_card: Card):
+        self._game_bytes.append(ROUND_STARTED_CODE)
+        self._game_bytes.append(first_card.kind)
+
+    def record_action(self, action: CardAction):
+        self._game_bytes.append(encode_action(action))
+
+    def record_round_won(self, player_id: int):
+        self._game_bytes.append(ROUND_WON_CODE)
+        self._game_bytes.append(player_id)
+
+    def record_round_drawn(self):
+        self._game_bytes.append(ROUND_WON_CODE)
+        self._game_bytes.append(DRAWN_ROUND_SEAT)
+
+    def finish_game(self):
+        GAME_LENGTH.pack_into(self._game_bytes, 0, len(self._game_bytes) - GAME_LENGTH.size)
+        if self._writer is not None:
+            self._writer.write_game(self._game_bytes)
+
+    def set_player_names(self, player_names: List[str]):
+        self._player_names = player_names
+
+    def get_game_bytes(self) -> bytes:
+        return bytes(self._game_bytes)
@@ -0,0 +1,39 @@
+"""
+ReplayWriter appends games to a replay file. Games are buffered and written
+out in large blocks, so call close() (or use the writer as a context
+manager) once every game has been written. Writing to an existing replay
+file adds the new games after the old ones.
+"""
+from core.replay.ReplayFormat import FILE_HEADER, REPLAY_MAGIC, REPLAY_VERSION
+
+DEFAULT_BUFFER_SIZE: int = 1 << 20
+
+
+class ReplayWriter:
+    def __init__(self, path: str, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self._file = open(path, 'ab', buffering=buffer_size)
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION))
+        self._game_count = 0
+
+    @property
+    def game_count(self) -> int:
+        return self._game_count
+
+    def write_game(self, game_bytes: bytes):
+        # A whole game as recorded by a ReplayRecorder, starting with its length
+        self._file.write(game_bytes)
+        self._game_count += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
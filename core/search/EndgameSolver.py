@@ -0,0 +1,508 @@
+"""
+EndgameSolver plays out the end of a round between 2 players exactly, for
+when both hands are down to a few cards and a guess is too costly.
+
+It solves from what the player to move can see, a GameState view. The
+opponent's hand is not known, so the solver goes over every hand the
+opponent could hold, weighted by how likely it is given the cards left
+unseen, and averages the win probability of every move over them. When
+there are more than max_holdings hands they are sampled instead. With the
+opponent's hand filled in, the rest is an expectimax search: the solver
+picks its best move, the opponent is assumed to pick theirs, and every card
+drawn from the deck (whose order nobody knows) is a chance node over the
+kinds left in it.
+
+The search deepens one step at a time, a step being one turn or one card
+drawn, until it reaches the end of the round everywhere or time_budget runs
+out; the last search that finished is used. Positions beyond the depth are
+guessed from the hand sizes with a race model: every turn, the player to
+move plays a card if any of theirs matches and draws one otherwise. Every
+position searched is kept in a TranspositionTable keyed by a Zobrist hash: a random 64 bit number for the
+count of every card kind in each hand and in the deck, the top card, the
+color, the flags, the pending draw and the player to move, XORed together.
+The hash is updated with two XORs whenever a card moves, so keying a
+position costs next to nothing. The table is kept between solves, e.g. for
+the next turn of the same round.
+"""
+from core.game.ActionType import ActionType
+from core.game.Card import CARD_COLORS, CARD_KIND_COUNT, CARDS_BY_KIND, KIND_COLOR_TYPES, KIND_DRAW_COUNTS, \
+    KIND_IS_WILD
+from core.game.CardAction import CardAction
+from core.game.GameState import GameState, FULL_DECK_COUNTS, KIND_IS_DRAW, KIND_IS_REVERSE, KIND_IS_SKIP
+from core.game.LegalityTable import LegalityTable, DRAW_PENDING_FLAG, FLAG_COMBINATIONS, MIXED_STACKING_FLAG, \
+    SKIP_SERVED_FLAG
+from core.search.SolverStats import SolverStats
+from core.search.TranspositionTable import TranspositionTable
+from math import comb, fsum
+from random import Random
+from typing import Iterator, List, Tuple
+import time
+
+# Both hands at most this size is where the solver is worth calling
+ENDGAME_HAND_SIZE: int = 3
+DEFAULT_MAX_DEPTH: int = 16
+DEFAULT_TABLE_SIZE: int = 1 << 18
+DEFAULT_MAX_HOLDINGS: int = 256
+# The clock is only read once every this many positions
+CLOCK_CHECK_INTERVAL: int = 512
+# Race model: the chance that one card can be played on the pile, hands up to this size
+RACE_MATCH_CHANCE: float = 0.3
+RACE_MAX_HAND_SIZE: int = 40
+# Weighted sums over the opponent's hands are off by rounding, a value this close to 0 or 1 is certain
+CERTAINTY_TOLERANCE: float = 1e-9
+
+# Seats as the solver sees them: the player it solves for, and the opponent
+SOLVER_SEAT: int = 0
+OPPONENT_SEAT: int = 1
+# A move is kind * 4 + color index (the color declared for a wild), or drawing instead
+SKIP_MOVE: int = -1
+SKIP_ACTION = CardAction(ActionType.SKIP)
+
+KIND_COLOR_INDEXES = tuple(0 if KIND_IS_WILD[kind] else CARD_COLORS.index(KIND_COLOR_TYPES[kind])
+                           for kind in range(CARD_KIND_COUNT))
+MAX_PENDING_DRAW_COUNT = sum(FULL_DECK_COUNTS[kind] * KIND_DRAW_COUNTS[kind] for kind in range(CARD_KIND_COUNT))
+
+
+def _create_zobrist_keys(random: Random, size: int) -> List[int]:
+    return [random.getrandbits(64) for n in range(size)]
+
+
+# Fixed, so the same position always has the same hash
+_zobrist_random = Random(0x0E1EF7)
+ZOBRIST_HANDS = [[_create_zobrist_keys(_zobrist_random, FULL_DECK_COUNTS[kind] + 1) for kind in range(CARD_KIND_COUNT)]
+                 for seat in (SOLVER_SEAT, OPPONENT_SEAT)]
+ZOBRIST_DECK = [_create_zobrist_keys(_zobrist_random, FULL_DECK_COUNTS[kind] + 1) for kind in range(CARD_KIND_COUNT)]
+ZOBRIST_TOP_KINDS = _create_zobrist_keys(_zobrist_random, CARD_KIND_COUNT)
+ZOBRIST_COLORS = _create_zobrist_keys(_zobrist_random, len(CARD_COLORS))
+ZOBRIST_FLAGS = _create_zobrist_keys(_zobrist_random, FLAG_COMBINATIONS)
+ZOBRIST_PENDING_DRAW_COUNTS = _create_zobrist_keys(_zobrist_random, MAX_PENDING_DRAW_COUNT + 1)
+ZOBRIST_OPPONENT_TO_MOVE = _zobrist_random.getrandbits(64)
+
+
+def _create_race_win_chances() -> List[List[float]]:
+    # [own][opponent] hand size: chance that the player to move wins the race, worked out by value iteration
+    size_count = RACE_MAX_HAND_SIZE + 1
+    play_chances = [1.0 - (1.0 - RACE_MATCH_CHANCE) ** size for size in range(size_count)]
+    win_chances = [[0.5] * size_count for size in range(size_count)]
+    largest_change = 1.0
+    while largest_change > 1e-6:
+        largest_change = 0.0
+        for own_size in range(1, size_count):
+            for opponent_size in range(1, size_count):
+                played_chance = 1.0 if own_size == 1 else 1.0 - win_chances[opponent_size][own_size - 1]
+                drawn_chance = 1.0 - win_chances[opponent_size][min(own_size + 1, RACE_MAX_HAND_SIZE)]
+                win_chance = play_chances[own_size] * played_chance + (1.0 - play_chances[own_size]) * drawn_chance
+                largest_change = max(largest_change, abs(win_chance - win_chances[own_size][opponent_size]))
+                win_chances[own_size][opponent_size] = win_chance
+    return win_chances
+
+
+RACE_WIN_CHANCES = _create_race_win_chances()
+
+
+def _get_certain_value(value: float) -> float:
+    # Clamped to [0, 1], and exactly 0 or 1 when only rounding keeps it from being certain
+    if value >= 1.0 - CERTAINTY_TOLERANCE:
+        return 1.0
+    if value <= CERTAINTY_TOLERANCE:
+        return 0.0
+    return value
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+def _get_mask(counts) -> int:
+    mask = 0
+    for kind in range(CARD_KIND_COUNT):
+        if counts[kind]:
+            mask |= 1 << kind
+    return mask
+
+
+def _get_action(move: int) -> CardAction:
+    if move == SKIP_MOVE:
+        return SKIP_ACTION
+    kind = move >> 2
+    if KIND_IS_WILD[kind]:
+        return CardAction(ActionType.PLAY, CARDS_BY_KIND[kind], CARD_COLORS[move & 3])
+    return CardAction(ActionType.PLAY, CARDS_BY_KIND[kind])
+
+
+def _enumerate_holdings(unseen_counts, holding_size: int) -> Iterator[Tuple[List[int], float]]:
+    # Every hand of holding_size cards out of the unseen cards, with its probability
+    kinds = [kind for kind in range(CARD_KIND_COUNT) if unseen_counts[kind]]
+    hand_count = comb(sum(unseen_counts), holding_size)
+    counts = [0] * CARD_KIND_COUNT
+
+    def enumerate_from(index: int, remaining: int, weight: int):
+        if remaining == 0:
+            yield counts[:], weight / hand_count
+            return
+        if index == len(kinds):
+            return
+        kind = kinds[index]
+        for count in range(min(remaining, unseen_counts[kind]), -1, -1):
+            counts[kind] = count
+            yield from enumerate_from(index + 1, remaining - count, weight * comb(unseen_counts[kind], count))
+        counts[kind] = 0
+
+    return enumerate_from(0, holding_size, 1)
+
+
+class EndgameSolver:
+    def __init__(self, table_size: int = DEFAULT_TABLE_SIZE, max_holdings: int = DEFAULT_MAX_HOLDINGS,
+                 max_depth: int = DEFAULT_MAX_DEPTH):
+        self._table = TranspositionTable(table_size)
+        self._max_holdings = max_holdings
+        self._max_depth = max_depth
+        self._stats = SolverStats()
+        # The position being searched, with the opponent's hand filled in
+        self._hands: List[List[int]] = None
+        self._hand_masks: List[int] = None
+        self._hand_sizes: List[int] = None
+        self._deck: List[int] = None
+        self._deck_size = 0
+        # Cards under the top card of the pile, only needed when the deck runs out
+        self._pile: List[int] = None
+        self._pile_size = 0
+        self._counts_hash = 0
+        self._top_kind = 0
+        self._color_index = 0
+        self._flags = 0
+        self._pending_draw_count = 0
+        self._seat_to_move = SOLVER_SEAT
+        self._node_count = 0
+        # Goes up whenever a value had to be guessed, a search without guesses is exact
+        self._guess_count = 0
+        self._deadline: float = None
+
+    @staticmethod
+    def can_solve(view: GameState, max_hand_size: int = ENDGAME_HAND_SIZE) -> bool:
+        return view.player_count == 2 and not view.is_over and max(view.hand_sizes) <= max_hand_size
+
+    """
+    solve returns the best move of the player to move and their chance of
+    winning the round with it. view is the player's GameState view (or a
+    full GameState, then the opponent's hand is known). time_budget is in
+    seconds, None searches up to max_depth however long it takes. random is
+    only used to sample the opponent's hand when it could be too many.
+    """
+    def solve(self, view: GameState, time_budget: float = None, random: Random = None) -> Tuple[CardAction, float]:
+        if view.player_count != 2:
+            raise ValueError('The endgame solver only solves rounds between 2 players')
+        if view.is_over:
+            raise ValueError('The round is already over')
+        seat = view.active_seat
+        if view.viewer is not None and view.viewer != seat:
+            raise ValueError('The endgame solver solves for the player to move, seat {}'.format(seat))
+        start_time = time.perf_counter()
+        table = self._table
+        table_counts = (table.probe_count, table.hit_count, table.store_count, table.eviction_count)
+        opponent_seat = view.turn_order[1 - view.turn_index]
+        holdings, is_sampled = self.__get_holdings(view, opponent_seat, random)
+
+        self._node_count = 0
+        self._deadline = None
+        moves = None
+        move_values = None
+        completed_depth = 0
+        is_exact = False
+        for depth in range(1, self._max_depth + 1):
+            guess_count = self._guess_count
+            try:
+                depth_moves, depth_move_values = self.__search_holdings(view, seat, holdings, depth)
+            except _SearchTimeout:
+                break
+            moves, move_values = depth_moves, depth_move_values
+            completed_depth = depth
+            if self._guess_count == guess_count:
+                # Nothing was left to guess, searching deeper would give the same values
+                is_exact = not is_sampled
+                break
+            if max(move_values) == 1.0:
+                # A move that wins against every opponent hand, searching deeper can't find a better one
+                is_exact = not is_sampled
+                break
+            # The first depth always finishes, so there is a move to play
+            if time_budget is not None:
+                self._deadline = start_time + time_budget
+                if time.perf_counter() >= self._deadline:
+                    break
+
+        best_index = move_values.index(max(move_values))
+        self._stats = SolverStats()
+        self._stats.add_solve(self._node_count, (table.probe_count - table_counts[0], table.hit_count - table_counts[1],
+                                                 table.store_count - table_counts[2],
+                                                 table.eviction_count - table_counts[3]),
+                              len(holdings), is_sampled, completed_depth, is_exact, time.perf_counter() - start_time)
+        return _get_action(moves[best_index]), move_values[best_index]
+
+    """
+    get_stats covers the last solve.
+    """
+    def get_stats(self) -> SolverStats:
+        return self._stats
+
+    def get_table(self) -> TranspositionTable:
+        return self._table
+
+    def clear_table(self):
+        self._table.clear()
+
+    def __get_holdings(self, view: GameState, opponent_seat: int,
+                       random: Random) -> Tuple[List[Tuple[List[int], float]], bool]:
+        opponent_counts = view.get_hand_counts(opponent_seat)
+        if opponent_counts is not None:
+            return [(list(opponent_counts), 1.0)], False
+        unseen_counts = view.get_unseen_counts()
+        holding_size = view.hand_sizes[opponent_seat]
+        holdings = []
+        for holding in _enumerate_holdings(unseen_counts, holding_size):
+            if len(holdings) == self._max_holdings:
+                break
+            holdings.append(holding)
+        else:
+            # The probabilities add up to 1 give or take rounding, make them add up to exactly 1
+            weight_total = fsum(weight for counts, weight in holdings)
+            return [(counts, weight / weight_total) for counts, weight in holdings], False
+        # Too many to go over, every sampled hand counts the same
+        if random is None:
+            random = Random()
+        unseen_kinds = [kind for kind in range(CARD_KIND_COUNT) for n in range(unseen_counts[kind])]
+        holdings = []
+        for n in range(self._max_holdings):
+            counts = [0] * CARD_KIND_COUNT
+            for kind in random.sample(unseen_kinds, holding_size):
+                counts[kind] += 1
+            holdings.append((counts, 1.0 / self._max_holdings))
+        return holdings, True
+
+    def __search_holdings(self, view: GameState, seat: int, holdings, depth: int) -> Tuple[List[int], List[float]]:
+        own_counts = view.get_hand_counts(seat)
+        pile_counts = [0] * CARD_KIND_COUNT
+        for kind in view.card_pile_kinds[:-1]:
+            pile_counts[kind] += 1
+        moves = None
+        move_values = None
+        for opponent_counts, weight in holdings:
+            self.__set_position(view, own_counts, opponent_counts, pile_counts)
+            if moves is None:
+                moves = self.__get_moves(SOLVER_SEAT)
+                move_values = [0.0] * len(moves)
+            for index, move in enumerate(moves):
+                move_values[index] += weight * self.__get_move_value(SOLVER_SEAT, move, depth - 1)
+        return moves, [_get_certain_value(value) for value in move_values]
+
+    def __set_position(self, view: GameState, own_counts, opponent_counts: List[int], pile_counts: List[int]):
+        deck = list(FULL_DECK_COUNTS)
+        for kind in range(CARD_KIND_COUNT):
+            deck[kind] -= own_counts[kind] + opponent_counts[kind] + pile_counts[kind]
+        deck[view.card_pile_kinds[-1]] -= 1
+        self._hands = [list(own_counts), list(opponent_counts)]
+        self._hand_masks = [_get_mask(counts) for counts in self._hands]
+        self._hand_sizes = [sum(counts) for counts in self._hands]
+        self._deck = deck
+        self._deck_size = sum(deck)
+        self._pile = pile_counts[:]
+        self._pile_size = sum(pile_counts)
+        self._top_kind = view.card_pile_kinds[-1]
+        self._color_index = LegalityTable.get_color_index(view.current_color)
+        self._flags = view.flags
+        self._pending_draw_count = view.pending_draw_count
+        self._seat_to_move = SOLVER_SEAT
+        self._counts_hash = self.__get_counts_hash()
+
+    def __get_counts_hash(self) -> int:
+        counts_hash = 0
+        for kind in range(CARD_KIND_COUNT):
+            for seat, counts in enumerate(self._hands):
+                counts_hash ^= ZOBRIST_HANDS[seat][kind][counts[kind]]
+            counts_hash ^= ZOBRIST_DECK[kind][self._deck[kind]]
+        return counts_hash
+
+    def __get_moves(self, seat: int) -> List[int]:
+        # Every legal card (a wild once per color) and drawing instead, as GameState.get_legal_actions
+        moves = []
+        legal_mask = LegalityTable.get_legal_mask_by_kind(self._top_kind, self._color_index, self._flags) & \
+            self._hand_masks[seat]
+        while legal_mask:
+            lowest_bit = legal_mask & -legal_mask
+            kind = lowest_bit.bit_length() - 1
+            if KIND_IS_WILD[kind]:
+                moves.extend(kind << 2 | color_index for color_index in range(len(CARD_COLORS)))
+            else:
+                moves.append(kind << 2 | KIND_COLOR_INDEXES[kind])
+            legal_mask ^= lowest_bit
+        moves.append(SKIP_MOVE)
+        return moves
+
+    def __get_estimate(self, drawing_seat: int = SOLVER_SEAT, draw_count: int = 0) -> float:
+        # Beyond the depth the race model guesses, cards still to be drawn are counted in already
+        self._guess_count += 1
+        own_size = self._hand_sizes[SOLVER_SEAT]
+        opponent_size = self._hand_sizes[OPPONENT_SEAT]
+        if drawing_seat == SOLVER_SEAT:
+            own_size += draw_count
+        else:
+            opponent_size += draw_count
+        own_size = min(own_size, RACE_MAX_HAND_SIZE)
+        opponent_size = min(opponent_size, RACE_MAX_HAND_SIZE)
+        if self._seat_to_move == SOLVER_SEAT:
+            return RACE_WIN_CHANCES[own_size][opponent_size]
+        return 1.0 - RACE_WIN_CHANCES[opponent_size][own_size]
+
+    def __search(self, depth: int) -> float:
+        # Value of the position for the solver's seat, with the seat to move picking a move
+        self._node_count += 1
+        if self._deadline is not None and self._node_count % CLOCK_CHECK_INTERVAL == 0 \
+                and time.perf_counter() >= self._deadline:
+            raise _SearchTimeout()
+        if depth <= 0:
+            return self.__get_estimate()
+        seat = self._seat_to_move
+        key = self._counts_hash ^ ZOBRIST_TOP_KINDS[self._top_kind] ^ ZOBRIST_COLORS[self._color_index] ^ \
+            ZOBRIST_FLAGS[self._flags] ^ ZOBRIST_PENDING_DRAW_COUNTS[self._pending_draw_count]
+        if seat == OPPONENT_SEAT:
+            key ^= ZOBRIST_OPPONENT_TO_MOVE
+        entry = self._table.get(key)
+        if entry is not None:
+            value, entry_depth, is_exact = entry
+            if is_exact or entry_depth >= depth:
+                if not is_exact:
+                    self._guess_count += 1
+                return value
+        guess_count = self._guess_count
+        # A certain win for the seat to move can't be beaten, the rest of its moves are not searched
+        if seat == SOLVER_SEAT:
+            value = 0.0
+            for move in self.__get_moves(seat):
+                value = max(value, self.__get_move_value(seat, move, depth - 1))
+                if value == 1.0:
+                    break
+        else:
+            value = 1.0
+            for move in self.__get_moves(seat):
+                value = min(value, self.__get_move_value(seat, move, depth - 1))
+                if value == 0.0:
+                    break
+        self._table.put(key, (value, depth, self._guess_count == guess_count))
+        return value
+
+    def __get_move_value(self, seat: int, move: int, depth: int) -> float:
+        # Same rules as GameState.apply between 2 players, the position is put back before returning
+        flags = self._flags
+        pending_draw_count = self._pending_draw_count
+        if move == SKIP_MOVE:
+            if flags & DRAW_PENDING_FLAG:
+                # Every stacked card is drawn at once
+                draw_count = pending_draw_count
+                self._pending_draw_count = 0
+                self._flags = flags & ~DRAW_PENDING_FLAG
+            else:
+                draw_count = 1
+                self._flags = flags | SKIP_SERVED_FLAG
+            self._seat_to_move = 1 - seat
+            value = self.__get_draw_value(seat, draw_count, depth)
+            self._seat_to_move = seat
+            self._flags = flags
+            self._pending_draw_count = pending_draw_count
+            return value
+
+        kind = move >> 2
+        hand = self._hands[seat]
+        count = hand[kind]
+        hand_keys = ZOBRIST_HANDS[seat][kind]
+        hand_mask = self._hand_masks[seat]
+        hand[kind] = count - 1
+        if count == 1:
+            self._hand_masks[seat] = hand_mask ^ 1 << kind
+        self._hand_sizes[seat] -= 1
+        if self._hand_sizes[seat] == 0:
+            value = 1.0 if seat == SOLVER_SEAT else 0.0
+        else:
+            self._counts_hash ^= hand_keys[count] ^ hand_keys[count - 1]
+            top_kind = self._top_kind
+            color_index = self._color_index
+            self._pile[top_kind] += 1
+            self._pile_size += 1
+            self._top_kind = kind
+            self._color_index = move & 3
+            rule_flags = flags & MIXED_STACKING_FLAG
+            if KIND_IS_SKIP[kind] or KIND_IS_REVERSE[kind]:
+                # Between 2 players both give the same player another turn
+                self._flags = rule_flags | SKIP_SERVED_FLAG
+            else:
+                self._flags = rule_flags | DRAW_PENDING_FLAG if KIND_IS_DRAW[kind] else rule_flags
+                self._pending_draw_count = pending_draw_count + KIND_DRAW_COUNTS[kind]
+                self._seat_to_move = 1 - seat
+            value = self.__search(depth)
+            self._seat_to_move = seat
+            self._pending_draw_count = pending_draw_count
+            self._flags = flags
+            self._color_index = color_index
+            self._top_kind = top_kind
+            self._pile_size -= 1
+            self._pile[top_kind] -= 1
+            self._counts_hash ^= hand_keys[count] ^ hand_keys[count - 1]
+        self._hand_sizes[seat] += 1
+        self._hand_masks[seat] = hand_mask
+        hand[kind] = count
+        return value
+
+    def __get_draw_value(self, seat: int, draw_count: int, depth: int) -> float:
+        # Chance node: the next card of the deck is any card left in it, each as likely
+        if draw_count == 0:
+            return self.__search(depth)
+        if depth <= 0:
+            return self.__get_estimate(seat, draw_count)
+        if self._deck_size == 0:
+            if self._pile_size == 0:
+                # Every card is in a hand, nothing is drawn
+                return self.__search(depth)
+            return self.__get_reshuffled_draw_value(seat, draw_count, depth)
+        deck = self._deck
+        deck_size = self._deck_size
+        hand = self._hands[seat]
+        hand_keys = ZOBRIST_HANDS[seat]
+        hand_mask = self._hand_masks[seat]
+        counts_hash = self._counts_hash
+        value = 0.0
+        self._deck_size = deck_size - 1
+        self._hand_sizes[seat] += 1
+        for kind in range(CARD_KIND_COUNT):
+            count = deck[kind]
+            if count:
+                hand_count = hand[kind]
+                deck[kind] = count - 1
+                hand[kind] = hand_count + 1
+                self._hand_masks[seat] = hand_mask | 1 << kind
+                self._counts_hash = counts_hash ^ ZOBRIST_DECK[kind][count] ^ ZOBRIST_DECK[kind][count - 1] ^ \
+                    hand_keys[kind][hand_count] ^ hand_keys[kind][hand_count + 1]
+                value += count * self.__get_draw_value(seat, draw_count - 1, depth - 1)
+                hand[kind] = hand_count
+                deck[kind] = count
+        self._counts_hash = counts_hash
+        self._hand_masks[seat] = hand_mask
+        self._hand_sizes[seat] -= 1
+        self._deck_size = deck_size
+        return value / deck_size
+
+    def __get_reshuffled_draw_value(self, seat: int, draw_count: int, depth: int) -> float:
+        # Same as the engine: the cards under the top card become the deck
+        deck = self._deck
+        pile = self._pile
+        counts_hash = self._counts_hash
+        self._deck = pile
+        self._deck_size = self._pile_size
+        self._pile = [0] * CARD_KIND_COUNT
+        self._pile_size = 0
+        self._counts_hash = self.__get_counts_hash()
+        value = self.__get_draw_value(seat, draw_count, depth)
+        self._counts_hash = counts_hash
+        self._pile_size = self._deck_size
+        self._pile = pile
+        self._deck_size = 0
+        self._deck = deck
+        return value
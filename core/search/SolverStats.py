@@ -0,0 +1,115 @@
+"""
+SolverStats is what an EndgameSolver reports about its work: how many
+positions it searched, how often its transposition table had the answer,
+how deep it got and whether the answer is exact. get_stats() of the solver
+covers its last solve; stats of several solves can be merged into one.
+"""
+
+
+class SolverStats:
+    def __init__(self):
+        self._solve_count = 0
+        self._exact_count = 0
+        self._node_count = 0
+        self._table_probe_count = 0
+        self._table_hit_count = 0
+        self._table_store_count = 0
+        self._table_eviction_count = 0
+        # Opponent hands the solves were averaged over, and how many solves had to sample them
+        self._holding_count = 0
+        self._sampled_count = 0
+        # Deepest search that finished, counted in turns and single card draws
+        self._depth = 0
+        self._elapsed_time = 0.0
+
+    def add_solve(self, node_count: int, table_counts, holding_count: int, is_sampled: bool, depth: int,
+                  is_exact: bool, elapsed_time: float):
+        # table_counts are the probes, hits, stores and evictions of the transposition table during the solve
+        self._solve_count += 1
+        self._exact_count += 1 if is_exact else 0
+        self._node_count += node_count
+        self._table_probe_count += table_counts[0]
+        self._table_hit_count += table_counts[1]
+        self._table_store_count += table_counts[2]
+        self._table_eviction_count += table_counts[3]
+        self._holding_count += holding_count
+        self._sampled_count += 1 if is_sampled else 0
+        self._depth = max(self._depth, depth)
+        self._elapsed_time += elapsed_time
+
+    def merge(self, other: 'SolverStats'):
+        self._solve_count += other._solve_count
+        self._exact_count += other._exact_count
+        self._node_count += other._node_count
+        self._table_probe_count += other._table_probe_count
+        self._table_hit_count += other._table_hit_count
+        self._table_store_count += other._table_store_count
+        self._table_eviction_count += other._table_eviction_count
+        self._holding_count += other._holding_count
+        self._sampled_count += other._sampled_count
+        self._depth = max(self._depth, other._depth)
+        self._elapsed_time += other._elapsed_time
+
+    @property
+    def solve_count(self) -> int:
+        return self._solve_count
+
+    @property
+    def exact_count(self) -> int:
+        return self._exact_count
+
+    @property
+    def is_exact(self) -> bool:
+        # Every solve searched to the end of the round without a guess
+        return self._solve_count > 0 and self._exact_count == self._solve_count
+
+    @property
+    def node_count(self) -> int:
+        return self._node_count
+
+    @property
+    def table_probe_count(self) -> int:
+        return self._table_probe_count
+
+    @property
+    def table_hit_count(self) -> int:
+        return self._table_hit_count
+
+    @property
+    def table_hit_rate(self) -> float:
+        return self._table_hit_count / self._table_probe_count if self._table_probe_count else 0.0
+
+    @property
+    def table_store_count(self) -> int:
+        return self._table_store_count
+
+    @property
+    def table_eviction_count(self) -> int:
+        return self._table_eviction_count
+
+    @property
+    def holding_count(self) -> int:
+        return self._holding_count
+
+    @property
+    def sampled_count(self) -> int:
+        return self._sampled_count
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @property
+    def elapsed_time(self) -> float:
+        return self._elapsed_time
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self._node_count / self._elapsed_time if self._elapsed_time else 0.0
+
+    def get_report_text(self) -> str:
+        return '{} solves ({} exact), {} nodes in {:.3f}s ({:.0f} nodes/s), depth {}, table: {} probes, ' \
+               '{:.1%} hits, {} stores, {} evictions, {} opponent hands ({} solves sampled them)'.format(
+                self._solve_count, self._exact_count, self._node_count, self._elapsed_time, self.nodes_per_second,
+                self._depth, self._table_probe_count, self.table_hit_rate, self._table_store_count,
+                self._table_eviction_count, self._holding_count, self._sampled_count)
@@ -0,0 +1,66 @@
+"""
+TranspositionTable remembers the value of positions a search has already
+been through, keyed by a 64 bit hash of the position (see EndgameSolver), so
+a position reached again by another order of moves is not searched twice.
+It holds at most max_entries entries; when it is full the entry used least
+recently is evicted to make room. It counts its probes, hits, stores and
+evictions so a search can report how well the table works.
+"""
+from collections import OrderedDict
+
+
+class TranspositionTable:
+    def __init__(self, max_entries: int):
+        if max_entries < 1:
+            raise ValueError('A transposition table needs room for at least one entry, not {}'.format(max_entries))
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._probe_count = 0
+        self._hit_count = 0
+        self._store_count = 0
+        self._eviction_count = 0
+
+    def get(self, key: int):
+        # The entry stored for the key, None when there is none
+        self._probe_count += 1
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._hit_count += 1
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: int, entry):
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+        elif len(entries) >= self._max_entries:
+            entries.popitem(last=False)
+            self._eviction_count += 1
+        entries[key] = entry
+        self._store_count += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries
+
+    @property
+    def probe_count(self) -> int:
+        return self._probe_count
+
+    @property
+    def hit_count(self) -> int:
+        return self._hit_count
+
+    @property
+    def store_count(self) -> int:
+        return self._store_count
+
+    @property
+    def eviction_count(self) -> int:
+        return self._eviction_count
@@ -0,0 +1,145 @@
+"""
+AdaptiveTournament plays a schedule of 2 player matchups like a Tournament,
+but stops every matchup as soon as its result is clear instead of playing a
+fixed number of matches. It plays in rounds: each round, every matchup that
+is still open plays one chunk of matches, and those still close to even on
+their SequentialTest play a second one. A matchup closes once its test
+picks the stronger player, or after max_matches_per_matchup matches.
+
+The test can only stop a matchup between chunks, so chunks start out at
+FIRST_CHUNK_SIZE matches and only grow with the matches already played, up
+to chunk_size: a matchup decided early does not have to finish a big chunk
+first. Chunks are added to the tests in the order of the matches, and once
+a matchup is decided its later chunks of the round are cancelled, or left
+out if they already ran, so every count (the test's, the ladder's, the
+TournamentResult's and matches played) covers the same matches and a run
+does not depend on the number of workers.
+
+Matches get the same seeds as in a Tournament, so the first matches of a
+matchup are the same in both. Every result also goes into a RatingLadder
+for the leaderboard, and games_saved is how many matches fewer than the
+fixed max_matches_per_matchup for every matchup were played.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from core.game.DrawStackingRule import DrawStackingRule
+from core.game.RoundLimits import RoundLimits, DEFAULT_MAX_TURNS, DEFAULT_REPETITION_LIMIT
+from core.game.TimeBudget import TimeBudget
+from core.tournament.RatingLadder import RatingLadder
+from core.tournament.SequentialTest import SequentialTest, DEFAULT_ALPHA, DEFAULT_BETA, DEFAULT_ELO_MARGIN
+from core.tournament.Tournament import Tournament, DEFAULT_CHUNK_SIZE, _play_matches
+from core.tournament.TournamentResult import TournamentResult
+from typing import Iterator, List, Tuple
+import os
+
+# A matchup at least this uncertain gets a second chunk of matches in a round
+EXTRA_CHUNK_UNCERTAINTY: float = 0.5
+# Matches in the first chunk of a matchup, later chunks are as big as the matches played so far
+FIRST_CHUNK_SIZE: int = 10
+
+
+class AdaptiveTournament(Tournament):
+    def __init__(self, player_specs: List[str], schedule: List[Tuple[int, ...]], max_matches_per_matchup: int,
+                 rounds_per_match: int = 3, workers: int = 1, seed: int = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, profile: bool = False, time_budget: TimeBudget = None,
+                 replay_dir: str = None, draw_stacking_rule: DrawStackingRule = DrawStackingRule.SAME_TYPE,
+                 round_limits: RoundLimits = RoundLimits(DEFAULT_MAX_TURNS, DEFAULT_REPETITION_LIMIT),
+                 elo_margin: float = DEFAULT_ELO_MARGIN, alpha: float = DEFAULT_ALPHA, beta: float = DEFAULT_BETA):
+        super().__init__(player_specs, schedule, max_matches_per_matchup, rounds_per_match, workers, seed, chunk_size,
+                         profile, time_budget, replay_dir, draw_stacking_rule, round_limits)
+        for matchup in self._schedule:
+            if len(matchup) != 2:
+                raise ValueError('An adaptive tournament only plays matchups of 2 players, not {}'.format(matchup))
+        self._sequential_tests = [SequentialTest(elo_margin, alpha, beta) for matchup in self._schedule]
+        self._matches_played = [0] * len(self._schedule)
+        self._ladder = RatingLadder(self._player_specs)
+
+    @property
+    def ladder(self) -> RatingLadder:
+        return self._ladder
+
+    @property
+    def sequential_tests(self) -> List[SequentialTest]:
+        return self._sequential_tests
+
+    @property
+    def games_saved(self) -> int:
+        return len(self._schedule) * self._matches_per_matchup - sum(self._matches_played)
+
+    def run(self) -> TournamentResult:
+        result = TournamentResult(self._player_specs)
+        if self._replay_dir is not None:
+            os.makedirs(self._replay_dir, exist_ok=True)
+        executor = ProcessPoolExecutor(max_workers=self._workers) if self._workers > 1 else None
+        try:
+            chunks = self.__get_round_chunks()
+            while chunks:
+                for (matchup_index, first_match_index, match_count), chunk_result in \
+                        self.__play_chunks(executor, chunks):
+                    self.__add_chunk_result(matchup_index, match_count, chunk_result)
+                    result.merge(chunk_result)
+                chunks = self.__get_round_chunks()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        return result
+
+    def get_summary_text(self) -> str:
+        lines = [self._ladder.get_leaderboard_text()]
+        lines.append('{:<45} {:<45} {:>9} {:>9}'.format('matchup', '', 'matches', 'stronger'))
+        for matchup_index, matchup in enumerate(self._schedule):
+            stronger_index = self._sequential_tests[matchup_index].stronger_index
+            lines.append('{:<45} {:<45} {:>9} {:>9}'.format(
+                self._player_specs[matchup[0]], self._player_specs[matchup[1]], self._matches_played[matchup_index],
+                'open' if stronger_index is None else ('first', 'second')[stronger_index]))
+        lines.append('{} matches played, {} saved against {} per matchup'.format(
+            sum(self._matches_played), self.games_saved, self._matches_per_matchup))
+        return '\n'.join(lines)
+
+    def __play_chunks(self, executor: ProcessPoolExecutor, chunks: List[Tuple[int, int, int]]) \
+            -> Iterator[Tuple[Tuple[int, int, int], TournamentResult]]:
+        # Every chunk of a matchup that is still open when the chunk's turn comes, in the order of the chunks
+        futures: List[Future] = []
+        if executor is not None:
+            futures = [executor.submit(_play_matches, self._create_task(*chunk)) for chunk in chunks]
+        for chunk_index, chunk in enumerate(chunks):
+            if self._sequential_tests[chunk[0]].is_decided:
+                # Decided by an earlier chunk of the round, the matches of this one are not wanted
+                if futures:
+                    futures[chunk_index].cancel()
+                continue
+            if futures:
+                yield chunk, futures[chunk_index].result()
+            else:
+                yield chunk, _play_matches(self._create_task(*chunk))
+
+    def __get_round_chunks(self) -> List[Tuple[int, int, int]]:
+        # (matchup index, first match index, match count) of every chunk of the round. First chunks come first, the
+        # most uncertain matchups first so they are the first to get a worker, then the second chunks, so they are
+        # still waiting for a worker when an earlier chunk decides their matchup.
+        open_indexes = [matchup_index for matchup_index, sequential_test in enumerate(self._sequential_tests)
+                        if not sequential_test.is_decided
+                        and self._matches_played[matchup_index] < self._matches_per_matchup]
+        open_indexes.sort(key=lambda matchup_index: -self._sequential_tests[matchup_index].get_uncertainty())
+        chunks = []
+        second_chunks = []
+        for matchup_index in open_indexes:
+            first_match_index = self._matches_played[matchup_index]
+            chunk_size = min(max(FIRST_CHUNK_SIZE, first_match_index), self._chunk_size)
+            match_count = min(chunk_size, self._matches_per_matchup - first_match_index)
+            chunks.append((matchup_index, first_match_index, match_count))
+            second_match_index = first_match_index + match_count
+            if self._sequential_tests[matchup_index].get_uncertainty() >= EXTRA_CHUNK_UNCERTAINTY \
+                    and second_match_index < self._matches_per_matchup:
+                second_chunks.append((matchup_index, second_match_index,
+                                      min(chunk_size, self._matches_per_matchup - second_match_index)))
+        return chunks + second_chunks
+
+    def __add_chunk_result(self, matchup_index: int, match_count: int, chunk_result: TournamentResult):
+        first_index, second_index = self._schedule[matchup_index]
+        matchup_wins = chunk_result.matchup_wins[self._schedule[matchup_index]]
+        first_wins = matchup_wins[first_index]
+        second_wins = matchup_wins[second_index]
+        draws = match_count - first_wins - second_wins
+        self._matches_played[matchup_index] += match_count
+        self._sequential_tests[matchup_index].add_results(first_wins, second_wins, draws)
+        self._ladder.add_results(first_index, second_index, first_wins, second_wins, draws)
@@ -0,0 +1,48 @@
+"""
+AsyncMatchRunner plays many AsyncGameEngine matches on one event loop. At
+most concurrency matches are in play at once, the others wait for a free
+slot. A match still going after match_timeout seconds is cancelled and has
+no MatchResult. Matches only overlap while their players wait, e.g. on a
+model server; matches between bots that only compute are better spread over
+processes with a Tournament.
+"""
+from core.game.AsyncGameEngine import AsyncGameEngine
+from core.game.MatchResult import MatchResult
+from typing import Iterable, List
+import asyncio
+
+DEFAULT_CONCURRENCY: int = 100
+
+
+class AsyncMatchRunner:
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, match_timeout: float = None):
+        if concurrency < 1:
+            raise ValueError('At least one match has to be played at a time, not {}'.format(concurrency))
+        self._concurrency = concurrency
+        self._match_timeout = match_timeout
+        self._cancelled_count = 0
+
+    @property
+    def cancelled_count(self) -> int:
+        # Matches of the last run that went over match_timeout
+        return self._cancelled_count
+
+    def run(self, game_engines: Iterable[AsyncGameEngine]) -> List[MatchResult]:
+        # From code that is not async, on an event loop of its own
+        return asyncio.run(self.run_async(game_engines))
+
+    async def run_async(self, game_engines: Iterable[AsyncGameEngine]) -> List[MatchResult]:
+        # The MatchResult of every match in the order given, None for a cancelled one
+        self._cancelled_count = 0
+        semaphore = asyncio.Semaphore(self._concurrency)
+        return list(await asyncio.gather(*(self.__play_match(game_engine, semaphore)
+                                           for game_engine in game_engines)))
+
+    async def __play_match(self, game_engine: AsyncGameEngine, semaphore: asyncio.Semaphore) -> MatchResult:
+        async with semaphore:
+            try:
+                await asyncio.wait_for(game_engine.start_async(), self._match_timeout)
+            except asyncio.TimeoutError:
+                self._cancelled_count += 1
+                return None
+        return game_engine.get_match_result()
@@ -0,0 +1,89 @@
+"""
+HostedTournament plays the schedule of a Tournament with every bot in a
+PlayerHost, so a bot that crashes or hangs only costs a turn instead of
+taking a worker and its chunk of matches down. All matches run as
+AsyncGameEngines on one event loop in the tournament's process, at most
+MAX_OPEN_MATCHES at a time, and workers is the number of the host's worker
+processes.
+
+Matches get the same seeds and seatings as in a Tournament, and a hosted
+bot gets a Random in the same state, so the results are the very same as
+those of a Tournament as long as no bot crashes. A hosted bot is created
+again for every match, the same as in a Tournament. Hosted matches are not
+recorded or profiled.
+"""
+from core.game.AsyncGameEngine import AsyncGameEngine
+from core.game.DrawStackingRule import DrawStackingRule
+from core.game.GameEngineHelper import GameEngineHelper
+from core.game.MatchResult import MatchResult
+from core.game.RoundLimits import RoundLimits, DEFAULT_MAX_TURNS, DEFAULT_REPETITION_LIMIT
+from core.game.TimeBudget import TimeBudget
+from core.host.PlayerHost import PlayerHost, DEFAULT_BATCH_TIMEOUT
+from core.tournament.Tournament import Tournament, load_player_class
+from core.tournament.TournamentResult import TournamentResult
+from typing import List, Tuple
+import asyncio
+
+# Matches played at once, enough for every worker to get big batches
+MAX_OPEN_MATCHES: int = 256
+
+
+class HostedTournament(Tournament):
+    def __init__(self, player_specs: List[str], schedule: List[Tuple[int, ...]], matches_per_matchup: int,
+                 rounds_per_match: int = 3, workers: int = 1, seed: int = None, time_budget: TimeBudget = None,
+                 draw_stacking_rule: DrawStackingRule = DrawStackingRule.SAME_TYPE,
+                 round_limits: RoundLimits = RoundLimits(DEFAULT_MAX_TURNS, DEFAULT_REPETITION_LIMIT),
+                 batch_timeout: float = DEFAULT_BATCH_TIMEOUT):
+        super().__init__(player_specs, schedule, matches_per_matchup, rounds_per_match, workers, seed,
+                         time_budget=time_budget, draw_stacking_rule=draw_stacking_rule, round_limits=round_limits)
+        self._batch_timeout = batch_timeout
+        # The names the bots give themselves, which the other seats see as in a Tournament
+        self._player_names = [load_player_class(player_spec)().get_player_name() for player_spec in player_specs]
+        self._crash_count = 0
+
+    @property
+    def crash_count(self) -> int:
+        # Workers the host had to start again during the last run
+        return self._crash_count
+
+    def run(self) -> TournamentResult:
+        result = TournamentResult(self._player_specs)
+        matches = self.__get_matches()
+        with PlayerHost(self._workers, self._batch_timeout) as host:
+            match_results = asyncio.run(self.__play_matches(host, matches))
+            self._crash_count = host.crash_count
+        for (matchup, seating, match_seed), match_result in zip(matches, match_results):
+            result.add_match(matchup, seating, match_result)
+        return result
+
+    def __get_matches(self) -> List[Tuple[Tuple[int, ...], List[int], int]]:
+        # (matchup, seating, seed) of every match, seated and seeded as in a Tournament
+        matches = []
+        for matchup_index, matchup in enumerate(self._schedule):
+            for match_index in range(self._matches_per_matchup):
+                rotation = match_index % len(matchup)
+                seating = list(matchup[rotation:] + matchup[:rotation])
+                matches.append((matchup, seating, GameEngineHelper.derive_seed(self._seed, matchup_index,
+                                                                                match_index)))
+        return matches
+
+    async def __play_matches(self, host: PlayerHost, matches) -> List[MatchResult]:
+        semaphore = asyncio.Semaphore(MAX_OPEN_MATCHES)
+        return await asyncio.gather(*(self.__play_match(host, semaphore, seating, match_seed)
+                                      for matchup, seating, match_seed in matches))
+
+    async def __play_match(self, host: PlayerHost, semaphore: asyncio.Semaphore, seating: List[int],
+                           match_seed: int) -> MatchResult:
+        async with semaphore:
+            players = [host.create_player(self._player_specs[player_index], self._player_names[player_index])
+                       for player_index in seating]
+            try:
+                game_engine = AsyncGameEngine(players, self._rounds_per_match, seed=match_seed,
+                                              time_budget=self._time_budget,
+                                              draw_stacking_rule=self._draw_stacking_rule,
+                                              round_limits=self._round_limits)
+                await game_engine.start_async()
+                return game_engine.get_match_result()
+            finally:
+                for player in players:
+                    player.close()
@@ -0,0 +1,83 @@
+"""
+RatingLadder rates players on the Elo scale from the results of the matches
+between them, two players at a time. Ratings are a Bradley-Terry fit of
+every result so far, so they do not depend on the order the matches were
+played in: each player gets a strength, and a player's expected score
+against another is their share of the two strengths. A draw counts as half
+a win for both. Every player also plays one virtual draw against a player
+rated 0, which keeps the rating of a player who never won (or never lost)
+finite and pulls players with few matches towards the middle.
+
+The confidence interval of a rating comes from how many matches the player
+played and how close they were: about 1.96 standard errors either way,
+leaving out the uncertainty of the opponents' ratings.
+"""
+from math import log, sqrt
+from typing import List, Tuple
+
+ELO_PER_NATURAL_LOG: float = 400.0 / log(10.0)
+CONFIDENCE_Z: float = 1.96
+MAX_ITERATIONS: int = 1000
+TOLERANCE: float = 1e-9
+
+
+class RatingLadder:
+    def __init__(self, player_names: List[str]):
+        self._player_names = list(player_names)
+        player_count = len(self._player_names)
+        # Points (wins plus half the draws) scored by each player against each other player
+        self._points = [[0.0] * player_count for n in range(player_count)]
+        self._match_counts = [[0] * player_count for n in range(player_count)]
+
+    def add_results(self, first_index: int, second_index: int, first_wins: int, second_wins: int, draws: int = 0):
+        self._points[first_index][second_index] += first_wins + 0.5 * draws
+        self._points[second_index][first_index] += second_wins + 0.5 * draws
+        match_count = first_wins + second_wins + draws
+        self._match_counts[first_index][second_index] += match_count
+        self._match_counts[second_index][first_index] += match_count
+
+    def get_match_count(self, player_index: int) -> int:
+        return sum(self._match_counts[player_index])
+
+    def get_ratings(self) -> List[Tuple[float, float]]:
+        # (Elo rating, half width of its 95% confidence interval) of every player
+        player_count = len(self._player_names)
+        # The virtual draw against a player of strength 1 is half a point out of one match
+        points = [sum(self._points[index]) + 0.5 for index in range(player_count)]
+        strengths = [1.0] * player_count
+        for iteration in range(MAX_ITERATIONS):
+            largest_change = 0.0
+            for index in range(player_count):
+                strength = strengths[index]
+                expected_matches = 1.0 / (strength + 1.0)
+                for other_index, match_count in enumerate(self._match_counts[index]):
+                    if match_count:
+                        expected_matches += match_count / (strength + strengths[other_index])
+                new_strength = points[index] / expected_matches
+                largest_change = max(largest_change, abs(log(new_strength / strength)))
+                strengths[index] = new_strength
+            if largest_change < TOLERANCE:
+                break
+
+        ratings = []
+        for index in range(player_count):
+            strength = strengths[index]
+            information = strength / (strength + 1.0) ** 2
+            for other_index, match_count in enumerate(self._match_counts[index]):
+                if match_count:
+                    other_strength = strengths[other_index]
+                    information += match_count * strength * other_strength / (strength + other_strength) ** 2
+            ratings.append((ELO_PER_NATURAL_LOG * log(strength),
+                            CONFIDENCE_Z * ELO_PER_NATURAL_LOG / sqrt(information)))
+        return ratings
+
+    def get_leaderboard_text(self) -> str:
+        ratings = self.get_ratings()
+        lines = ['{:<5} {:<45} {:>8} {:>17} {:>9}'.format('rank', 'player', 'elo', '95% interval', 'matches')]
+        order = sorted(range(len(ratings)), key=lambda index: ratings[index][0], reverse=True)
+        for rank, index in enumerate(order, 1):
+            rating, interval = ratings[index]
+            lines.append('{:<5} {:<45} {:>8.0f} {:>8.0f} - {:<6.0f} {:>9}'.format(
+                rank, self._player_names[index], rating, rating - interval, rating + interval,
+                self.get_match_count(index)))
+        return '\n'.join(lines)
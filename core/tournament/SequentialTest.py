@@ -0,0 +1,79 @@
+"""
+SequentialTest decides which of two players is stronger as the matches
+between them come in, with as few matches as the results allow: a
+sequential probability ratio test (SPRT). It weighs "the first player
+scores 0.5 + delta per match" against "the first player scores 0.5 - delta",
+where delta is the score difference of elo_margin Elo points. Every match
+adds to the log likelihood ratio (a win counts 1, a draw 0.5), and the test
+stops once it crosses a bound: the upper one picks the first player, the
+lower one the second. alpha and beta are the chances of picking the weaker
+player when the real difference is elo_margin or more. The first bound
+crossed decides the test for good: results added after that still count
+in match_count and llr, but no longer change stronger_index.
+
+Two players closer than elo_margin can take many matches to tell apart, so
+a tournament also caps the matches of every pairing.
+"""
+from math import log
+
+DEFAULT_ELO_MARGIN: float = 50.0
+DEFAULT_ALPHA: float = 0.05
+DEFAULT_BETA: float = 0.05
+
+
+def get_elo_score(elo_difference: float) -> float:
+    # Expected score of a player that is elo_difference points stronger
+    return 1.0 / (1.0 + 10.0 ** (-elo_difference / 400.0))
+
+
+class SequentialTest:
+    def __init__(self, elo_margin: float = DEFAULT_ELO_MARGIN, alpha: float = DEFAULT_ALPHA,
+                 beta: float = DEFAULT_BETA):
+        if elo_margin <= 0:
+            raise ValueError('The Elo margin has to be above 0, not {}'.format(elo_margin))
+        stronger_score = get_elo_score(elo_margin)
+        weaker_score = 1.0 - stronger_score
+        # What a point and a point lost add to the log likelihood ratio
+        self._score_weight = log(stronger_score / weaker_score)
+        self._loss_weight = log(weaker_score / stronger_score)
+        self._upper_bound = log((1.0 - beta) / alpha)
+        self._lower_bound = log(beta / (1.0 - alpha))
+        self._llr = 0.0
+        self._match_count = 0
+        # Set once the llr first crosses a bound
+        self._stronger_index: int = None
+
+    def add_results(self, first_wins: int, second_wins: int, draws: int = 0):
+        first_score = first_wins + 0.5 * draws
+        second_score = second_wins + 0.5 * draws
+        self._llr += first_score * self._score_weight + second_score * self._loss_weight
+        self._match_count += first_wins + second_wins + draws
+        if self._stronger_index is None:
+            if self._llr >= self._upper_bound:
+                self._stronger_index = 0
+            elif self._llr <= self._lower_bound:
+                self._stronger_index = 1
+
+    @property
+    def llr(self) -> float:
+        return self._llr
+
+    @property
+    def match_count(self) -> int:
+        return self._match_count
+
+    @property
+    def is_decided(self) -> bool:
+        return self._stronger_index is not None
+
+    @property
+    def stronger_index(self) -> int:
+        # 0 for the first player, 1 for the second, None until the test is decided
+        return self._stronger_index
+
+    def get_uncertainty(self) -> float:
+        # 1 with no evidence either way, 0 once a bound is reached
+        if self._stronger_index is not None:
+            return 0.0
+        bound = self._upper_bound if self._llr >= 0 else -self._lower_bound
+        return max(0.0, 1.0 - abs(self._llr) / bound)
@@ -0,0 +1,192 @@
+"""
+Tournament plays many headless matches between bots and adds up the results.
+Every matchup of the schedule is split into chunks of matches, and the chunks
+are spread over a pool of worker processes. Every match gets its own seed,
+derived from the tournament seed, its matchup and its number, so a tournament
+plays out exactly the same no matter how many workers there are or which
+worker ends up running which chunk. Workers only send back a
+TournamentResult with the totals of their chunk.
+
+Players are given as 'module:Class' strings, e.g. players.RandomPlayer:RandomPlayer,
+and are created fresh in the worker for every match.
+
+Rounds that go on for too long end as a draw on the round_limits, by default
+a turn cap and a repetition limit, so bots stuck in a loop cannot hold up a
+worker.
+
+With a replay_dir, every chunk of matches is recorded to its own replay file
+in that directory, with the player specs as the names of the seats.
+
+A duplicate tournament takes the luck of the cards out of the results: it
+plays deals (see DealGenerator) instead of matches, and every deal once for
+every rotation of the seats, so every player of the matchup gets to play
+every seat's cards. matches_per_matchup and chunk_size then count deals, and
+every matchup plays the same deals. Results are also scored per deal, see
+TournamentResult. Decks of a deal are not shuffled by the engine, so a
+duplicate tournament cannot be recorded.
+"""
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from core.game.Deal import Deal
+from core.game.DealGenerator import DealGenerator
+from core.game.DrawStackingRule import DrawStackingRule
+from core.game.EngineProfiler import EngineProfiler
+from core.game.GameEngine import GameEngine
+from core.game.GameEngineHelper import GameEngineHelper
+from core.game.MatchResult import MatchResult
+from core.game.RoundLimits import RoundLimits, DEFAULT_MAX_TURNS, DEFAULT_REPETITION_LIMIT
+from core.game.TimeBudget import TimeBudget
+from core.replay.ReplayRecorder import ReplayRecorder
+from core.replay.ReplayWriter import ReplayWriter
+from core.tournament.TournamentResult import TournamentResult
+from itertools import combinations
+from typing import Dict, List, Tuple
+import importlib
+import os
+import random
+
+DEFAULT_CHUNK_SIZE: int = 100
+
+# One DealGenerator per tournament seed and round count in every worker, chunks of other matchups on the same
+# deals find them already shuffled. Only the generators of the last few tournaments are kept, and run() lets go
+# of them when it played the chunks in its own process.
+MAX_DEAL_GENERATORS: int = 4
+_deal_generators: Dict[Tuple[int, int], DealGenerator] = OrderedDict()
+
+
+def load_player_class(player_spec: str):
+    module_name, _, class_name = player_spec.partition(':')
+    if not module_name or not class_name:
+        raise ValueError('Player "{}" should look like module:Class, e.g. players.RandomPlayer:RandomPlayer'
+                         .format(player_spec))
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_round_robin_schedule(player_count: int, players_per_match: int = 2) -> List[Tuple[int, ...]]:
+    return list(combinations(range(player_count), players_per_match))
+
+
+def _get_deal_generator(seed: int, rounds_per_match: int) -> DealGenerator:
+    key = (seed, rounds_per_match)
+    deal_generator = _deal_generators.get(key)
+    if deal_generator is not None:
+        _deal_generators.move_to_end(key)
+        return deal_generator
+    if len(_deal_generators) >= MAX_DEAL_GENERATORS:
+        _deal_generators.popitem(last=False)
+    deal_generator = _deal_generators[key] = DealGenerator(seed, rounds_per_match)
+    return deal_generator
+
+
+def _play_matches(task) -> TournamentResult:
+    player_specs, matchup, matchup_index, first_match_index, match_count, rounds_per_match, seed, profile, \
+        time_budget, replay_dir, draw_stacking_rule, round_limits, duplicate = task
+    player_classes = {player_index: load_player_class(player_specs[player_index]) for player_index in matchup}
+    result = TournamentResult(player_specs)
+    profiler = None
+    if profile:
+        profiler = result.profiler = EngineProfiler()
+    replay_writer = None
+    replay_recorder = None
+    if replay_dir is not None:
+        replay_writer = ReplayWriter(os.path.join(replay_dir, get_replay_file_name(matchup_index, first_match_index)))
+        replay_recorder = ReplayRecorder(replay_writer)
+
+    def play_match(seating: List[int], match_seed: int, deal: Deal = None) -> MatchResult:
+        players = [player_classes[player_index]() for player_index in seating]
+        if profiler is not None:
+            profiler.set_player_keys([player_specs[player_index] for player_index in seating])
+        if replay_recorder is not None:
+            replay_recorder.set_player_names([player_specs[player_index] for player_index in seating])
+        game_engine = GameEngine(players, rounds_per_match, seed=match_seed, profiler=profiler,
+                                 time_budget=time_budget, replay_recorder=replay_recorder,
+                                 draw_stacking_rule=draw_stacking_rule, round_limits=round_limits, deal=deal)
+        game_engine.start()
+        match_result = game_engine.get_match_result()
+        result.add_match(matchup, seating, match_result)
+        return match_result
+
+    if duplicate:
+        deal_generator = _get_deal_generator(seed, rounds_per_match)
+        for deal_index in range(first_match_index, first_match_index + match_count):
+            deal = deal_generator.get_deal(deal_index)
+            # Every rotation of the seats plays the same deal
+            seatings = [list(matchup[rotation:] + matchup[:rotation]) for rotation in range(len(matchup))]
+            match_results = [play_match(seating, deal.seed, deal) for seating in seatings]
+            result.add_deal(matchup, match_results, seatings)
+    else:
+        for match_index in range(first_match_index, first_match_index + match_count):
+            # Rotate the seats so every player gets to play first as often
+            rotation = match_index % len(matchup)
+            seating = list(matchup[rotation:] + matchup[:rotation])
+            play_match(seating, GameEngineHelper.derive_seed(seed, matchup_index, match_index))
+    if replay_writer is not None:
+        replay_writer.close()
+    return result
+
+
+def get_replay_file_name(matchup_index: int, first_match_index: int) -> str:
+    return '{:04d}-{:08d}.replay'.format(matchup_index, first_match_index)
+
+
+class Tournament:
+    def __init__(self, player_specs: List[str], schedule: List[Tuple[int, ...]], matches_per_matchup: int,
+                 rounds_per_match: int = 3, workers: int = 1, seed: int = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, profile: bool = False, time_budget: TimeBudget = None,
+                 replay_dir: str = None, draw_stacking_rule: DrawStackingRule = DrawStackingRule.SAME_TYPE,
+                 round_limits: RoundLimits = RoundLimits(DEFAULT_MAX_TURNS, DEFAULT_REPETITION_LIMIT),
+                 duplicate: bool = False):
+        if duplicate and replay_dir is not None:
+            raise ValueError('A duplicate tournament cannot be recorded, its matches are played on dealt decks')
+        for player_spec in player_specs:
+            load_player_class(player_spec)
+        self._player_specs = list(player_specs)
+        self._schedule = [tuple(matchup) for matchup in schedule]
+        self._matches_per_matchup = matches_per_matchup
+        self._rounds_per_match = rounds_per_match
+        self._workers = max(1, workers)
+        self._seed = seed if seed is not None else random.getrandbits(32)
+        self._chunk_size = max(1, chunk_size)
+        self._profile = profile
+        # Workers run matches on their main thread, so a hard deadline can interrupt a bot there
+        self._time_budget = time_budget
+        self._replay_dir = replay_dir
+        self._draw_stacking_rule = draw_stacking_rule
+        self._round_limits = round_limits
+        self._duplicate = duplicate
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    def _create_task(self, matchup_index: int, first_match_index: int, match_count: int):
+        # A chunk of matches of one matchup, played by _play_matches in a worker
+        return (self._player_specs, self._schedule[matchup_index], matchup_index, first_match_index, match_count,
+                self._rounds_per_match, self._seed, self._profile, self._time_budget, self._replay_dir,
+                self._draw_stacking_rule, self._round_limits, self._duplicate)
+
+    def __create_tasks(self):
+        tasks = []
+        for matchup_index in range(len(self._schedule)):
+            for first_match_index in range(0, self._matches_per_matchup, self._chunk_size):
+                match_count = min(self._chunk_size, self._matches_per_matchup - first_match_index)
+                tasks.append(self._create_task(matchup_index, first_match_index, match_count))
+        return tasks
+
+    def run(self) -> TournamentResult:
+        result = TournamentResult(self._player_specs)
+        tasks = self.__create_tasks()
+        if self._replay_dir is not None:
+            os.makedirs(self._replay_dir, exist_ok=True)
+        if self._workers == 1:
+            try:
+                for task in tasks:
+                    result.merge(_play_matches(task))
+            finally:
+                # The deals are only shared within this run, a worker process takes its own with it
+                _deal_generators.clear()
+            return result
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            for chunk_result in executor.map(_play_matches, tasks):
+                result.merge(chunk_result)
+        return result
@@ -0,0 +1,221 @@
+"""
+TournamentResult adds up the outcome of many matches: matches and rounds
+played, won and drawn by every player, and how many turns the rounds took.
+A round drawn on the RoundLimits is played by everyone and won by no one.
+
+In a duplicate tournament the matches of a deal are also scored together:
+every player's deal score is the share of the deal's matches they won, a
+drawn match counting the same for everyone at the table. Every player of a
+deal had the same luck of the cards, so deal scores vary less than single
+matches, the more so the more the cards decide a match. Worker
+processes each fill their own TournamentResult and only those totals are
+sent back and merged, never anything per turn.
+"""
+from core.game.EngineProfiler import EngineProfiler
+from core.game.MatchResult import MatchResult
+from math import sqrt
+from typing import Dict, List, Tuple
+
+
+class TournamentResult:
+    def __init__(self, player_specs: List[str]):
+        self._player_specs = list(player_specs)
+        player_count = len(self._player_specs)
+        self._matches_played: List[int] = [0] * player_count
+        self._matches_won: List[int] = [0] * player_count
+        self._rounds_played: List[int] = [0] * player_count
+        self._rounds_won: List[int] = [0] * player_count
+        self._rounds_drawn: List[int] = [0] * player_count
+        # Matches where every round was drawn, they have no winner
+        self._matches_drawn: List[int] = [0] * player_count
+        # Only filled in when the matches had a TimeBudget
+        self._time_used: List[float] = [0.0] * player_count
+        self._turns_timed_out: List[int] = [0] * player_count
+        # Matches won by every player of a matchup, keyed by the matchup's player indexes
+        self._matchup_wins: Dict[Tuple[int, ...], Dict[int, int]] = {}
+        # Deals played by every player in a duplicate tournament, with the sum of their deal scores and its squares
+        self._deals_played: List[int] = [0] * player_count
+        self._deal_score_sums: List[float] = [0.0] * player_count
+        self._deal_score_squares: List[float] = [0.0] * player_count
+        self._match_count = 0
+        self._round_count = 0
+        self._turn_count = 0
+        # Only set when the tournament is profiled
+        self._profiler: EngineProfiler = None
+
+    def add_match(self, matchup: Tuple[int, ...], seating: List[int], match_result: MatchResult):
+        # seating[player_id] is the index of the player spec sitting in that seat
+        round_count = len(match_result.round_winner_ids)
+        drawn_round_count = match_result.drawn_round_count
+        for player_index in seating:
+            self._matches_played[player_index] += 1
+            self._rounds_played[player_index] += round_count
+            self._rounds_drawn[player_index] += drawn_round_count
+        for round_winner_id in match_result.round_winner_ids:
+            if round_winner_id is not None:
+                self._rounds_won[seating[round_winner_id]] += 1
+        if match_result.player_time_used is not None:
+            for player_id, player_index in enumerate(seating):
+                self._time_used[player_index] += match_result.player_time_used[player_id]
+                self._turns_timed_out[player_index] += match_result.player_timeout_counts[player_id]
+        matchup_wins = self._matchup_wins.setdefault(matchup, {player_index: 0 for player_index in matchup})
+        if match_result.winner_id is not None:
+            winner_index = seating[match_result.winner_id]
+            self._matches_won[winner_index] += 1
+            matchup_wins[winner_index] += 1
+        else:
+            for player_index in seating:
+                self._matches_drawn[player_index] += 1
+        self._match_count += 1
+        self._round_count += round_count
+        self._turn_count += match_result.turn_count
+
+    def add_deal(self, matchup: Tuple[int, ...], match_results: List[MatchResult], seatings: List[List[int]]):
+        # Every match of one deal, already added with add_match, seatings[n] being the seating of match_results[n]
+        deal_scores = {player_index: 0.0 for player_index in matchup}
+        for match_result, seating in zip(match_results, seatings):
+            if match_result.winner_id is not None:
+                deal_scores[seating[match_result.winner_id]] += 1.0
+            else:
+                for player_index in seating:
+                    deal_scores[player_index] += 1.0 / len(seating)
+        for player_index, deal_score in deal_scores.items():
+            deal_score /= len(match_results)
+            self._deals_played[player_index] += 1
+            self._deal_score_sums[player_index] += deal_score
+            self._deal_score_squares[player_index] += deal_score * deal_score
+
+    def merge(self, other: 'TournamentResult'):
+        for player_index in range(len(self._player_specs)):
+            self._matches_played[player_index] += other._matches_played[player_index]
+            self._matches_won[player_index] += other._matches_won[player_index]
+            self._rounds_played[player_index] += other._rounds_played[player_index]
+            self._rounds_won[player_index] += other._rounds_won[player_index]
+            self._rounds_drawn[player_index] += other._rounds_drawn[player_index]
+            self._matches_drawn[player_index] += other._matches_drawn[player_index]
+            self._time_used[player_index] += other._time_used[player_index]
+            self._turns_timed_out[player_index] += other._turns_timed_out[player_index]
+            self._deals_played[player_index] += other._deals_played[player_index]
+            self._deal_score_sums[player_index] += other._deal_score_sums[player_index]
+            self._deal_score_squares[player_index] += other._deal_score_squares[player_index]
+        for matchup, other_wins in other._matchup_wins.items():
+            matchup_wins = self._matchup_wins.setdefault(matchup, {player_index: 0 for player_index in matchup})
+            for player_index, wins in other_wins.items():
+                matchup_wins[player_index] += wins
+        self._match_count += other._match_count
+        self._round_count += other._round_count
+        self._turn_count += other._turn_count
+        if other._profiler is not None:
+            if self._profiler is None:
+                self._profiler = EngineProfiler()
+            self._profiler.merge(other._profiler)
+
+    @property
+    def player_specs(self) -> List[str]:
+        return self._player_specs
+
+    @property
+    def matches_played(self) -> List[int]:
+        return self._matches_played
+
+    @property
+    def matches_won(self) -> List[int]:
+        return self._matches_won
+
+    @property
+    def rounds_played(self) -> List[int]:
+        return self._rounds_played
+
+    @property
+    def rounds_won(self) -> List[int]:
+        return self._rounds_won
+
+    @property
+    def rounds_drawn(self) -> List[int]:
+        return self._rounds_drawn
+
+    @property
+    def matches_drawn(self) -> List[int]:
+        return self._matches_drawn
+
+    @property
+    def time_used(self) -> List[float]:
+        return self._time_used
+
+    @property
+    def turns_timed_out(self) -> List[int]:
+        return self._turns_timed_out
+
+    @property
+    def deals_played(self) -> List[int]:
+        return self._deals_played
+
+    def get_deal_score(self, player_index: int) -> float:
+        # Average deal score, 0 when the player played no deal
+        deals_played = self._deals_played[player_index]
+        return self._deal_score_sums[player_index] / deals_played if deals_played else 0.0
+
+    def get_deal_score_error(self, player_index: int) -> float:
+        # Standard error of the average deal score
+        deals_played = self._deals_played[player_index]
+        if deals_played < 2:
+            return 0.0
+        average = self._deal_score_sums[player_index] / deals_played
+        variance = max(0.0, self._deal_score_squares[player_index] / deals_played - average * average)
+        return sqrt(variance / (deals_played - 1))
+
+    @property
+    def matchup_wins(self) -> Dict[Tuple[int, ...], Dict[int, int]]:
+        return self._matchup_wins
+
+    @property
+    def profiler(self) -> EngineProfiler:
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, value: EngineProfiler):
+        self._profiler = value
+
+    @property
+    def match_count(self) -> int:
+        return self._match_count
+
+    @property
+    def round_count(self) -> int:
+        return self._round_count
+
+    @property
+    def turn_count(self) -> int:
+        return self._turn_count
+
+    def get_average_game_length(self) -> float:
+        # Average turns per round
+        return self._turn_count / self._round_count if self._round_count else 0.0
+
+    def get_summary_text(self) -> str:
+        lines = ['{:<45} {:>9} {:>9} {:>7} {:>9} {:>9}'.format('player', 'matches', 'won', 'win %', 'rounds', 'won')]
+        for player_index, player_spec in enumerate(self._player_specs):
+            matches_played = self._matches_played[player_index]
+            win_rate = 100.0 * self._matches_won[player_index] / matches_played if matches_played else 0.0
+            lines.append('{:<45} {:>9} {:>9} {:>6.1f}% {:>9} {:>9}'.format(
+                player_spec, matches_played, self._matches_won[player_index], win_rate,
+                self._rounds_played[player_index], self._rounds_won[player_index]))
+        if any(self._rounds_drawn):
+            lines.append('{:<45} {:>12} {:>12}'.format('player', 'rounds drawn', 'matches drawn'))
+            for player_index, player_spec in enumerate(self._player_specs):
+                lines.append('{:<45} {:>12} {:>12}'.format(player_spec, self._rounds_drawn[player_index],
+                                                          self._matches_drawn[player_index]))
+        if any(self._time_used):
+            lines.append('{:<45} {:>12} {:>12}'.format('player', 'thinking s', 'timed out'))
+            for player_index, player_spec in enumerate(self._player_specs):
+                lines.append('{:<45} {:>12.3f} {:>12}'.format(player_spec, self._time_used[player_index],
+                                                             self._turns_timed_out[player_index]))
+        if any(self._deals_played):
+            lines.append('{:<45} {:>9} {:>12} {:>12}'.format('player', 'deals', 'deal score', 'std error'))
+            for player_index, player_spec in enumerate(self._player_specs):
+                lines.append('{:<45} {:>9} {:>11.1f}% {:>11.1f}%'.format(
+                    player_spec, self._deals_played[player_index], 100.0 * self.get_deal_score(player_index),
+                    100.0 * self.get_deal_score_error(player_index)))
+        lines.append('{} matches, {} rounds, {} turns, {:.1f} turns per round on average'.format(
+            self._match_count, self._round_count, self._turn_count, self.get_average_game_length()))
+        return '\n'.join(lines)
@@ -0,0 +1,59 @@
+# File For Hard Player
+"""
+The Player class is an implementation of the IPlayer class. This class
+represents an AI that looks ahead: for every card it could play it guesses
+the cards it cannot see, plays the round out at random and keeps the card
+that won the most often. See players/HardPlayer.py for a faster version
+with a time budget and a worker pool.
+"""
+from core.game.IPlayer import IPlayer
+from core.game.CardAction import CardAction
+from core.game.ActionType import ActionType
+from core.game.ColorType import ColorType
+from core.game.CardType import CardType
+
+ROLLOUT_COUNT: int = 100
+MAX_ROLLOUT_TURNS: int = 500
+
+
+class Player(IPlayer):
+    """
+    Player's class implemented version of get_player_name.
+    Change the name returned in this method to name your AI.
+    """
+    def get_player_name(self) -> str:
+        return 'Hard AI'
+
+    """
+    Player's class implemented version of take_turn.
+    This the CardAction returned here is used by the game engine to
+    play your AIs card against your opponents. Modify this method
+    as much as necessary to create the logic for your AI.
+    """
+    def take_turn(self) -> CardAction:
+        valid_hand = self.get_game_helper().get_valid_hand()
+        if len(valid_hand) == 0:
+            return CardAction(ActionType.SKIP)
+
+        # A copy of the game as this player sees it, the other hands and the deck are hidden
+        game_state = self.get_game_helper().get_game_state()
+        actions = []
+        for card in valid_hand:
+            if card.card_type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
+                actions.append(CardAction(ActionType.PLAY, card, self.get_random().choice(
+                    [ColorType.BLUE, ColorType.GREEN, ColorType.RED, ColorType.YELLOW])))
+            else:
+                actions.append(CardAction(ActionType.PLAY, card))
+
+        wins = [0] * len(actions)
+        for n in range(ROLLOUT_COUNT):
+            index = n % len(actions)
+            # Guess the hidden cards, then play the card and finish the round with random legal moves
+            state = game_state.get_sampled_state(self.get_random()).step(actions[index], self.get_random())
+            turn_count = 0
+            while not state.is_over and turn_count < MAX_ROLLOUT_TURNS:
+                state.apply(self.get_random().choice(state.get_legal_actions()), self.get_random())
+                turn_count += 1
+            if state.winner == game_state.viewer:
+                wins[index] += 1
+        return actions[wins.index(max(wins))]
@@ -1,4 +1,5 @@
 from core.game.GameEngine import GameEngine
+from core.game.ConsoleEventSink import ConsoleEventSink
 from Player import Player
 # from players.EasyPlayer import Player as EasyPlayer
 # from players.HardPlayer import Player as HardPlayer
@@ -12,5 +13,5 @@ rounds = 3
 # Rounds can't be even, we don't want ties
 if rounds % 2 == 0:
     rounds += 1
-game_engine = GameEngine(players, rounds)
+game_engine = GameEngine(players, rounds, [ConsoleEventSink()])
 game_engine.start()
@@ -0,0 +1,194 @@
+# File For Hard Player
+"""
+The Hard AI searches ahead. It cannot see the other hands or the order of
+the deck, so for every rollout it guesses them: the cards it has not seen
+are dealt at random into the other hands and the deck (see
+GameState.get_sampled_state). From that guess every card it could play is
+tried and the rest of the round is played out with random legal moves. The
+card that won the most rollouts is played.
+
+Once a round is down to 2 players with at most endgame_hand_size cards each,
+the rollouts are replaced by the EndgameSolver, which searches the rest of
+the round exactly as far as the time allows.
+
+The search stops after rollout_count rollouts or time_budget seconds,
+whichever comes first, and never takes more than half of the time the
+engine has left for the turn. With workers > 1 the rollouts are spread over
+a thread pool, or a process pool with use_processes=True. The pool only
+lives for one search: a player is never told that its match is over, so a
+pool kept for the next turn would never be shut down.
+"""
+from core.game.IPlayer import IPlayer
+from core.game.CardAction import CardAction
+from core.game.ActionType import ActionType
+from core.game.Card import CARD_COLORS, CARD_KIND_COUNT, CARDS_BY_KIND, KIND_COLOR_TYPES, KIND_IS_WILD
+from core.game.GameEngineHelper import GameEngineHelper
+from core.game.GameState import GameState
+from core.search.EndgameSolver import EndgameSolver, ENDGAME_HAND_SIZE
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from random import Random
+from typing import List, Tuple
+import time
+
+DEFAULT_ROLLOUT_COUNT: int = 200
+# A round can stall when every card is held, a rollout that runs this long counts as lost
+MAX_ROLLOUT_TURNS: int = 500
+# Share of the time the engine has left for the turn that the search may use
+TIME_REMAINING_SHARE: float = 0.5
+# Seconds the endgame solver gets when the player has no time budget
+ENDGAME_TIME_BUDGET: float = 0.05
+
+SKIP_ACTION = CardAction(ActionType.SKIP)
+# Actions are read only, so rollouts share one per card kind (and per color for a wild)
+PLAY_ACTIONS_BY_KIND = [CardAction(ActionType.PLAY, card) for card in CARDS_BY_KIND]
+WILD_ACTIONS_BY_KIND = [[CardAction(ActionType.PLAY, card, color_type) for color_type in CARD_COLORS]
+                        for card in CARDS_BY_KIND]
+
+
+def _get_kinds(mask: int) -> List[int]:
+    kinds = []
+    while mask:
+        lowest_bit = mask & -mask
+        kinds.append(lowest_bit.bit_length() - 1)
+        mask ^= lowest_bit
+    return kinds
+
+
+def _choose_rollout_action(state: GameState, random: Random) -> CardAction:
+    legal_mask = state.get_legal_mask()
+    if not legal_mask:
+        return SKIP_ACTION
+    kinds = _get_kinds(legal_mask)
+    kind = kinds[random.randrange(len(kinds))]
+    if KIND_IS_WILD[kind]:
+        return WILD_ACTIONS_BY_KIND[kind][random.randrange(len(CARD_COLORS))]
+    return PLAY_ACTIONS_BY_KIND[kind]
+
+
+def _is_rollout_won(state: GameState, seat: int, random: Random) -> bool:
+    for n in range(MAX_ROLLOUT_TURNS):
+        if state.winner is not None:
+            return state.winner == seat
+        state.apply(_choose_rollout_action(state, random), random)
+    return state.winner == seat
+
+
+def run_rollouts(view: GameState, actions: List[CardAction], rollout_count: int, seed: int,
+                 time_budget: float = None) -> Tuple[List[int], List[int]]:
+    # Module level so a process pool can run it. Returns the wins and the rollouts of every action.
+    random = Random(seed)
+    seat = view.active_seat
+    wins = [0] * len(actions)
+    rollouts = [0] * len(actions)
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    rollouts_done = 0
+    while rollouts_done < rollout_count:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        # Every action is tried against the same guess, so a lucky guess favours none of them
+        sampled_state = view.get_sampled_state(random)
+        for index, action in enumerate(actions):
+            state = sampled_state.clone()
+            state.apply(action, random)
+            if _is_rollout_won(state, seat, random):
+                wins[index] += 1
+            rollouts[index] += 1
+        rollouts_done += len(actions)
+    return wins, rollouts
+
+
+class Player(IPlayer):
+    def __init__(self, rollout_count: int = DEFAULT_ROLLOUT_COUNT, time_budget: float = None, workers: int = 1,
+                 use_processes: bool = False, endgame_hand_size: int = ENDGAME_HAND_SIZE):
+        super().__init__()
+        self._rollout_count = rollout_count
+        self._time_budget = time_budget
+        self._workers = workers
+        self._use_processes = use_processes
+        # 0 never calls the endgame solver
+        self._endgame_hand_size = endgame_hand_size
+        self._endgame_solver: EndgameSolver = None
+
+    """
+    Player's class implemented version of get_player_name.
+    """
+    def get_player_name(self) -> str:
+        return 'Hard AI'
+
+    """
+    Implementation method of take turn from IPlayer interface. A card is
+    only searched for when there is more than one legal card to play,
+    otherwise the only choice is made right away.
+    """
+    def take_turn(self) -> CardAction:
+        game_helper = self.get_game_helper()
+        view = game_helper.get_game_state()
+        actions = self.__get_candidate_actions(view)
+        if len(actions) == 1:
+            return actions[0]
+
+        time_budget = self._time_budget
+        time_remaining = game_helper.get_time_remaining()
+        if time_remaining is not None:
+            time_budget = min(time_budget or time_remaining, time_remaining * TIME_REMAINING_SHARE)
+        if self._endgame_hand_size and EndgameSolver.can_solve(view, self._endgame_hand_size):
+            if self._endgame_solver is None:
+                # Kept for the whole match, so the next turns find their positions in its table
+                self._endgame_solver = EndgameSolver()
+            action, win_probability = self._endgame_solver.solve(view, time_budget or ENDGAME_TIME_BUDGET,
+                                                                 self.get_random())
+            return action
+
+        seed = self.get_random().getrandbits(64)
+        if self._workers <= 1:
+            wins, rollouts = run_rollouts(view, actions, self._rollout_count, seed, time_budget)
+        else:
+            wins, rollouts = self.__run_pooled_rollouts(view, actions, seed, time_budget)
+
+        # Without a single rollout the first candidate is played, see __get_candidate_actions
+        best_index = 0
+        best_win_rate = -1.0
+        for index in range(len(actions)):
+            if rollouts[index] > 0 and wins[index] / rollouts[index] > best_win_rate:
+                best_index = index
+                best_win_rate = wins[index] / rollouts[index]
+        return actions[best_index]
+
+    """
+    get_endgame_solver is the solver used for the endgames of the match so
+    far, e.g. for its get_stats(), or None when it was never needed.
+    """
+    def get_endgame_solver(self) -> EndgameSolver:
+        return self._endgame_solver
+
+    def __get_candidate_actions(self, view: GameState) -> List[CardAction]:
+        # One action per legal card, colored cards first and wilds last, a wild gets the color held the most
+        legal_kinds = _get_kinds(view.get_legal_mask())
+        if not legal_kinds:
+            return [SKIP_ACTION]
+        hand_counts = view.get_hand_counts(view.active_seat)
+        color_counts = [0] * len(CARD_COLORS)
+        for kind in range(CARD_KIND_COUNT):
+            if hand_counts[kind] and not KIND_IS_WILD[kind]:
+                color_counts[CARD_COLORS.index(KIND_COLOR_TYPES[kind])] += hand_counts[kind]
+        color_index = color_counts.index(max(color_counts))
+        actions = [PLAY_ACTIONS_BY_KIND[kind] for kind in legal_kinds if not KIND_IS_WILD[kind]]
+        actions.extend(WILD_ACTIONS_BY_KIND[kind][color_index] for kind in legal_kinds if KIND_IS_WILD[kind])
+        return actions
+
+    def __run_pooled_rollouts(self, view: GameState, actions: List[CardAction], seed: int,
+                              time_budget: float) -> Tuple[List[int], List[int]]:
+        executor_class = ProcessPoolExecutor if self._use_processes else ThreadPoolExecutor
+        rollouts_per_worker = -(-self._rollout_count // self._workers)
+        with executor_class(self._workers) as executor:
+            futures = [executor.submit(run_rollouts, view, actions, rollouts_per_worker,
+                                       GameEngineHelper.derive_seed(seed, worker), time_budget)
+                       for worker in range(self._workers)]
+            worker_results = [future.result() for future in futures]
+        wins = [0] * len(actions)
+        rollouts = [0] * len(actions)
+        for worker_wins, worker_rollouts in worker_results:
+            for index in range(len(actions)):
+                wins[index] += worker_wins[index]
+                rollouts[index] += worker_rollouts[index]
+        return wins, rollouts
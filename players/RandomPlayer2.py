@@ -1,5 +1,4 @@
 # File for Random Player
-import random
 from core.game.IPlayer import IPlayer
 from core.game.CardAction import CardAction
 from core.game.ActionType import ActionType
@@ -18,33 +17,25 @@ class RandomPlayer2(IPlayer):
 
     """
     Implementation method of take turn from IPlayer interface. This will
-    get the last card played and the player's hand and randomly select
-    a card based on color then value and finally it will play a wild
-    card if one is available otherwise it will skip.
+    get the valid cards of the player's hand and randomly select a card
+    based on color, then a wild card and finally on value, otherwise
+    it will skip.
     """
     def take_turn(self) -> CardAction:
-        last_card_played = self.get_game_helper().get_last_card_played()
-        my_hand = self.get_game_helper().get_hand()
-        matched_cards_on_color = []
-        wild_cards = []
-        if last_card_played.card_type not in [CardType.DRAW_TWO, CardType.REVERSE, CardType.SKIP,
-                              CardType.WILD, CardType.WILD_DRAW_FOUR]:
-            matched_cards_on_color = [c for c in my_hand if c.color_type == last_card_played.color_type]
-        matched_cards_on_value = [c for c in my_hand if c.card_type == last_card_played.card_type]
-        matched_cards_on_value_and_color = [c for c in matched_cards_on_value if c.color_type == last_card_played.color_type]
-        if last_card_played.card_type not in [CardType.DRAW_TWO, CardType.WILD_DRAW_FOUR]:
-            wild_cards = [c for c in my_hand if c.card_type == CardType.WILD or c.card_type == CardType.WILD_DRAW_FOUR]
+        current_color = self.get_game_helper().get_current_color()
+        valid_hand = self.get_game_helper().get_valid_hand()
+        matched_cards_on_color = [c for c in valid_hand if c.color_type == current_color]
+        wild_cards = [c for c in valid_hand if c.card_type == CardType.WILD or c.card_type == CardType.WILD_DRAW_FOUR]
         if len(matched_cards_on_color) > 0:
-            return CardAction(ActionType.PLAY, random.choice(matched_cards_on_color))
+            return CardAction(ActionType.PLAY, self.get_random().choice(matched_cards_on_color))
         elif len(wild_cards) > 0:
-            random_wild_card: Card = random.choice(wild_cards)
-            # Set random color for the wild card
-            random_wild_card.color_type = random.choice(
-                [ColorType.BLUE, ColorType.GREEN, ColorType.RED, ColorType.YELLOW])
-            return CardAction(ActionType.PLAY, random_wild_card)
-        elif len(matched_cards_on_value_and_color) > 0:
-
-            return CardAction(ActionType.PLAY, random.choice(matched_cards_on_value_and_color))
-
+            random_wild_card: Card = self.get_random().choice(wild_cards)
+            # Pick a random color for the wild card
+            random_color = self.get_random().choice([ColorType.BLUE, ColorType.GREEN, ColorType.RED,
+                                                     ColorType.YELLOW])
+            return CardAction(ActionType.PLAY, random_wild_card, random_color)
+        elif len(valid_hand) > 0:
+            # Whatever is left matched on value
+            return CardAction(ActionType.PLAY, self.get_random().choice(valid_hand))
         else:
-            return CardAction(ActionType.SKIP)
\ No newline at end of file
+            return CardAction(ActionType.SKIP)
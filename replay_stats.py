@@ -0,0 +1,28 @@
+"""
+Prints statistics over replay files, e.g. the ones written by
+    python tournament.py ... --replay-dir replays
+with
+    python replay_stats.py replays/*.replay --workers 4
+"""
+from core.replay.ReplayAnalytics import DEFAULT_CHUNK_SIZE, analyze_files
+import argparse
+import os
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Statistics over recorded games.')
+    parser.add_argument('replays', nargs='+', help='replay files, every file is analyzed by one worker')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='worker processes')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='games read into memory at once')
+    args = parser.parse_args()
+
+    start_time = time.time()
+    stats = analyze_files(args.replays, args.workers, args.chunk_size)
+    elapsed_time = time.time() - start_time
+    print(stats.get_summary_text())
+    print('{:.1f}s, {:.0f} games/s'.format(elapsed_time, stats.game_count / elapsed_time if elapsed_time else 0))
+
+
+if __name__ == '__main__':
+    main()
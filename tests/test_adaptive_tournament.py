@@ -0,0 +1,37 @@
+from core.tournament.AdaptiveTournament import AdaptiveTournament
+from core.tournament.SequentialTest import SequentialTest
+import unittest
+
+PLAYER_SPECS = ['players.RandomPlayer:RandomPlayer', 'players.MediumPlayer:Player']
+
+
+class AdaptiveTournamentTest(unittest.TestCase):
+    def test_a_clear_matchup_stops_early_and_every_count_agrees(self):
+        tournament = AdaptiveTournament(PLAYER_SPECS, [(0, 1)], 200, seed=4)
+        result = tournament.run()
+        sequential_test = tournament.sequential_tests[0]
+        self.assertTrue(sequential_test.is_decided)
+        self.assertGreater(tournament.games_saved, 0)
+        self.assertEqual(200 - tournament.games_saved, sequential_test.match_count)
+        self.assertEqual(sequential_test.match_count, result.match_count)
+        self.assertEqual(result.match_count, tournament.ladder.get_match_count(0))
+
+    def test_workers_do_not_change_the_result(self):
+        results = []
+        for workers in (1, 2):
+            tournament = AdaptiveTournament(PLAYER_SPECS, [(0, 1)], 200, workers=workers, seed=4)
+            results.append((tournament.run().get_summary_text(), tournament.get_summary_text()))
+        self.assertEqual(results[0], results[1])
+
+    def test_sequential_test_keeps_its_decision_and_every_result(self):
+        sequential_test = SequentialTest()
+        sequential_test.add_results(60, 0)
+        self.assertEqual(0, sequential_test.stronger_index)
+        sequential_test.add_results(0, 200)
+        self.assertEqual(0, sequential_test.stronger_index)
+        self.assertEqual(260, sequential_test.match_count)
+        self.assertEqual(0.0, sequential_test.get_uncertainty())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+from core.game.AsyncGameEngine import AsyncGameEngine
+from core.game.CardAction import CardAction
+from core.game.GameEngine import GameEngine
+from core.game.IAsyncPlayer import IAsyncPlayer
+from core.game.MatchResult import MatchResult
+from core.game.RoundLimits import RoundLimits
+from core.game.TimeBudget import TimeBudget
+from core.tournament.AsyncMatchRunner import AsyncMatchRunner
+from players.EasyPlayer import Player as EasyPlayer
+from players.RandomPlayer import RandomPlayer
+import asyncio
+import threading
+import time
+import unittest
+
+
+class AsyncRandomPlayer(IAsyncPlayer):
+    # Plays as a RandomPlayer, after awaiting delay seconds on every turn
+    def __init__(self, delay: float = 0.0, open_turns: list = None):
+        super().__init__()
+        self._delay = delay
+        # Shared between players: the turns awaited right now, and the most there ever were
+        self._open_turns = open_turns
+
+    def get_player_name(self) -> str:
+        return 'Async Rando'
+
+    async def take_turn(self) -> CardAction:
+        if self._open_turns is not None:
+            self._open_turns[0] += 1
+            self._open_turns[1] = max(self._open_turns[1], self._open_turns[0])
+        try:
+            await asyncio.sleep(self._delay)
+        finally:
+            if self._open_turns is not None:
+                self._open_turns[0] -= 1
+        return RandomPlayer.take_turn(self)
+
+
+class SlowThreadedPlayer(RandomPlayer):
+    # Blocks its thread past the turn time now and then, and notes take_turns that overlap
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._running_count = 0
+        self.turn_count = 0
+        self.max_running_count = 0
+
+    def take_turn(self) -> CardAction:
+        with self._lock:
+            self._running_count += 1
+            self.max_running_count = max(self.max_running_count, self._running_count)
+            self.turn_count += 1
+            turn_count = self.turn_count
+        try:
+            if turn_count % 4 == 1:
+                time.sleep(0.1)
+            return super().take_turn()
+        finally:
+            with self._lock:
+                self._running_count -= 1
+
+
+def _get_result_fields(match_result: MatchResult):
+    return match_result.winner_id, match_result.round_winner_ids, match_result.round_turn_counts
+
+
+class AsyncGameEngineTest(unittest.TestCase):
+    def test_plays_the_same_match_as_the_game_engine(self):
+        for seed in range(10):
+            game_engine = GameEngine([RandomPlayer(), EasyPlayer(), RandomPlayer()], 3, seed=seed)
+            game_engine.start()
+            async_game_engine = AsyncGameEngine([RandomPlayer(), EasyPlayer(), RandomPlayer()], 3, seed=seed)
+            async_game_engine.start()
+            self.assertEqual(_get_result_fields(game_engine.get_match_result()),
+                             _get_result_fields(async_game_engine.get_match_result()))
+
+    def test_an_async_player_awaited_in_its_stead_plays_the_same(self):
+        game_engine = GameEngine([RandomPlayer(), EasyPlayer()], 3, seed=4)
+        game_engine.start()
+        async_game_engine = AsyncGameEngine([AsyncRandomPlayer(), EasyPlayer()], 3, seed=4)
+        async_game_engine.start()
+        self.assertEqual(_get_result_fields(game_engine.get_match_result()),
+                         _get_result_fields(async_game_engine.get_match_result()))
+
+    def test_a_slow_async_player_skips(self):
+        # It draws a card on every turn, the deck may run out before the other player gets rid of their hand
+        game_engine = AsyncGameEngine([AsyncRandomPlayer(0.05), EasyPlayer()], 1, seed=1,
+                                      time_budget=TimeBudget(turn_seconds=0.005), round_limits=RoundLimits(60))
+        game_engine.start()
+        match_result = game_engine.get_match_result()
+        # Every one of its turns is a time out, so it never gets rid of a card and can't win
+        self.assertGreater(match_result.player_timeout_counts[0], 0)
+        self.assertEqual(0, match_result.player_timeout_counts[1])
+        self.assertNotEqual(0, match_result.round_winner_ids[0])
+
+    def test_a_timed_out_thread_is_done_before_the_next_turn(self):
+        slow_player = SlowThreadedPlayer()
+        game_engine = AsyncGameEngine([slow_player, EasyPlayer()], 1, seed=2, sync_players_in_threads=True,
+                                      time_budget=TimeBudget(turn_seconds=0.05), round_limits=RoundLimits(60))
+        game_engine.start()
+        self.assertGreater(game_engine.get_match_result().player_timeout_counts[0], 0)
+        self.assertEqual(1, slow_player.max_running_count)
+
+
+class AsyncMatchRunnerTest(unittest.TestCase):
+    def test_plays_at_most_concurrency_matches_at_once(self):
+        open_turns = [0, 0]
+        game_engines = [AsyncGameEngine([AsyncRandomPlayer(0.001, open_turns), EasyPlayer()], 1, seed=seed)
+                        for seed in range(12)]
+        match_results = AsyncMatchRunner(concurrency=4).run(game_engines)
+        self.assertEqual(12, len(match_results))
+        self.assertNotIn(None, match_results)
+        # Only the async player awaits, so there is one open turn per match in play
+        self.assertEqual(4, open_turns[1])
+
+    def test_cancels_matches_past_the_timeout(self):
+        game_engines = [AsyncGameEngine([AsyncRandomPlayer(60.0), EasyPlayer()], 1, seed=0),
+                        AsyncGameEngine([AsyncRandomPlayer(), EasyPlayer()], 1, seed=1)]
+        match_runner = AsyncMatchRunner(match_timeout=0.2)
+        start = time.perf_counter()
+        match_results = match_runner.run(game_engines)
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertIsNone(match_results[0])
+        self.assertEqual(1, len(match_results[1].round_winner_ids))
+        self.assertEqual(1, match_runner.cancelled_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+from core.game.Card import CARDS_BY_KIND
+from core.game.CardHand import CardHand
+from core.game.GameEngineHelper import GameEngineHelper
+from random import Random
+import unittest
+
+
+class CardHandTest(unittest.TestCase):
+    def test_add_remove_and_has_card_keep_the_counts(self):
+        red_card, green_card = CARDS_BY_KIND[0], CARDS_BY_KIND[20]
+        hand = CardHand([red_card])
+        hand.append(red_card)
+        hand.extend([green_card, red_card])
+        self.assertEqual(4, len(hand))
+        self.assertEqual(3, hand.count(red_card))
+        self.assertEqual(1, hand.count(green_card))
+        self.assertTrue(hand.has_card(green_card))
+        self.assertIn(red_card, hand)
+        self.assertFalse(hand.has_card(CARDS_BY_KIND[1]))
+        self.assertFalse(hand.has_card('not a card'))
+        hand.remove(red_card)
+        self.assertEqual(2, hand.count(red_card))
+        self.assertEqual(3, len(hand))
+        with self.assertRaises(ValueError):
+            hand.remove(CARDS_BY_KIND[1])
+
+    def test_mask_drops_a_kind_once_its_last_card_is_gone(self):
+        card, other_card = CARDS_BY_KIND[5], CARDS_BY_KIND[7]
+        hand = CardHand([card, card, other_card])
+        self.assertEqual(1 << 5 | 1 << 7, hand.mask)
+        hand.remove(card)
+        # One copy is left, the kind stays in the mask
+        self.assertEqual(1 << 5 | 1 << 7, hand.mask)
+        hand.remove(card)
+        self.assertEqual(1 << 7, hand.mask)
+        self.assertFalse(hand.has_card(card))
+        self.assertEqual([], hand.get_cards_in_mask(1 << 5))
+        hand.remove(other_card)
+        self.assertEqual(0, hand.mask)
+        self.assertEqual(0, len(hand))
+
+    def test_equals_a_list_of_the_same_cards_in_any_order(self):
+        cards = GameEngineHelper.create_game_deck(Random(2))[:15]
+        hand = CardHand(cards)
+        self.assertEqual(hand, cards)
+        self.assertEqual(hand, list(reversed(cards)))
+        self.assertEqual(hand, CardHand(reversed(cards)))
+        self.assertNotEqual(hand, cards[:-1])
+        self.assertNotEqual(hand, cards[:-1] + [cards[0]])
+        # Iterated and indexed in kind order, whatever order the cards came in
+        self.assertEqual(sorted(cards, key=lambda card: card.kind), list(hand))
+        self.assertEqual([card.kind for card in hand], [hand[index].kind for index in range(len(hand))])
+        removed_card = hand[3]
+        hand.remove(removed_card)
+        cards.remove(removed_card)
+        self.assertEqual(hand, cards)
+
+
+if __name__ == '__main__':
+    unittest.main()
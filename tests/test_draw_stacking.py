@@ -0,0 +1,120 @@
+from core.game.ActionType import ActionType
+from core.game.Card import Card, KIND_IS_WILD
+from core.game.CardAction import CardAction
+from core.game.CardType import CardType
+from core.game.ColorType import ColorType
+from core.game.Deal import Deal
+from core.game.DrawStackingRule import DrawStackingRule
+from core.game.EventType import EventType
+from core.game.GameEngine import GameEngine
+from core.game.GameEngineHelper import GameEngineHelper
+from core.game.IEventSink import IEventSink
+from core.game.IPlayer import IPlayer
+from random import Random
+from typing import List
+import unittest
+
+FILLER_TYPES = [CardType.ONE, CardType.TWO, CardType.THREE, CardType.FOUR, CardType.SIX, CardType.EIGHT,
+                CardType.NINE]
+
+
+class ScriptedPlayer(IPlayer):
+    # Plays the cards it is given on its first turns, SKIPs afterwards and notes what it had to answer
+    def __init__(self, cards: List[Card]):
+        super().__init__()
+        self._cards = list(cards)
+        self.pending_draw_counts = []
+
+    def get_player_name(self) -> str:
+        return 'Scripted'
+
+    def take_turn(self) -> CardAction:
+        self.pending_draw_counts.append(self.get_game_helper().get_pending_draw_count())
+        if not self._cards:
+            return CardAction(ActionType.SKIP)
+        card = self._cards.pop(0)
+        return CardAction(ActionType.PLAY, card, ColorType.RED if KIND_IS_WILD[card.kind] else None)
+
+
+class EventRecorder(IEventSink):
+    def __init__(self):
+        self.events = []
+
+    def handle_event(self, event):
+        self.events.append(event)
+
+
+def _take_card(deck: List[Card], card_type: CardType, color_type: ColorType) -> Card:
+    for index, card in enumerate(deck):
+        if card.card_type == card_type and card.color_type == color_type:
+            return deck.pop(index)
+    raise ValueError('No {} {} left in the deck'.format(color_type, card_type))
+
+
+def _create_deal(cards_by_seat: List[List[Card]]) -> Deal:
+    # Every seat gets its cards, then blue and green numbers that can't answer a red draw card, on a red 5
+    deck = GameEngineHelper.create_game_deck(Random(0))
+    hands = []
+    for seat, cards in enumerate(cards_by_seat):
+        for card in cards:
+            deck.remove(card)
+        color_type = ColorType.BLUE if seat % 2 == 0 else ColorType.GREEN
+        hands.append(cards + [_take_card(deck, card_type, color_type)
+                              for card_type in FILLER_TYPES[:7 - len(cards)]])
+    top_card = _take_card(deck, CardType.FIVE, ColorType.RED)
+    return Deal(0, ([card for hand in hands for card in hand] + [top_card] + deck,))
+
+
+class DrawStackingTest(unittest.TestCase):
+    def setUp(self):
+        deck = GameEngineHelper.create_game_deck()
+        self._red_draw_two = _take_card(deck, CardType.DRAW_TWO, ColorType.RED)
+        self._other_red_draw_two = _take_card(deck, CardType.DRAW_TWO, ColorType.RED)
+        self._wild_draw_four = _take_card(deck, CardType.WILD_DRAW_FOUR, ColorType.BLACK)
+
+    def __play(self, cards_by_seat: List[List[Card]], draw_stacking_rule: DrawStackingRule):
+        # Plays the first turns of a 3 player round, every seat playing its cards, returns the players and the events
+        players = [ScriptedPlayer(cards) for cards in cards_by_seat]
+        recorder = EventRecorder()
+        game_engine = GameEngine(players, 1, [recorder], seed=0, deal=_create_deal(cards_by_seat),
+                                 draw_stacking_rule=draw_stacking_rule)
+        match = game_engine._play_match()
+        active_player = next(match)
+        for n in range(6):
+            active_player = match.send(active_player.player.take_turn())
+        match.close()
+        return players, [event for event in recorder.events if event.event_type != EventType.TURN_STARTED]
+
+    def __assert_events(self, expected_events, events):
+        self.assertEqual(expected_events, [(event.event_type, event.player_id, len(event.cards or ()))
+                                           for event in events[1:len(expected_events) + 1]])
+
+    def test_a_stacked_draw_two_is_drawn_at_once_by_the_next_player(self):
+        for draw_stacking_rule in DrawStackingRule:
+            players, events = self.__play([[self._red_draw_two], [self._other_red_draw_two], []], draw_stacking_rule)
+            # Seat 2 can't stack, draws both draw twos in one go and loses their turn to seat 0
+            self.__assert_events([(EventType.CARD_PLAYED, 0, 0), (EventType.CARD_PLAYED, 1, 0),
+                                  (EventType.CARDS_DRAWN, 2, 4), (EventType.TURN_SKIPPED, 2, 0),
+                                  (EventType.CARDS_DRAWN, 0, 1)], events)
+            self.assertEqual([2], players[1].pending_draw_counts[:1])
+            self.assertEqual([4], players[2].pending_draw_counts[:1])
+            # Once drawn, nothing is left to answer
+            self.assertEqual([0, 0], players[0].pending_draw_counts[:2])
+            self.assertEqual(0, players[1].pending_draw_counts[1])
+
+    def test_a_wild_draw_four_stacks_on_a_draw_two_only_when_mixed(self):
+        cards_by_seat = [[self._red_draw_two], [self._wild_draw_four], []]
+        players, events = self.__play(cards_by_seat, DrawStackingRule.SAME_TYPE)
+        self.__assert_events([(EventType.CARD_PLAYED, 0, 0), (EventType.ILLEGAL_PLAY, 1, 0),
+                              (EventType.CARDS_DRAWN, 1, 2)], events)
+        self.assertEqual([0, 0], players[2].pending_draw_counts[:2])
+
+        players, events = self.__play(cards_by_seat, DrawStackingRule.MIXED)
+        self.__assert_events([(EventType.CARD_PLAYED, 0, 0), (EventType.CARD_PLAYED, 1, 0),
+                              (EventType.CARDS_DRAWN, 2, 6), (EventType.TURN_SKIPPED, 2, 0)], events)
+        self.assertEqual([6], players[2].pending_draw_counts[:1])
+        self.assertEqual([0, 0], players[0].pending_draw_counts[:2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+from core.game.ActionType import ActionType
+from core.game.Card import Card, KIND_IS_ACTION, KIND_IS_WILD
+from core.game.CardType import CardType
+from core.game.ColorType import ColorType
+from core.game.GameEngineHelper import GameEngineHelper
+from core.game.GameState import GameState
+from core.search.EndgameSolver import EndgameSolver
+from core.search.TranspositionTable import TranspositionTable
+from random import Random
+import unittest
+
+
+def _take_card(deck, card_type: CardType, color_type: ColorType) -> Card:
+    for index, card in enumerate(deck):
+        if card.card_type == card_type and card.color_type == color_type:
+            return deck.pop(index)
+    raise ValueError('No {} {} left in the deck'.format(color_type, card_type))
+
+
+def _create_endgame(seed: int, own_size: int, opponent_size: int) -> GameState:
+    # A 2 player round with seat 0 to move, hands dealt at random from a shuffled deck
+    deck = GameEngineHelper.create_game_deck(Random(seed))
+    top_card = next(card for card in deck if not KIND_IS_ACTION[card.kind] and not KIND_IS_WILD[card.kind])
+    deck.remove(top_card)
+    own_hand = [deck.pop() for n in range(own_size)]
+    opponent_hand = [deck.pop() for n in range(opponent_size)]
+    return GameState.create(deck, [top_card], [own_hand, opponent_hand], (0, 1), 0, top_card.color_type)
+
+
+class EndgameSolverTest(unittest.TestCase):
+    def test_forced_win_is_exactly_one_and_exact(self):
+        deck = GameEngineHelper.create_game_deck(Random(4))
+        top_card = _take_card(deck, CardType.FIVE, ColorType.RED)
+        winning_card = _take_card(deck, CardType.SEVEN, ColorType.RED)
+        # A single hidden card gives a few dozen opponent hands whose weights do not add up to 1 in floats
+        state = GameState.create(deck, [top_card], [[winning_card], [deck.pop()]], (0, 1), 0, ColorType.RED)
+        solver = EndgameSolver()
+        action, value = solver.solve(state.get_player_view(0), time_budget=5.0)
+        self.assertEqual(1.0, value)
+        self.assertEqual(ActionType.PLAY, action.action)
+        self.assertIs(winning_card, action.card)
+        stats = solver.get_stats()
+        self.assertTrue(stats.is_exact)
+        self.assertEqual(1, stats.depth)
+
+    def test_values_are_probabilities_and_moves_are_legal(self):
+        solver = EndgameSolver(table_size=1 << 14)
+        for seed in range(20):
+            state = _create_endgame(seed, 2, 2)
+            view = state.get_player_view(0)
+            action, value = solver.solve(view, time_budget=0.2, random=Random(seed))
+            self.assertGreaterEqual(value, 0.0)
+            self.assertLessEqual(value, 1.0)
+            legal_actions = view.get_legal_actions()
+            self.assertTrue(any(action.action == legal_action.action and action.card is legal_action.card
+                                and action.color == legal_action.color for legal_action in legal_actions))
+
+    def test_known_hands_solve_the_same_twice(self):
+        # Bounded by depth rather than time, how deep a time budget gets depends on the machine's load
+        state = _create_endgame(7, 2, 1)
+        first_action, first_value = EndgameSolver(max_depth=5).solve(state)
+        second_action, second_value = EndgameSolver(max_depth=5).solve(state)
+        self.assertEqual(first_value, second_value)
+        self.assertIs(first_action.card, second_action.card)
+
+    def test_a_repeated_solve_is_answered_by_the_table(self):
+        state = _create_endgame(7, 2, 1)
+        solver = EndgameSolver(max_depth=5)
+        first_action, first_value = solver.solve(state)
+        first_stats = solver.get_stats()
+        self.assertGreater(first_stats.table_store_count, 0)
+        second_action, second_value = solver.solve(state)
+        second_stats = solver.get_stats()
+        self.assertEqual(first_value, second_value)
+        self.assertIs(first_action.card, second_action.card)
+        # Every position of the second solve was stored by the first, so every probe hits
+        self.assertGreater(second_stats.table_probe_count, 0)
+        self.assertEqual(second_stats.table_probe_count, second_stats.table_hit_count)
+        self.assertEqual(1.0, second_stats.table_hit_rate)
+        self.assertEqual(0, second_stats.table_store_count)
+        self.assertLess(second_stats.node_count, first_stats.node_count)
+        table = solver.get_table()
+        self.assertEqual(first_stats.table_probe_count + second_stats.table_probe_count, table.probe_count)
+        self.assertEqual(first_stats.table_hit_count + second_stats.table_hit_count, table.hit_count)
+
+    def test_the_table_evicts_the_entry_used_least_recently(self):
+        table = TranspositionTable(max_entries=2)
+        table.put(1, 'one')
+        table.put(2, 'two')
+        # Using 1 leaves 2 as the entry used least recently
+        self.assertEqual('one', table.get(1))
+        table.put(3, 'three')
+        self.assertEqual(2, len(table))
+        self.assertEqual(1, table.eviction_count)
+        self.assertEqual(3, table.store_count)
+        self.assertIsNone(table.get(2))
+        self.assertEqual('one', table.get(1))
+        self.assertEqual('three', table.get(3))
+        self.assertEqual(4, table.probe_count)
+        self.assertEqual(3, table.hit_count)
+
+    def test_only_solves_two_player_rounds(self):
+        deck = GameEngineHelper.create_game_deck(Random(1))
+        top_card = _take_card(deck, CardType.FIVE, ColorType.RED)
+        state = GameState.create(deck, [top_card], [[deck.pop()], [deck.pop()], [deck.pop()]], (0, 1, 2), 0,
+                                 ColorType.RED)
+        self.assertFalse(EndgameSolver.can_solve(state))
+        with self.assertRaises(ValueError):
+            EndgameSolver().solve(state)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+from core.game.Card import CARDS_BY_KIND, KIND_IS_WILD
+from core.game.DrawStackingRule import DrawStackingRule
+from core.game.GameEngine import GameEngine
+from core.game.GameState import GameState
+from players.RandomPlayer import RandomPlayer
+from random import Random
+import unittest
+
+
+class _RecordingPlayer(RandomPlayer):
+    # Keeps the engine's whole state, its own view and the action it took on every turn, in one list shared by the
+    # table
+    def __init__(self, turns: list):
+        super().__init__()
+        self._turns = turns
+        self.game_engine: GameEngine = None
+
+    def take_turn(self):
+        state = self.game_engine._GameEngine__create_game_state()
+        view = self.get_game_helper().get_game_state()
+        action = super().take_turn()
+        self._turns.append((state, view, action))
+        return action
+
+
+def _get_view_fields(view: GameState):
+    return (view.active_seat, view.turn_order, view.turn_index, view.direction, view.card_pile_kinds,
+            view.current_color, view.flags, view.pending_draw_count, view.deck_count, view.hand_sizes,
+            view.get_hand_counts(view.viewer))
+
+
+def _get_state_fields(state: GameState):
+    return (state.turn_order, state.turn_index, state.direction, state.draw_pile_kinds, state.card_pile_kinds,
+            state.current_color, state.flags, state.pending_draw_count, state.hand_sizes,
+            [state.get_hand_counts(seat) for seat in range(state.player_count)])
+
+
+class GameStateTest(unittest.TestCase):
+    def test_step_follows_the_engine(self):
+        for player_count, draw_stacking_rule in ((2, DrawStackingRule.SAME_TYPE), (3, DrawStackingRule.SAME_TYPE),
+                                                 (4, DrawStackingRule.MIXED)):
+            stepped_turn_count = 0
+            for seed in range(20):
+                turns = []
+                players = [_RecordingPlayer(turns) for n in range(player_count)]
+                game_engine = GameEngine(players, 2, seed=seed, draw_stacking_rule=draw_stacking_rule)
+                for player in players:
+                    player.game_engine = game_engine
+                game_engine.start()
+
+                for turn_index, (state, view, action) in enumerate(turns):
+                    self.assertEqual(_get_view_fields(view), _get_view_fields(state.get_player_view(view.viewer)))
+                    next_state = state.step(action, Random(0))
+                    if next_state.is_over:
+                        # The round is won, the engine deals a new one
+                        self.assertEqual(view.viewer, next_state.winner)
+                        continue
+                    if len(next_state.card_pile_kinds) < len(state.card_pile_kinds) or turn_index + 1 == len(turns):
+                        # Reshuffled, the engine's deck order is its own from here on
+                        continue
+                    self.assertEqual(_get_state_fields(turns[turn_index + 1][0]), _get_state_fields(next_state))
+                    stepped_turn_count += 1
+            self.assertGreater(stepped_turn_count, 100)
+
+    def test_clone_is_independent(self):
+        deck = [card for card in CARDS_BY_KIND if not KIND_IS_WILD[card.kind]] * 2
+        state = GameState.create(deck[15:][::-1], [deck[14]], [deck[:7], deck[7:14]], (0, 1), 0, deck[14].color_type)
+        clone = state.clone()
+        action = clone.get_legal_actions()[-1]
+        clone.apply(action, Random(0))
+        self.assertEqual(7, state.hand_sizes[0])
+        self.assertEqual(8, clone.hand_sizes[0])
+
+    def test_a_player_view_hides_the_deck_and_the_other_hands(self):
+        deck = [card for card in CARDS_BY_KIND if not KIND_IS_WILD[card.kind]] * 2
+        state = GameState.create(deck[15:][::-1], [deck[14]], [deck[:7], deck[7:14]], (0, 1), 0, deck[14].color_type)
+        view = state.get_player_view(0)
+        self.assertTrue(view.is_hidden)
+        self.assertEqual(state.deck_count, view.deck_count)
+        self.assertEqual(state.get_hand_counts(0), view.get_hand_counts(0))
+        self.assertIsNone(view.get_hand_counts(1))
+        with self.assertRaises(ValueError):
+            view.apply(view.get_legal_actions()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,20 @@
+from core.game.GameEngine import GameEngine
+from players.HardPlayer import Player as HardPlayer
+from players.RandomPlayer import RandomPlayer
+import threading
+import unittest
+
+
+class HardPlayerTest(unittest.TestCase):
+    def test_pooled_rollouts_leave_no_threads_behind(self):
+        thread_count = threading.active_count()
+        for seed in range(3):
+            hard_player = HardPlayer(rollout_count=20, workers=2, endgame_hand_size=0)
+            game_engine = GameEngine([hard_player, RandomPlayer()], 1, seed=seed)
+            game_engine.start()
+            self.assertEqual(1, len(game_engine.get_match_result().round_winner_ids))
+        self.assertEqual(thread_count, threading.active_count())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+from core.game.Card import Card, CARD_COLORS, CARDS_BY_KIND
+from core.game.CardHand import CardHand
+from core.game.CardType import CardType
+from core.game.ColorType import ColorType
+from core.game.LegalityTable import LegalityTable, DRAW_PENDING_FLAG, FLAG_COMBINATIONS, MIXED_STACKING_FLAG, \
+    SKIP_SERVED_FLAG
+from random import Random
+import unittest
+
+WILD_TYPES = (CardType.WILD, CardType.WILD_DRAW_FOUR)
+DRAW_TYPES = (CardType.DRAW_TWO, CardType.WILD_DRAW_FOUR)
+
+
+def _is_reachable(top_card: Card, flags: int) -> bool:
+    # A draw is only pending with a draw card on top, the table fills in the other entries all the same
+    return not flags & DRAW_PENDING_FLAG or top_card.card_type in DRAW_TYPES
+
+
+def _is_legal_response(top_card: Card, current_color: ColorType, flags: int, card: Card) -> bool:
+    """
+    The rules the engine checked card by card before the table, one branch
+    per top card as in its old __get_legal_response_cards. The table kept
+    them, apart from the fixes made along with it: a DRAW_TWO or
+    WILD_DRAW_FOUR that was answered and a SKIP that was served no longer
+    lock the pile, an action card matches its own type like a number does,
+    and MIXED stacking lets draw cards go on each other.
+    """
+    is_draw_pending = flags & DRAW_PENDING_FLAG
+    if top_card.card_type == CardType.WILD_DRAW_FOUR and is_draw_pending:
+        if flags & MIXED_STACKING_FLAG:
+            return card.card_type == CardType.WILD_DRAW_FOUR or \
+                (card.card_type == CardType.DRAW_TWO and card.color_type == current_color)
+        # If a wild card +4 was played, you can only stack another one
+        return card.card_type == CardType.WILD_DRAW_FOUR
+    if top_card.card_type == CardType.DRAW_TWO and is_draw_pending:
+        if flags & MIXED_STACKING_FLAG and card.card_type == CardType.WILD_DRAW_FOUR:
+            return True
+        # Draws can be stacked
+        return card.card_type == CardType.DRAW_TWO and card.color_type == current_color
+    if top_card.card_type == CardType.SKIP and not flags & SKIP_SERVED_FLAG:
+        # The skipped player cannot play anything
+        return False
+    if top_card.card_type in WILD_TYPES:
+        # Only the declared color, or another wild
+        return card.color_type == current_color or card.card_type in WILD_TYPES
+    # It has to match either color or type, and a wild can always be played
+    return card.color_type == current_color or card.card_type == top_card.card_type or card.card_type in WILD_TYPES
+
+
+class LegalityTableTest(unittest.TestCase):
+    def test_every_entry_matches_the_card_by_card_rules(self):
+        for top_card in CARDS_BY_KIND:
+            # The current color is the top card's own, unless a wild declared one
+            colors = CARD_COLORS if top_card.card_type in WILD_TYPES else [top_card.color_type]
+            for current_color in colors:
+                for flags in range(FLAG_COMBINATIONS):
+                    if not _is_reachable(top_card, flags):
+                        continue
+                    legal_mask = LegalityTable.get_legal_mask(top_card, current_color, flags)
+                    for card in CARDS_BY_KIND:
+                        self.assertEqual(_is_legal_response(top_card, current_color, flags, card),
+                                         legal_mask >> card.kind & 1 == 1,
+                                         '{} on {} ({}, flags {})'.format(card.get_card_text(),
+                                                                         top_card.get_card_text(), current_color,
+                                                                         flags))
+
+    def test_legal_cards_of_a_list_and_a_card_hand_agree(self):
+        random = Random(5)
+        # Two of every kind, so hands can hold the same card twice
+        deck = list(CARDS_BY_KIND) * 2
+        for n in range(500):
+            hand = random.sample(deck, 9)
+            top_card = random.choice(deck)
+            current_color = random.choice(CARD_COLORS) if top_card.card_type in WILD_TYPES else top_card.color_type
+            flags = random.randrange(FLAG_COMBINATIONS)
+            if not _is_reachable(top_card, flags):
+                flags &= ~DRAW_PENDING_FLAG
+            expected_cards = [card for card in hand if _is_legal_response(top_card, current_color, flags, card)]
+            self.assertEqual(expected_cards, LegalityTable.get_legal_cards(hand, top_card, current_color, flags))
+            self.assertEqual(sorted(card.kind for card in expected_cards),
+                             sorted(card.kind for card in LegalityTable.get_legal_cards(
+                                 CardHand(hand), top_card, current_color, flags)))
+
+    def test_old_rules_the_table_kept(self):
+        red_five = Card(CardType.FIVE, ColorType.RED)
+        self.assertTrue(LegalityTable.get_legal_mask(red_five, ColorType.RED) >>
+                        Card(CardType.FIVE, ColorType.BLUE).kind & 1)
+        self.assertFalse(LegalityTable.get_legal_mask(red_five, ColorType.RED) >>
+                         Card(CardType.SIX, ColorType.BLUE).kind & 1)
+        red_draw_two = Card(CardType.DRAW_TWO, ColorType.RED)
+        stack_mask = LegalityTable.get_legal_mask(red_draw_two, ColorType.RED, DRAW_PENDING_FLAG)
+        self.assertTrue(stack_mask >> red_draw_two.kind & 1)
+        self.assertFalse(stack_mask >> Card(CardType.DRAW_TWO, ColorType.BLUE).kind & 1)
+        self.assertFalse(stack_mask >> Card(CardType.WILD, ColorType.BLACK).kind & 1)
+        self.assertEqual(0, LegalityTable.get_legal_mask(Card(CardType.SKIP, ColorType.RED), ColorType.RED))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+from core.game.ActionType import ActionType
+from core.game.AsyncGameEngine import AsyncGameEngine
+from core.game.CardAction import CardAction
+from core.game.Card import KIND_IS_ACTION, KIND_IS_WILD
+from core.game.GameEngineHelper import GameEngineHelper
+from core.game.GameState import GameState
+from core.game.IPlayer import IPlayer
+from core.host.HostProtocol import encode_player_creation
+from core.host.Observation import decode_observation, encode_observation
+from core.host.PlayerHost import PlayerHost
+from core.tournament.HostedTournament import HostedTournament
+from core.tournament.Tournament import Tournament, create_round_robin_schedule
+from random import Random
+import asyncio
+import os
+import time
+import unittest
+
+
+class FirstCardPlayer(IPlayer):
+    # Plays the first legal card of its hand, or skips
+    def get_player_name(self) -> str:
+        return 'First Card'
+
+    def take_turn(self) -> CardAction:
+        valid_hand = self.get_game_helper().get_valid_hand()
+        if not valid_hand:
+            return CardAction(ActionType.SKIP)
+        card = valid_hand[0]
+        return CardAction(ActionType.PLAY, card, self.get_game_helper().get_current_color()
+                          if KIND_IS_WILD[card.kind] else None)
+
+
+class CrashingPlayer(FirstCardPlayer):
+    def take_turn(self) -> CardAction:
+        os._exit(1)
+
+
+class HangingPlayer(FirstCardPlayer):
+    def take_turn(self) -> CardAction:
+        time.sleep(60)
+        return super().take_turn()
+
+
+class SometimesCrashingPlayer(FirstCardPlayer):
+    # Takes the worker down on about one turn in fifty
+    def take_turn(self) -> CardAction:
+        if self.get_random().random() < 0.02:
+            os._exit(1)
+        return super().take_turn()
+
+
+def _get_action_fields(action: CardAction):
+    return action.action, None if action.card is None else action.card.kind, action.color
+
+
+def _create_state(seed: int) -> GameState:
+    # Seat 0 to move in a 2 player round, with a number card on top and a full hand
+    deck = GameEngineHelper.create_game_deck(Random(seed))
+    top_card = next(card for card in deck if not KIND_IS_ACTION[card.kind] and not KIND_IS_WILD[card.kind])
+    deck.remove(top_card)
+    hands = [[deck.pop() for n in range(7)] for seat in range(2)]
+    return GameState.create(deck, [top_card], hands, (0, 1), 0, top_card.color_type)
+
+
+def _create_observation(seed: int) -> bytes:
+    state = _create_state(seed)
+    return encode_observation(state.get_player_view(0), state.get_hand(0))
+
+
+class PlayerHostTest(unittest.TestCase):
+    def test_observation_round_trip(self):
+        state = _create_state(8)
+        view = state.get_player_view(0)
+        hand = state.get_hand(0)
+        for time_remaining in (None, 1.5):
+            decoded_view, hand_kinds, decoded_time_remaining = decode_observation(
+                encode_observation(view, hand, time_remaining))
+            self.assertEqual([card.kind for card in hand], hand_kinds)
+            self.assertEqual(time_remaining, decoded_time_remaining)
+            for field_name in ('viewer', 'active_seat', 'turn_order', 'turn_index', 'direction', 'current_color',
+                               'flags', 'pending_draw_count', 'deck_count', 'hand_sizes', 'card_pile_kinds'):
+                self.assertEqual(getattr(view, field_name), getattr(decoded_view, field_name), field_name)
+            self.assertEqual(view.get_hand_counts(0), decoded_view.get_hand_counts(0))
+            self.assertEqual([_get_action_fields(action) for action in view.get_legal_actions()],
+                             [_get_action_fields(action) for action in decoded_view.get_legal_actions()])
+
+    def test_hosted_tournament_plays_like_a_tournament(self):
+        player_specs = ['players.RandomPlayer:RandomPlayer', 'players.EasyPlayer:Player',
+                        'tests.test_player_host:FirstCardPlayer']
+        schedule = create_round_robin_schedule(len(player_specs))
+        tournament_result = Tournament(player_specs, schedule, 20, seed=11).run()
+        hosted_tournament = HostedTournament(player_specs, schedule, 20, workers=2, seed=11)
+        hosted_result = hosted_tournament.run()
+        self.assertEqual(0, hosted_tournament.crash_count)
+        self.assertEqual(tournament_result.get_summary_text(), hosted_result.get_summary_text())
+
+    def test_turns_of_many_matches_share_batches(self):
+        player_specs = ['players.RandomPlayer:RandomPlayer', 'players.EasyPlayer:Player']
+        with PlayerHost(worker_count=1) as host:
+            asyncio.run(self.__play_hosted_matches(host, player_specs, 16))
+            self.assertGreater(host.turn_count, 0)
+            self.assertGreater(host.get_average_batch_size(), 4.0)
+
+    def test_a_crashing_bot_only_costs_the_host_a_restart(self):
+        player_specs = ['players.EasyPlayer:Player', 'tests.test_player_host:SometimesCrashingPlayer']
+        with PlayerHost(worker_count=2, batch_timeout=10.0) as host:
+            match_results = asyncio.run(self.__play_hosted_matches(host, player_specs, 8))
+            self.assertGreater(host.crash_count, 0)
+        self.assertEqual(8, len(match_results))
+        for match_result in match_results:
+            self.assertEqual(3, len(match_result.round_winner_ids))
+
+    async def __play_hosted_matches(self, host: PlayerHost, player_specs, match_count: int):
+        async def play_match(match_seed: int):
+            players = [host.create_player(player_spec) for player_spec in player_specs]
+            game_engine = AsyncGameEngine(players, 3, seed=match_seed)
+            await game_engine.start_async()
+            for player in players:
+                player.close()
+            return game_engine.get_match_result()
+
+        return await asyncio.gather(*(play_match(match_seed) for match_seed in range(match_count)))
+
+    async def __play_one_batch(self, host: PlayerHost, player_specs, observation: bytes):
+        # Every player on the one worker takes a turn, all of them in the same batch
+        slots = []
+        for player_spec in player_specs:
+            slot = len(slots)
+            host.create_player(player_spec)
+            host.register_player(slot, encode_player_creation(player_spec, Random(slot).getstate(), ['A', 'B']))
+            slots.append(slot)
+        return await asyncio.gather(*(host.take_turn(slot, observation) for slot in slots))
+
+    def __assert_only_the_faulting_turn_is_skipped(self, faulting_spec: str, batch_timeout: float):
+        observation = _create_observation(3)
+        healthy_spec = 'tests.test_player_host:FirstCardPlayer'
+        player_specs = [healthy_spec, healthy_spec, faulting_spec, healthy_spec, healthy_spec]
+        with PlayerHost(worker_count=1, batch_timeout=batch_timeout) as host:
+            actions = asyncio.run(self.__play_one_batch(host, player_specs, observation))
+            self.assertEqual(1, host.crash_count)
+        for player_spec, action in zip(player_specs, actions):
+            if player_spec == faulting_spec:
+                self.assertEqual(ActionType.SKIP, action.action)
+            else:
+                self.assertEqual(ActionType.PLAY, action.action)
+
+    def test_a_crash_only_skips_the_crashing_turn(self):
+        self.__assert_only_the_faulting_turn_is_skipped('tests.test_player_host:CrashingPlayer', 10.0)
+
+    def test_a_hang_only_skips_the_hanging_turn(self):
+        self.__assert_only_the_faulting_turn_is_skipped('tests.test_player_host:HangingPlayer', 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
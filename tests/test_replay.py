@@ -0,0 +1,84 @@
+from core.game.ActionType import ActionType
+from core.game.Card import CARD_COLORS, CARDS_BY_KIND, KIND_IS_WILD
+from core.game.CardAction import CardAction
+from core.game.DrawStackingRule import DrawStackingRule
+from core.game.GameEngine import GameEngine
+from core.game.IEventSink import IEventSink
+from core.game.RoundLimits import RoundLimits
+from core.replay.ReplayFormat import decode_action, encode_action
+from core.replay.ReplayPlayer import replay_game
+from core.replay.ReplayReader import ReplayReader
+from core.replay.ReplayRecorder import ReplayRecorder
+from core.replay.ReplayWriter import ReplayWriter
+from players.EasyPlayer import Player as EasyPlayer
+from players.RandomPlayer import RandomPlayer
+import os
+import tempfile
+import unittest
+
+
+class _EventListSink(IEventSink):
+    def __init__(self):
+        self.events = []
+
+    def handle_event(self, event):
+        self.events.append((event.event_type, event.player_id, None if event.card is None else event.card.kind,
+                            event.hand_counts))
+
+
+class ReplayTest(unittest.TestCase):
+    def test_every_action_code_round_trips(self):
+        actions = [CardAction(ActionType.SKIP), CardAction(ActionType.PLAY)]
+        for card in CARDS_BY_KIND:
+            if KIND_IS_WILD[card.kind]:
+                actions.extend(CardAction(ActionType.PLAY, card, color_type) for color_type in CARD_COLORS)
+            else:
+                actions.append(CardAction(ActionType.PLAY, card))
+        codes = [encode_action(action) for action in actions]
+        self.assertEqual(len(codes), len(set(codes)))
+        for action, code in zip(actions, codes):
+            decoded_action = decode_action(code)
+            self.assertEqual(action.action, decoded_action.action)
+            self.assertIs(action.card, decoded_action.card)
+            self.assertEqual(action.color, decoded_action.color)
+
+    def test_recorded_matches_play_out_the_same(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'matches.replay')
+            match_results = []
+            match_events = []
+            settings = [(3, DrawStackingRule.SAME_TYPE, None), (2, DrawStackingRule.MIXED, RoundLimits(40, 3)),
+                        (4, DrawStackingRule.SAME_TYPE, RoundLimits(None, 2))]
+            with ReplayWriter(path) as writer:
+                recorder = ReplayRecorder(writer)
+                for seed in range(12):
+                    player_count, draw_stacking_rule, round_limits = settings[seed % len(settings)]
+                    players = [RandomPlayer() if seat % 2 else EasyPlayer() for seat in range(player_count)]
+                    event_sink = _EventListSink()
+                    engine = GameEngine(players, 3, [event_sink], seed=seed, replay_recorder=recorder,
+                                        draw_stacking_rule=draw_stacking_rule, round_limits=round_limits)
+                    engine.start()
+                    match_results.append(engine.get_match_result())
+                    match_events.append(event_sink.events)
+
+            with ReplayReader(path) as reader:
+                records = list(reader)
+                self.assertEqual(len(match_results), len(records))
+                for seed, (record, match_result, events) in enumerate(zip(records, match_results, match_events)):
+                    self.assertEqual(seed, record.seed)
+                    self.assertEqual(match_result.round_winner_ids, record.get_round_winner_ids())
+                    self.assertEqual(match_result.turn_count, record.get_turn_count())
+                    event_sink = _EventListSink()
+                    replayed_result = replay_game(record, [event_sink]).get_match_result()
+                    self.assertEqual(match_result.winner_id, replayed_result.winner_id)
+                    self.assertEqual(match_result.round_winner_ids, replayed_result.round_winner_ids)
+                    self.assertEqual(match_result.round_turn_counts, replayed_result.round_turn_counts)
+                    self.assertTrue(events)
+                    self.assertEqual(events, event_sink.events)
+                # The 40 turn cap ends some rounds as a draw, the marker has to come back as None
+                self.assertIn(None, [winner_id for record in records for winner_id in record.get_round_winner_ids()])
+                del records
+
+
+if __name__ == '__main__':
+    unittest.main()
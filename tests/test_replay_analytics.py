@@ -0,0 +1,70 @@
+from core.game.GameEngine import GameEngine
+from core.game.RoundLimits import RoundLimits
+from core.replay.ReplayAnalytics import SEAT_COUNT, analyze_files
+from core.replay.ReplayRecorder import ReplayRecorder
+from core.replay.ReplayWriter import ReplayWriter
+from players.EasyPlayer import Player as EasyPlayer
+from players.RandomPlayer import RandomPlayer
+import numpy as np
+import os
+import tempfile
+import unittest
+
+SHARD_COUNT: int = 3
+MATCHES_PER_SHARD: int = 100
+# Not a divisor of the matches of a shard, so the last chunk of every shard is only partly filled
+CHUNK_SIZE: int = 7
+
+
+class ReplayAnalyticsTest(unittest.TestCase):
+    def test_stats_agree_with_the_match_results(self):
+        game_counts = np.zeros(SEAT_COUNT + 1, dtype=np.int64)
+        game_wins = np.zeros((SEAT_COUNT + 1, SEAT_COUNT), dtype=np.int64)
+        round_counts = np.zeros(SEAT_COUNT + 1, dtype=np.int64)
+        round_wins = np.zeros((SEAT_COUNT + 1, SEAT_COUNT), dtype=np.int64)
+        round_turn_counts = []
+        drawn_round_count = 0
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, 'shard-{}.replay'.format(shard)) for shard in range(SHARD_COUNT)]
+            for shard, path in enumerate(paths):
+                with ReplayWriter(path) as writer:
+                    recorder = ReplayRecorder(writer)
+                    for match_index in range(MATCHES_PER_SHARD):
+                        seed = shard * MATCHES_PER_SHARD + match_index
+                        # 2 to 4 players, so the games of a chunk differ in length and player count
+                        player_count = 2 + seed % 3
+                        players = [RandomPlayer() if seat % 2 else EasyPlayer() for seat in range(player_count)]
+                        # The cap ends some rounds as a draw, and some matches have no winner at all
+                        engine = GameEngine(players, 3, seed=seed, replay_recorder=recorder,
+                                            round_limits=RoundLimits(60))
+                        engine.start()
+                        match_result = engine.get_match_result()
+                        if match_result.winner_id is not None:
+                            game_counts[player_count] += 1
+                            game_wins[player_count, match_result.winner_id] += 1
+                        round_counts[player_count] += len(match_result.round_winner_ids)
+                        for round_winner_id in match_result.round_winner_ids:
+                            if round_winner_id is not None:
+                                round_wins[player_count, round_winner_id] += 1
+                        round_turn_counts.extend(match_result.round_turn_counts)
+                        drawn_round_count += match_result.drawn_round_count
+            stats = analyze_files(paths, workers=2, chunk_size=CHUNK_SIZE)
+            whole_stats = analyze_files(paths, chunk_size=MATCHES_PER_SHARD)
+
+        self.assertGreater(drawn_round_count, 0)
+        self.assertLess(stats.game_count, SHARD_COUNT * MATCHES_PER_SHARD)
+        self.assertEqual(int(game_counts.sum()), stats.game_count)
+        self.assertEqual(len(round_turn_counts), stats.round_count)
+        self.assertEqual(drawn_round_count, stats.drawn_round_count)
+        self.assertAlmostEqual(sum(round_turn_counts) / len(round_turn_counts), stats.get_average_turn_count())
+        for player_count in range(2, 5):
+            np.testing.assert_allclose(game_wins[player_count, :player_count] / game_counts[player_count],
+                                       stats.get_seat_win_rates(player_count))
+            np.testing.assert_allclose(round_wins[player_count, :player_count] / round_counts[player_count],
+                                       stats.get_seat_round_win_rates(player_count))
+        # Chunks of a few games add up to the same stats as one chunk per shard
+        self.assertEqual(whole_stats.get_summary_text(), stats.get_summary_text())
+
+
+if __name__ == '__main__':
+    unittest.main()
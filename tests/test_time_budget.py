@@ -0,0 +1,54 @@
+from core.game.EventType import EventType
+from core.game.GameEngine import GameEngine
+from core.game.IEventSink import IEventSink
+from core.game.RoundLimits import RoundLimits
+from core.game.TimeBudget import TimeBudget
+from players.EasyPlayer import Player as EasyPlayer
+from players.RandomPlayer import RandomPlayer
+import time
+import unittest
+
+
+class SleepingPlayer(RandomPlayer):
+    # Sleeps far past any turn time on its first turn, plays as a RandomPlayer afterwards
+    def __init__(self):
+        super().__init__()
+        self.turn_count = 0
+
+    def take_turn(self):
+        self.turn_count += 1
+        if self.turn_count == 1:
+            time.sleep(30)
+        return super().take_turn()
+
+
+class _EventListSink(IEventSink):
+    def __init__(self):
+        self.events = []
+
+    def handle_event(self, event):
+        self.events.append((event.event_type, event.player_id, len(event.cards or ())))
+
+
+class TimeBudgetTest(unittest.TestCase):
+    def test_a_hard_deadline_interrupts_a_sleeping_bot(self):
+        time_budget = TimeBudget(turn_seconds=0.2, hard_deadline=True)
+        self.assertTrue(time_budget.can_interrupt())
+        sleeping_player = SleepingPlayer()
+        event_sink = _EventListSink()
+        game_engine = GameEngine([sleeping_player, EasyPlayer()], 1, [event_sink], seed=3, time_budget=time_budget,
+                                 round_limits=RoundLimits(200))
+        start = time.perf_counter()
+        game_engine.start()
+        self.assertLess(time.perf_counter() - start, 10.0)
+        self.assertGreater(sleeping_player.turn_count, 1)
+        match_result = game_engine.get_match_result()
+        self.assertEqual([1, 0], match_result.player_timeout_counts)
+        self.assertGreaterEqual(match_result.player_time_used[0], 0.2)
+        # The interrupted turn is played as a SKIP: the bot draws a single card
+        timed_out_index = event_sink.events.index((EventType.TURN_TIMED_OUT, 0, 0))
+        self.assertEqual((EventType.CARDS_DRAWN, 0, 1), event_sink.events[timed_out_index + 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
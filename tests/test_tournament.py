@@ -0,0 +1,27 @@
+from core.tournament import Tournament as tournament_module
+from core.tournament.Tournament import MAX_DEAL_GENERATORS, Tournament, _get_deal_generator
+import unittest
+
+PLAYER_SPECS = ['players.RandomPlayer:RandomPlayer', 'players.EasyPlayer:Player']
+
+
+class TournamentTest(unittest.TestCase):
+    def test_duplicate_run_lets_go_of_its_deals(self):
+        result = Tournament(PLAYER_SPECS, [(0, 1)], 5, seed=2, duplicate=True).run()
+        self.assertEqual(10, result.match_count)
+        self.assertEqual(5, result.deals_played[0])
+        self.assertEqual({}, dict(tournament_module._deal_generators))
+
+    def test_deal_generators_are_bounded(self):
+        try:
+            generators = [_get_deal_generator(seed, 3) for seed in range(MAX_DEAL_GENERATORS + 3)]
+            self.assertEqual(MAX_DEAL_GENERATORS, len(tournament_module._deal_generators))
+            # The most recent ones are kept and handed out again
+            self.assertIs(generators[-1], _get_deal_generator(MAX_DEAL_GENERATORS + 2, 3))
+            self.assertIsNot(generators[0], _get_deal_generator(0, 3))
+        finally:
+            tournament_module._deal_generators.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
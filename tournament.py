@@ -0,0 +1,105 @@
+"""
+Plays a tournament between bots and prints the results, e.g.:
+    python tournament.py players.RandomPlayer:RandomPlayer players.EasyPlayer:Player --matches 1000 --workers 4
+With --adaptive, --matches is the most matches a pairing plays, and every
+pairing stops as soon as it is clear which player is stronger. With
+--duplicate, --matches is the deals every matchup plays, each deal once for
+every rotation of the seats. With --hosted, the bots play in the worker
+processes of a PlayerHost, where one that crashes or hangs only loses the
+turn it was taking.
+"""
+from core.game.DrawStackingRule import DrawStackingRule
+from core.game.RoundLimits import RoundLimits, DEFAULT_MAX_TURNS, DEFAULT_REPETITION_LIMIT
+from core.game.TimeBudget import TimeBudget
+from core.host.PlayerHost import DEFAULT_BATCH_TIMEOUT
+from core.tournament.AdaptiveTournament import AdaptiveTournament
+from core.tournament.HostedTournament import HostedTournament
+from core.tournament.SequentialTest import DEFAULT_ALPHA, DEFAULT_BETA, DEFAULT_ELO_MARGIN
+from core.tournament.Tournament import Tournament, create_round_robin_schedule
+import argparse
+import os
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play many matches between bots.')
+    parser.add_argument('players', nargs='+', help='players as module:Class, e.g. players.RandomPlayer:RandomPlayer')
+    parser.add_argument('--schedule', choices=['round-robin', 'all'], default='round-robin',
+                        help='round-robin plays every group of --seats players, all puts every player at one table')
+    parser.add_argument('--seats', type=int, default=2, help='players per match for a round-robin schedule')
+    parser.add_argument('--matches', type=int, default=1000, help='matches per matchup')
+    parser.add_argument('--rounds', type=int, default=3, help='rounds per match')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='worker processes')
+    parser.add_argument('--chunk-size', type=int, default=100,
+                        help='matches sent to a worker at once, at most with --adaptive')
+    parser.add_argument('--seed', type=int, default=None, help='tournament seed')
+    parser.add_argument('--profile', action='store_true', help='report take_turn latencies and engine phase times')
+    parser.add_argument('--turn-budget', type=float, default=None, help='seconds a bot gets for one turn')
+    parser.add_argument('--match-budget', type=float, default=None, help='seconds a bot gets for a whole match')
+    parser.add_argument('--hard-deadline', action='store_true',
+                        help='interrupt a bot that is still thinking when its budget runs out')
+    parser.add_argument('--replay-dir', default=None, help='record every match to replay files in this directory')
+    parser.add_argument('--stacking', choices=['same-type', 'mixed'], default='same-type',
+                        help='same-type only stacks a draw card on its own type, mixed stacks them on each other')
+    parser.add_argument('--max-turns', type=int, default=DEFAULT_MAX_TURNS,
+                        help='turns after which a round ends as a draw, 0 for no limit')
+    parser.add_argument('--repetition-limit', type=int, default=DEFAULT_REPETITION_LIMIT,
+                        help='times the same position may come up before a round ends as a draw, 0 for no limit')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='stop every pairing once it is clear which player is stronger (2 seats only)')
+    parser.add_argument('--elo-margin', type=float, default=DEFAULT_ELO_MARGIN,
+                        help='Elo difference an adaptive pairing has to tell apart')
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA,
+                        help='chance of an adaptive pairing picking the weaker player as the first')
+    parser.add_argument('--beta', type=float, default=DEFAULT_BETA,
+                        help='chance of an adaptive pairing picking the weaker player as the second')
+    parser.add_argument('--duplicate', action='store_true',
+                        help='play every deal once for every rotation of the seats, --matches counts deals')
+    parser.add_argument('--hosted', action='store_true',
+                        help='run the bots in a player host, so a crash or a hang only loses that bot a turn')
+    parser.add_argument('--batch-timeout', type=float, default=DEFAULT_BATCH_TIMEOUT,
+                        help='seconds a hosted worker gets to answer a batch of turns before it is restarted')
+    args = parser.parse_args()
+    if args.duplicate and (args.adaptive or args.replay_dir is not None):
+        parser.error('--duplicate cannot be combined with --adaptive or --replay-dir')
+    if args.hosted and (args.adaptive or args.duplicate or args.replay_dir is not None or args.profile):
+        parser.error('--hosted cannot be combined with --adaptive, --duplicate, --replay-dir or --profile')
+
+    if args.schedule == 'all':
+        schedule = [tuple(range(len(args.players)))]
+    else:
+        schedule = create_round_robin_schedule(len(args.players), args.seats)
+    time_budget = None
+    if args.turn_budget is not None or args.match_budget is not None:
+        time_budget = TimeBudget(args.turn_budget, args.match_budget, args.hard_deadline)
+    round_limits = None
+    if args.max_turns or args.repetition_limit:
+        round_limits = RoundLimits(args.max_turns or None, args.repetition_limit or None)
+    draw_stacking_rule = DrawStackingRule(args.stacking.replace('-', '_'))
+    if args.adaptive:
+        tournament = AdaptiveTournament(args.players, schedule, args.matches, args.rounds, args.workers, args.seed,
+                                        args.chunk_size, args.profile, time_budget, args.replay_dir,
+                                        draw_stacking_rule, round_limits, args.elo_margin, args.alpha, args.beta)
+    elif args.hosted:
+        tournament = HostedTournament(args.players, schedule, args.matches, args.rounds, args.workers, args.seed,
+                                      time_budget, draw_stacking_rule, round_limits, args.batch_timeout)
+    else:
+        tournament = Tournament(args.players, schedule, args.matches, args.rounds, args.workers, args.seed,
+                                args.chunk_size, args.profile, time_budget, args.replay_dir, draw_stacking_rule,
+                                round_limits, args.duplicate)
+    start_time = time.time()
+    result = tournament.run()
+    elapsed_time = time.time() - start_time
+    print(result.get_summary_text())
+    if args.adaptive:
+        print(tournament.get_summary_text())
+    if args.hosted:
+        print('{} hosted workers restarted after a crash or a hang'.format(tournament.crash_count))
+    if result.profiler is not None:
+        print(result.profiler.get_report_text())
+    print('seed {}, {:.1f}s, {:.0f} matches/s'.format(tournament.seed, elapsed_time,
+                                                      result.match_count / elapsed_time if elapsed_time else 0))
+
+
+if __name__ == '__main__':
+    main()